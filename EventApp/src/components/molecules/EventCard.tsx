@@ -104,7 +104,7 @@ export const EventCard: React.FC<EventCardProps> = ({ evento, onInscribe, onEdit
         </CardHeader>
       <CardContent>
         <div className="space-y-3">
-          <p className="text-sm text-muted-foreground line-clamp-2">{evento.descricao}</p>
+          <p className="text-sm text-muted-foreground line-clamp-2">{evento.descricao_resumo ?? evento.descricao}</p>
 
           {evento.inscricaoStatus && (
             <div className={`flex items-center gap-2 mt-2 text-sm font-medium ${getInscricaoStatusBadgeClasses(evento.inscricaoStatus)}`}>
@@ -142,6 +142,11 @@ export const EventCard: React.FC<EventCardProps> = ({ evento, onInscribe, onEdit
               <div>
                 <p className="text-muted-foreground">Capacidade</p>
                 <p className="text-foreground font-medium">{evento.capacidade} pessoas</p>
+                {evento.vagas_restantes !== undefined && (
+                  <p className="text-xs text-muted-foreground">
+                    {evento.vagas_restantes > 0 ? `${evento.vagas_restantes} vagas restantes` : "Esgotado"}
+                  </p>
+                )}
               </div>
             </div>
             <div className="flex items-start gap-2">
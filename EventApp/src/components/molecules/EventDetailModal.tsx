@@ -23,6 +23,8 @@ export const EventDetailModal: React.FC<EventDetailModalProps> = ({ evento, isOp
   const [selectedParticipanteId, setSelectedParticipanteId] = useState<number | null>(null)
   const [inscricoes, setInscricoes] = useState<Inscricao[]>([])
   const [loadingInscricoes, setLoadingInscricoes] = useState(false)
+  // A listagem traz só um resumo da descrição; o texto completo vem do detalhe
+  const [descricao, setDescricao] = useState<string | undefined>(undefined)
 
   const eventosService = useEventosService()
 
@@ -39,6 +41,7 @@ export const EventDetailModal: React.FC<EventDetailModalProps> = ({ evento, isOp
     try {
       // Buscar detalhes do evento com inscrições relacionadas (backend atualizado)
       const ev = await eventosService.getEvento(evento.id)
+      setDescricao(ev.descricao)
       const eventoInscricoes = (ev as any).inscricoes || []
       setInscricoes(eventoInscricoes.filter((i: any) => i.status !== "cancelada"))
     } catch (error) {
@@ -90,7 +93,7 @@ export const EventDetailModal: React.FC<EventDetailModalProps> = ({ evento, isOp
             </svg>
             Descrição
           </h4>
-          <p className="text-sm text-muted-foreground leading-relaxed">{evento.descricao}</p>
+          <p className="text-sm text-muted-foreground leading-relaxed">{descricao ?? evento.descricao ?? evento.descricao_resumo}</p>
         </div>
 
         {/* Informações Principais */}
@@ -121,7 +121,7 @@ export const EventFormModal: React.FC<EventFormModalProps> = ({ evento, onSave,
     if (evento) {
       reset({
         titulo: evento.titulo,
-        descricao: evento.descricao,
+        descricao: evento.descricao ?? "",
         local: evento.local,
         capacidade: Number(evento.capacidade) || 0,
         preco: Number(evento.preco) || 0,
@@ -5,6 +5,7 @@ import { useNavigate, Link } from "react-router-dom"
 import { useEffect, useState } from "react"
 import { useNotificacoesService } from "../../services"
 import { useAuth } from "../../lib/context/AuthContext"
+import { API_BASE_URL, API_ENDPOINTS } from "../../lib/constants/api"
 import { Button } from "../atoms/Button"
 import { ConfirmModal } from "../atoms/ConfirmModal"
 
@@ -44,6 +45,52 @@ export const Header: React.FC = () => {
     }
   }, [state.user, notificacoesService])
 
+  // Push de notificações via Server-Sent Events (substitui o polling do contador).
+  // Cada conexão usa um ticket de uso único; se ela cair, pede outro e reconecta.
+  useEffect(() => {
+    if (!state.user || typeof EventSource === "undefined") return
+
+    let source: EventSource | null = null
+    let retry: ReturnType<typeof setTimeout> | undefined
+    let ativo = true
+
+    const conectar = async () => {
+      let ticket: string
+      try {
+        ticket = await notificacoesService.getStreamTicket()
+      } catch (err) {
+        if (ativo) retry = setTimeout(conectar, 5000)
+        return
+      }
+      if (!ativo) return
+
+      source = new EventSource(
+        `${API_BASE_URL}${API_ENDPOINTS.NOTIFICACOES_STREAM}?ticket=${encodeURIComponent(ticket)}`,
+      )
+      source.addEventListener("unread", (event) => {
+        const data = JSON.parse((event as MessageEvent).data)
+        setUnreadCount(data.unread ?? 0)
+      })
+      source.addEventListener("notificacao", () => {
+        setUnreadCount((count) => count + 1)
+        window.dispatchEvent(new Event("notificationReceived"))
+      })
+      source.onerror = () => {
+        // o ticket já foi usado: a reconexão automática do EventSource seria recusada
+        source?.close()
+        if (ativo) retry = setTimeout(conectar, 5000)
+      }
+    }
+
+    conectar()
+
+    return () => {
+      ativo = false
+      clearTimeout(retry)
+      source?.close()
+    }
+  }, [state.user, notificacoesService])
+
   const handleLogoutClick = () => {
     setShowLogoutConfirm(true)
   }
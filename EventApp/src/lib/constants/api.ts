@@ -13,6 +13,7 @@ export const API_ENDPOINTS = {
   // Eventos
   EVENTOS: "/v1/eventos/",
   EVENTO_DETAIL: (id: number) => `/v1/eventos/${id}/`,
+  EVENTO_BROADCAST: (id: number) => `/v1/eventos/${id}/broadcast/`,
 
   // Inscrições
   INSCRICOES: "/v1/inscricoes/",
@@ -23,6 +24,8 @@ export const API_ENDPOINTS = {
   // Notificações
   NOTIFICACOES: "/v1/notificacoes/",
   NOTIFICACAO_DETAIL: (id: number) => `/v1/notificacoes/${id}/`,
+  NOTIFICACOES_STREAM: "/v1/notificacoes/stream/",
+  NOTIFICACOES_STREAM_TICKET: "/v1/notificacoes/stream/ticket/",
 
   // Participantes
   PARTICIPANTES: "/v1/participantes/",
@@ -30,11 +30,16 @@ export interface BaseModel {
 
 export interface Evento extends BaseModel {
   titulo: string
-  descricao: string
+  // Ausente na listagem com ?resumo=1, que envia apenas descricao_resumo
+  descricao?: string
+  descricao_resumo?: string
   data_inicio: string
   data_fim: string
   local: string
   capacidade: number
+  // Contador de inscrições ativas mantido no backend
+  vagas_ocupadas?: number
+  vagas_restantes?: number
   is_active: boolean
   tipo: "presencial" | "virtual" | "hibrido"
   preco: string
@@ -56,7 +56,7 @@ export const getInscricaoStatusColor = (status: string): string => {
 }
 
 export const getCapacidadeText = (evento: Evento): string => {
-  return `${evento.capacidade} lugares disponíveis`
+  return `${evento.vagas_restantes ?? evento.capacidade} lugares disponíveis`
 }
 
 export const formatEventoData = (evento: Evento): Evento => {
@@ -1,6 +1,6 @@
 "use client"
 
-import { useState, useCallback } from "react"
+import { useState, useCallback, useEffect } from "react"
 import { Header } from "../components/organisms/Header"
 import { EventCard } from "../components/molecules/EventCard"
 import { EventFormModal } from "../components/molecules/EventFormModal"
@@ -17,6 +17,7 @@ import { PAGE_SIZE } from "../lib/constants/api"
 
 export default function EventosPage() {
   const [searchTerm, setSearchTerm] = useState("")
+  const [debouncedSearch, setDebouncedSearch] = useState("")
   const [showForm, setShowForm] = useState(false)
   const [editingEvent, setEditingEvent] = useState<Evento | null>(null)
   const [page, setPage] = useState(1)
@@ -33,7 +34,19 @@ export default function EventosPage() {
   const { isOrganizador } = useAuth()
   const toast = useToast()
 
-  const { data: eventosData, loading, refetch } = useFetch(() => eventosService.listEventos(page), [page])
+  // A busca é feita no servidor; aguarda o usuário parar de digitar antes de consultar
+  useEffect(() => {
+    const timeout = setTimeout(() => {
+      setDebouncedSearch(searchTerm.trim())
+      setPage(1)
+    }, 300)
+    return () => clearTimeout(timeout)
+  }, [searchTerm])
+
+  const { data: eventosData, loading, refetch } = useFetch(
+    () => eventosService.listEventos(page, debouncedSearch),
+    [page, debouncedSearch],
+  )
 
   const handleInscribe = useCallback(
     async (eventoId: number) => {
@@ -111,12 +124,7 @@ export default function EventosPage() {
     setDeleteConfirmState({ isOpen: false, eventoId: null })
   }, [])
 
-  const eventos = eventosData?.results || []
-  const filteredEventos = eventos.filter(
-    (evento: Evento) =>
-      evento.titulo.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      evento.descricao.toLowerCase().includes(searchTerm.toLowerCase()),
-  )
+  const filteredEventos = eventosData?.results || []
 
   return (
     <div className="min-h-screen bg-background">
@@ -156,8 +164,13 @@ export default function EventosPage() {
                 key={evento.id}
                 evento={evento}
                 onInscribe={handleInscribe}
-                onEdit={() => {
-                  setEditingEvent(evento)
+                onEdit={async () => {
+                  // A listagem não traz a descrição completa; carregar o evento antes de editar
+                  try {
+                    setEditingEvent(await eventosService.getEvento(evento.id))
+                  } catch {
+                    setEditingEvent(evento)
+                  }
                   setShowForm(true)
                 }}
                 onDelete={handleDelete}
@@ -80,14 +80,15 @@ export default function NotificacoesPage() {
     loadNotifications()
   }, [loadUnreadCount, loadNotifications])
 
-  // Polling
+  // Atualiza quando o stream de notificações (Header) recebe uma nova
   useEffect(() => {
-    const timer = window.setInterval(() => {
+    const handler = () => {
       loadUnreadCount()
       loadNotifications()
-    }, 30000)
+    }
+    window.addEventListener("notificationReceived", handler)
 
-    return () => window.clearInterval(timer)
+    return () => window.removeEventListener("notificationReceived", handler)
   }, [loadUnreadCount, loadNotifications])
 
   // Converter notificações do backend para formato de exibição
@@ -115,8 +116,7 @@ export default function NotificacoesPage() {
 
   const handleMarkAllAsRead = async () => {
     try {
-      const unreadNotifications = notificacoes.filter((n) => !n.is_read)
-      await Promise.all(unreadNotifications.map((n) => service.markAsRead(n.id)))
+      await service.markAllAsRead()
       setNotificacoes((prev) => prev.map((it) => ({ ...it, is_read: true })))
       await loadUnreadCount()
       window.dispatchEvent(new Event("notificationsUpdated"))
@@ -6,9 +6,10 @@ export function useEventosService() {
   const api = useApi()
 
   return {
-    listEventos: async (page = 1): Promise<PaginatedResponse<Evento>> => {
+    listEventos: async (page = 1, search = ""): Promise<PaginatedResponse<Evento>> => {
       const response = await api.get(API_ENDPOINTS.EVENTOS, {
-        params: { page },
+        // resumo=1: o card usa só descricao_resumo; o texto completo vem do detalhe
+        params: search ? { page, search, resumo: 1 } : { page, resumo: 1 },
       })
       return response.data
     },
@@ -39,5 +40,10 @@ export function useEventosService() {
     deleteEvento: async (id: number): Promise<void> => {
       await api.delete(API_ENDPOINTS.EVENTO_DETAIL(id))
     },
+
+    broadcastEvento: async (id: number, mensagem: string): Promise<{ destinatarios: number }> => {
+      const response = await api.post(API_ENDPOINTS.EVENTO_BROADCAST(id), { mensagem })
+      return response.data
+    },
   }
 }
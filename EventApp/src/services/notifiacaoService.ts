@@ -28,11 +28,27 @@ export const useNotificacoesService = () => {
       await api.post(`${API_ENDPOINTS.NOTIFICACAO_DETAIL(id)}mark_read/`)
     },
 
+    markManyAsRead: async (ids: number[]): Promise<number> => {
+      const response = await api.post(`${API_ENDPOINTS.NOTIFICACOES}mark_read/`, { ids })
+      return response.data?.marcadas ?? 0
+    },
+
+    markAllAsRead: async (): Promise<number> => {
+      const response = await api.post(`${API_ENDPOINTS.NOTIFICACOES}mark_all_read/`)
+      return response.data?.marcadas ?? 0
+    },
+
     getUnreadCount: async (): Promise<number> => {
       const response = await api.get(`${API_ENDPOINTS.NOTIFICACOES}unread_count/`)
       return response.data?.unread ?? 0
     },
 
+    // Ticket de uso único para abrir o stream (o access token não vai na URL)
+    getStreamTicket: async (): Promise<string> => {
+      const response = await api.post(API_ENDPOINTS.NOTIFICACOES_STREAM_TICKET)
+      return response.data.ticket
+    },
+
     deleteNotificacao: async (id: number): Promise<void> => {
       await api.delete(API_ENDPOINTS.NOTIFICACAO_DETAIL(id))
     },
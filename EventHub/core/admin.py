@@ -10,8 +10,8 @@ class SoftDeleteAdmin(admin.ModelAdmin):
         obj.delete()
 
     def delete_queryset(self, request, queryset):
-        for obj in queryset:
-            obj.delete()
+        # um UPDATE por tabela (com cascata), sem save() por objeto
+        queryset.soft_delete()
 
     def get_queryset(self, request):
         # Mostra apenas registros não deletados por padrão
@@ -46,6 +46,7 @@ class InscricaoAdmin(SoftDeleteAdmin):
     )
     list_filter = ("status", "is_deleted")
     search_fields = ("participante__nome", "evento__titulo")
+    list_select_related = ("participante", "evento")
 
 
 @admin.register(Notificacao)
@@ -56,6 +57,7 @@ class NotificacaoAdmin(SoftDeleteAdmin):
     )
     list_filter = ("is_deleted",)
     search_fields = ("mensagem", "participante__nome", "evento__titulo")
+    list_select_related = ("participante", "evento")
 
 @admin.register(Organizador)
 class OrganizadorAdmin(SoftDeleteAdmin):
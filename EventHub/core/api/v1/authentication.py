@@ -0,0 +1,101 @@
+"""Papel (participante/organizador) do usuário autenticado.
+
+O papel e o id do perfil vão como claims no token JWT e são resolvidos uma
+única vez por requisição (``perfil_da_requisicao``), evitando as consultas
+repetidas de ``user.organizador``/``user.participante`` em permissões,
+querysets e serializers. Tokens sem papel nas claims (anteriores às claims ou
+emitidos antes de o usuário criar o perfil) caem em uma consulta ao banco, e o
+refresh relê o papel no banco em vez de copiar o do token antigo.
+"""
+from collections import namedtuple
+
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+ROLE_PARTICIPANTE = "participante"
+ROLE_ORGANIZADOR = "organizador"
+
+Perfil = namedtuple("Perfil", ["role", "participante_id", "organizador_id"])
+
+PERFIL_ANONIMO = Perfil(None, None, None)
+
+
+def perfil_do_usuario(user):
+    """Consulta o papel do usuário no banco (uma query com os dois perfis)."""
+    if user is None or not user.is_authenticated:
+        return PERFIL_ANONIMO
+    return _perfil_por_id(user.pk)
+
+
+def _perfil_por_id(user_id):
+    ids = User.objects.filter(pk=user_id).values("organizador__id", "participante__id").first() or {}
+    if ids.get("organizador__id") is not None:
+        return Perfil(ROLE_ORGANIZADOR, None, ids["organizador__id"])
+    if ids.get("participante__id") is not None:
+        return Perfil(ROLE_PARTICIPANTE, ids["participante__id"], None)
+    return Perfil(None, None, None)
+
+
+def _perfil_das_claims(token):
+    """Perfil das claims do token; None (consultar o banco) se o papel não estiver nelas."""
+    try:
+        role = token["role"]
+    except (KeyError, TypeError):
+        return None
+    if role is None:
+        # token emitido antes de o usuário ter um perfil: o papel pode já existir
+        return None
+    return Perfil(role, token.get("participante_id"), token.get("organizador_id"))
+
+
+def perfil_da_requisicao(request):
+    """Papel do usuário da requisição, resolvido uma vez e guardado no request.
+
+    Usa as claims do access token quando presentes; senão consulta o banco.
+    """
+    if request is None:
+        return PERFIL_ANONIMO
+    perfil = getattr(request, "_perfil_eventhub", None)
+    if perfil is None:
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            perfil = PERFIL_ANONIMO
+        else:
+            perfil = _perfil_das_claims(getattr(request, "auth", None)) or perfil_do_usuario(user)
+        request._perfil_eventhub = perfil
+    return perfil
+
+
+class PerfilRefreshToken(RefreshToken):
+    """Refresh token com ``role``, ``participante_id`` e ``organizador_id``.
+
+    As claims são copiadas para os access tokens derivados.
+    """
+
+    @classmethod
+    def for_user(cls, user, perfil=None):
+        token = super().for_user(user)
+        token.definir_perfil(perfil or perfil_do_usuario(user))
+        return token
+
+    def definir_perfil(self, perfil):
+        self["role"] = perfil.role
+        self["participante_id"] = perfil.participante_id
+        self["organizador_id"] = perfil.organizador_id
+
+
+class PerfilTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = PerfilRefreshToken
+
+
+class PerfilTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh que relê o papel no banco (perfil criado ou removido desde o login)."""
+
+    token_class = PerfilRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        refresh.definir_perfil(_perfil_por_id(refresh.get(api_settings.USER_ID_CLAIM)))
+        return super().validate({**attrs, "refresh": str(refresh)})
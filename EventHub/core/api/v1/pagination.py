@@ -0,0 +1,65 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class RecentesCursorPagination(CursorPagination):
+    """Paginação por cursor (keyset) dos registros mais recentes primeiro.
+
+    A posição é dada por ``created_at`` com ``id`` como desempate, ambos
+    cobertos por índice, então a página N custa o mesmo que a primeira
+    e não há ``COUNT(*)``. Exceção: as inscrições de todos os eventos de um
+    organizador (``evento__organizer``) não seguem nenhum índice nessa ordem
+    (o ``(evento, created_at, id)`` serve a um evento por vez), então o banco
+    ordena as inscrições do organizador; com ``?evento=`` o índice volta a valer.
+    """
+    ordering = ("-created_at", "-id")
+
+
+class PaginacaoOpcionalCursor(PageNumberPagination):
+    """Mantém a paginação por página como padrão e permite optar pelo cursor.
+
+    Clientes existentes continuam usando ``?page=N`` e recebendo ``count``.
+    Para usar keyset basta enviar ``?paginacao=cursor`` na primeira página;
+    os links ``next``/``previous`` já carregam o parâmetro ``cursor``.
+
+    O cursor fixa a ordem em ``-created_at``; por isso é recusado (400) junto
+    com parâmetros que impõem outra ordem, como ``?search=`` (relevância).
+    """
+    modo_query_param = "paginacao"
+    cursor_pagination_class = RecentesCursorPagination
+    parametros_sem_cursor = ("search",)
+
+    def __init__(self):
+        self.cursor_paginator = None
+
+    def usa_cursor(self, request):
+        cursor_query_param = self.cursor_pagination_class.cursor_query_param
+        return (
+            request.query_params.get(self.modo_query_param) == "cursor"
+            or cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.usa_cursor(request):
+            conflitantes = [p for p in self.parametros_sem_cursor if request.query_params.get(p)]
+            if conflitantes:
+                raise ValidationError({
+                    self.modo_query_param: [
+                        f"Paginação por cursor não pode ser usada com {', '.join(conflitantes)}; "
+                        f"use a paginação por página."
+                    ]
+                })
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        self.cursor_paginator = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_html_context()
+        return super().get_html_context()
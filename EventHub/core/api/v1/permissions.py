@@ -1,5 +1,10 @@
+import hmac
+
+from django.conf import settings
 from rest_framework.permissions import BasePermission
 
+from .authentication import ROLE_ORGANIZADOR, perfil_da_requisicao
+
 
 class IsOrganizador(BasePermission):
     """Permite acesso apenas se o usuário estiver vinculado a um Organizador."""
@@ -8,12 +13,8 @@ class IsOrganizador(BasePermission):
         user = getattr(request, "user", None)
         if not user or not user.is_authenticated:
             return False
-        # verifica se existe um Organizador associado
-        try:
-            organizador = getattr(user, 'organizador', None)
-            return organizador is not None
-        except Exception:
-            return False
+        # papel resolvido uma vez por requisição (claims do token ou banco)
+        return perfil_da_requisicao(request).role == ROLE_ORGANIZADOR
 
     def has_object_permission(self, request, view, obj):
         """Permite operações em objetos apenas se o organizador dono do objeto for o usuário."""
@@ -21,18 +22,27 @@ class IsOrganizador(BasePermission):
         if not user or not user.is_authenticated:
             return False
         try:
-            organizador = getattr(user, 'organizador', None)
-            if organizador is None:
+            organizador_id = perfil_da_requisicao(request).organizador_id
+            if organizador_id is None:
                 return False
 
             # Se o objeto for um Evento, comparar o campo organizer
-            if hasattr(obj, 'organizer'):
-                return getattr(obj, 'organizer') == organizador
+            if hasattr(obj, 'organizer_id'):
+                return obj.organizer_id == organizador_id
 
             # Se for outro objeto relacionado a evento (ex: Inscricao.evento), tentar obter evento
-            if hasattr(obj, 'evento') and hasattr(obj.evento, 'organizer'):
-                return getattr(obj.evento, 'organizer') == organizador
+            if hasattr(obj, 'evento') and hasattr(obj.evento, 'organizer_id'):
+                return obj.evento.organizer_id == organizador_id
 
             return False
         except Exception:
             return False
+
+
+class IsProvedorPagamentos(BasePermission):
+    """Aceita só requisições com a chave ``PAGAMENTOS_WEBHOOK_TOKEN`` no header X-Pagamentos-Token."""
+
+    def has_permission(self, request, view):
+        esperado = getattr(settings, "PAGAMENTOS_WEBHOOK_TOKEN", None)
+        recebido = request.headers.get("X-Pagamentos-Token", "")
+        return bool(esperado) and hmac.compare_digest(recebido.encode(), esperado.encode())
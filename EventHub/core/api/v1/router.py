@@ -8,7 +8,9 @@ from .viewsets import (
 	OrganizadorViewSet,
 	RegisterViewSet,
     MeView,
+    ConfirmacoesPagamentoView,
 )
+from .stream import notificacoes_stream
 
 router = DefaultRouter()
 router.register(r'eventos', EventoViewSet)
@@ -17,10 +19,14 @@ router.register(r'inscricoes', InscricaoViewSet)
 router.register(r'notificacoes', NotificacaoViewSet)
 router.register(r'organizadores', OrganizadorViewSet)
 router.register(r'auth/register', RegisterViewSet, basename='auth-register')
-urlpatterns = router.urls
+# O stream vem antes das rotas do router para não ser capturado como notificacoes/<pk>/
+urlpatterns = [
+	path('notificacoes/stream/', notificacoes_stream, name='notificacao-stream'),
+] + router.urls
 
 # Rotas adicionais não baseadas em router
 urlpatterns += [
 	path('auth/me/', MeView.as_view(), name='auth-me'),
+	path('pagamentos/confirmacoes/', ConfirmacoesPagamentoView.as_view(), name='pagamento-confirmacoes'),
 ]
 
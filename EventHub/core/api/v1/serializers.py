@@ -1,7 +1,31 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import IntegrityError, transaction
+from ...integridade import Restricao, restricao_violada
 from ...models import Evento, Participante, Inscricao, Notificacao, Organizador
+from .authentication import (
+    ROLE_ORGANIZADOR,
+    ROLE_PARTICIPANTE,
+    Perfil,
+    PerfilRefreshToken,
+    perfil_da_requisicao,
+    perfil_do_usuario,
+)
+
+# Duplicidades detectadas pelo banco no cadastro → (campo, mensagem)
+RESTRICOES_CADASTRO = {
+    Restricao("auth_user_username_key", User, ("username",)): (
+        "username", "Um usuário com este nome de usuário já existe."
+    ),
+    Restricao("participante_email_uniq", Participante, ("email",)): (
+        "email", "Um participante com este e-mail já existe."
+    ),
+    Restricao("organizador_email_uniq", Organizador, ("email",)): (
+        "email", "Um organizador com este e-mail já existe."
+    ),
+}
+
 
 class UserRegisterSerializer(serializers.ModelSerializer):
     role = serializers.ChoiceField(choices=['participante', 'organizador'])
@@ -14,75 +38,69 @@ class UserRegisterSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('username', 'password', 'email', 'role', 'nome', 'telefone', 'empresa')
+        # unicidade do username fica com o banco (sem o SELECT do UniqueValidator)
+        extra_kwargs = {'username': {'validators': [UnicodeUsernameValidator()]}}
+
+    def validate(self, attrs):
+        if attrs['role'] == 'organizador' and not attrs.get('empresa'):
+            raise serializers.ValidationError({"empresa": "Campo obrigatório para organizadores"})
+        return attrs
 
     def create(self, validated_data):
+        """Cria o usuário e o perfil em uma transação.
+
+        Usuário e e-mail repetidos são detectados pelas restrições únicas do
+        banco (também entre cadastros simultâneos); o ``IntegrityError`` vira
+        erro de validação pelo nome da restrição. Só o e-mail usado pelo
+        outro tipo de perfil é consultado antes, pois nenhuma restrição
+        cobre as duas tabelas.
+        """
         role = validated_data.pop('role')
-        nome = validated_data.pop('nome')
-        telefone = validated_data.pop('telefone', None)
-        empresa = validated_data.pop('empresa', None)
-
-        # Verificar se já existe um participante com esse email
-        if Participante.objects.filter(email=validated_data['email']).exists():
-            raise serializers.ValidationError({"email": "Um participante com este e-mail já existe."})
-
-        # Verificar se já existe um organizador com esse email
-        if Organizador.objects.filter(email=validated_data['email']).exists():
-            raise serializers.ValidationError({"email": "Um organizador com este e-mail já existe."})
-
-        # Verificar se já existe um usuário com esse username
-        if User.objects.filter(username=validated_data['username']).exists():
-            raise serializers.ValidationError({"username": "Um usuário com este nome de usuário já existe."})
-
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data['email'],
-            password=validated_data['password']
-        )
-
-        # Criar Participante ou Organizador
-        if role == 'participante':
-            Participante.objects.create(
-                user=user,
-                nome=nome,
-                email=validated_data['email']
-            )
-        else:  # organizador
-            if not empresa:
-                raise serializers.ValidationError({"empresa": "Campo obrigatório para organizadores"})
-            
-            Organizador.objects.create(
-                user=user,
-                nome=nome,
-                email=validated_data['email'],
-                telefone=telefone,
-                empresa=empresa
+        email = validated_data['email']
+        outro = Organizador if role == ROLE_PARTICIPANTE else Participante
+        if outro.objects.filter(email=email).exists():
+            raise serializers.ValidationError(
+                {"email": f"Um {outro._meta.model_name} com este e-mail já existe."}
             )
 
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username=validated_data['username'],
+                    email=email,
+                    password=validated_data['password']
+                )
+                if role == ROLE_PARTICIPANTE:
+                    perfil = Participante.objects.create(user=user, nome=validated_data['nome'], email=email)
+                    self.perfil = Perfil(ROLE_PARTICIPANTE, perfil.pk, None)
+                else:
+                    perfil = Organizador.objects.create(
+                        user=user,
+                        nome=validated_data['nome'],
+                        email=email,
+                        telefone=validated_data.get('telefone'),
+                        empresa=validated_data['empresa']
+                    )
+                    self.perfil = Perfil(ROLE_ORGANIZADOR, None, perfil.pk)
+        except IntegrityError as erro:
+            restricao = restricao_violada(erro, RESTRICOES_CADASTRO)
+            if restricao is None:
+                raise
+            campo, mensagem = RESTRICOES_CADASTRO[restricao]
+            raise serializers.ValidationError({campo: [mensagem]})
         return user
 
     def to_representation(self, instance):
-        refresh = RefreshToken.for_user(instance)
-        # Busca o participante associado ao usuário
-        try:
-            participante = Participante.objects.get(user=instance)
-            participante_id = participante.id
-            role = 'participante'
-        except Participante.DoesNotExist:
-            try:
-                organizador = Organizador.objects.get(user=instance)
-                participante_id = None
-                role = 'organizador'
-            except Organizador.DoesNotExist:
-                participante_id = None
-                role = 'participante'
-
+        # o perfil recém-criado é reaproveitado; sem ele, uma consulta resolve o papel
+        perfil = getattr(self, 'perfil', None) or perfil_do_usuario(instance)
+        refresh = PerfilRefreshToken.for_user(instance, perfil)
         return {
             'user': {
                 'id': instance.id,
                 'username': instance.username,
                 'email': instance.email,
-                'participante_id': participante_id,
-                'role': role
+                'participante_id': perfil.participante_id,
+                'role': perfil.role or ROLE_PARTICIPANTE
             },
             'access': str(refresh.access_token),
             'refresh': str(refresh)
@@ -93,63 +111,74 @@ class EventoSerializer(serializers.ModelSerializer):
     organizer_nome = serializers.CharField(source='organizer.nome', read_only=True)
     isInscrito = serializers.SerializerMethodField(read_only=True)
     inscricaoStatus = serializers.SerializerMethodField(read_only=True)
+    vagas_restantes = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Evento
         fields = '__all__'
+        read_only_fields = ('vagas_ocupadas',)
 
     def create(self, validated_data):
         # Associação automática do organizador com base no usuário autenticado
-        request = self.context.get('request')
-        if request and hasattr(request, 'user') and request.user.is_authenticated:
-            try:
-                organizador = getattr(request.user, 'organizador', None)
-                if organizador:
-                    validated_data['organizer'] = organizador
-            except Exception:
-                pass
+        organizador_id = perfil_da_requisicao(self.context.get('request')).organizador_id
+        if organizador_id is not None:
+            validated_data.setdefault('organizer_id', organizador_id)
         return super().create(validated_data)
 
-    def get_isInscrito(self, obj):
-        """Retorna True se o usuário autenticado possui inscrição ativa (não cancelada) neste evento."""
-        request = self.context.get('request')
-        user = getattr(request, 'user', None)
-        try:
-            if not user or not user.is_authenticated:
-                return False
-            # Garantir que é participante
-            if not hasattr(user, 'participante') or user.participante is None:
-                return False
-            # Existe inscrição não cancelada para este evento?
-            return Inscricao.objects.filter(
-                evento=obj,
-                participante__user=user,
-                is_deleted=False
-            ).exclude(status='cancelada').exists()
-        except Exception:
-            return False
-
-    def get_inscricaoStatus(self, obj):
-        """Retorna o status da inscrição do usuário autenticado neste evento (ou None se não inscrito)."""
-        request = self.context.get('request')
-        user = getattr(request, 'user', None)
+    def _get_inscricao_status(self, obj):
+        """Status da inscrição do usuário autenticado neste evento (ou None).
+
+        Na listagem o viewset já anota ``inscricao_status`` em uma única query;
+        a consulta individual fica apenas como fallback (ex.: resposta de create).
+        """
+        if hasattr(obj, 'inscricao_status'):
+            return obj.inscricao_status
+        # Garantir que é participante (papel resolvido uma vez por requisição)
+        participante_id = perfil_da_requisicao(self.context.get('request')).participante_id
+        if participante_id is None:
+            return None
         try:
-            if not user or not user.is_authenticated:
-                return None
-            # Garantir que é participante
-            if not hasattr(user, 'participante') or user.participante is None:
-                return None
             # Buscar a inscrição mais recente do usuário para este evento
             inscricao = Inscricao.objects.filter(
                 evento=obj,
-                participante__user=user,
+                participante_id=participante_id,
                 is_deleted=False
             ).order_by('-data_inscricao').first()
-            
+
             return inscricao.status if inscricao else None
         except Exception:
             return None
 
+    def get_isInscrito(self, obj):
+        """Retorna True se o usuário autenticado possui inscrição ativa (não cancelada) neste evento."""
+        status_inscricao = self._get_inscricao_status(obj)
+        return status_inscricao is not None and status_inscricao != 'cancelada'
+
+    def get_inscricaoStatus(self, obj):
+        """Retorna o status da inscrição do usuário autenticado neste evento (ou None se não inscrito)."""
+        return self._get_inscricao_status(obj)
+
+
+class EventoListSerializer(EventoSerializer):
+    """Card da listagem: sem colunas internas (soft delete) nem inscrições."""
+
+    class Meta(EventoSerializer.Meta):
+        fields = (
+            'id', 'titulo', 'descricao', 'data_inicio', 'data_fim', 'local', 'capacidade',
+            'vagas_ocupadas', 'vagas_restantes', 'is_active', 'tipo', 'preco', 'organizer',
+            'organizer_nome', 'isInscrito', 'inscricaoStatus', 'created_at', 'updated_at',
+        )
+
+
+class EventoResumoListSerializer(EventoListSerializer):
+    """Listagem com ``?resumo=1``: ``descricao_resumo`` no lugar da descrição completa."""
+    descricao_resumo = serializers.CharField(read_only=True)
+
+    class Meta(EventoListSerializer.Meta):
+        fields = tuple(
+            'descricao_resumo' if campo == 'descricao' else campo for campo in EventoListSerializer.Meta.fields
+        )
+
 
 class EventoBriefSerializer(serializers.ModelSerializer):
     organizer_nome = serializers.CharField(source='organizer.nome', read_only=True)
@@ -157,11 +186,34 @@ class EventoBriefSerializer(serializers.ModelSerializer):
     class Meta:
         model = Evento
         fields = (
-            'id', 'titulo', 'data_inicio', 'data_fim', 'local', 'capacidade',
+            'id', 'titulo', 'data_inicio', 'data_fim', 'local', 'capacidade', 'vagas_ocupadas',
             'is_active', 'tipo', 'preco', 'organizer', 'organizer_nome', 'created_at', 'updated_at'
         )
 
 
+class EventoDashboardSerializer(serializers.Serializer):
+    """Linha do painel do organizador (dicionários de ``metricas_eventos``)."""
+    id = serializers.IntegerField()
+    titulo = serializers.CharField()
+    data_inicio = serializers.DateTimeField()
+    capacidade = serializers.IntegerField()
+    preco = serializers.DecimalField(max_digits=8, decimal_places=2)
+    pendentes = serializers.IntegerField()
+    confirmadas = serializers.IntegerField()
+    canceladas = serializers.IntegerField()
+    taxa_ocupacao = serializers.FloatField(allow_null=True)
+    receita_prevista = serializers.DecimalField(max_digits=14, decimal_places=2)
+    receita_confirmada = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class SerieInscricoesSerializer(serializers.Serializer):
+    """Período da série de inscrições com o total por status."""
+    inicio = serializers.DateTimeField()
+    pendente = serializers.IntegerField()
+    confirmada = serializers.IntegerField()
+    cancelada = serializers.IntegerField()
+
+
 class ParticipanteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Participante
@@ -230,26 +282,20 @@ class ParticipanteDetailSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         # Filtrar apenas inscrições confirmadas
         qs = obj.inscricoes.filter(status='confirmada').select_related('evento', 'participante')
-        try:
-            user = getattr(request, 'user', None) if request else None
-            if user and hasattr(user, 'organizador') and user.organizador is not None:
-                # Organizador vê apenas inscrições confirmadas dos seus eventos
-                qs = qs.filter(evento__organizer=user.organizador)
-        except Exception:
-            pass
+        organizador_id = perfil_da_requisicao(request).organizador_id
+        if organizador_id is not None:
+            # Organizador vê apenas inscrições confirmadas dos seus eventos
+            qs = qs.filter(evento__organizer_id=organizador_id)
         return InscricaoBriefSerializer(qs, many=True).data
 
     def get_total_inscricoes(self, obj):
         request = self.context.get('request')
         # Contar apenas inscrições confirmadas
         qs = obj.inscricoes.filter(status='confirmada')
-        try:
-            user = getattr(request, 'user', None) if request else None
-            if user and hasattr(user, 'organizador') and user.organizador is not None:
-                # Organizador conta apenas inscrições confirmadas dos seus eventos
-                return qs.filter(evento__organizer=user.organizador).count()
-        except Exception:
-            pass
+        organizador_id = perfil_da_requisicao(request).organizador_id
+        if organizador_id is not None:
+            # Organizador conta apenas inscrições confirmadas dos seus eventos
+            return qs.filter(evento__organizer_id=organizador_id).count()
         return qs.count()
 
 
@@ -278,6 +324,9 @@ class EventoDetailSerializer(EventoSerializer):
         fields = '__all__'
 
     def get_total_inscricoes(self, obj):
+        # anotado com Count no detalhe do viewset
+        if hasattr(obj, 'total_inscricoes'):
+            return obj.total_inscricoes
         try:
             return obj.inscricoes.count()
         except Exception:
@@ -0,0 +1,126 @@
+import json
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ...contadores import obter_nao_lidas
+from ...models import Organizador, Participante
+from ...pubsub import canal_destinatario, get_broker
+
+# Intervalo (s) dos comentários de keep-alive enviados a conexões ociosas
+HEARTBEAT_SEGUNDOS = 15
+
+# Validade (s) do ticket de conexão ao stream
+TICKET_SEGUNDOS = 30
+
+
+def _chave_ticket(ticket):
+    return f"stream:ticket:{ticket}"
+
+
+def emitir_ticket(destinatario):
+    """Ticket de uso único para abrir o stream com ``?ticket=``.
+
+    O EventSource do navegador não envia headers, e o access token na URL
+    acabaria em logs de proxies e no histórico; o ticket vale por
+    ``TICKET_SEGUNDOS`` e é apagado na primeira conexão. Fica no cache, que
+    precisa ser compartilhado entre processos (Redis) fora do desenvolvimento.
+    """
+    ticket = secrets.token_urlsafe(32)
+    cache.set(_chave_ticket(ticket), destinatario, TICKET_SEGUNDOS)
+    return ticket
+
+
+async def _consumir_ticket(ticket):
+    """Destinatário do ticket, que deixa de valer; None se inválido, expirado ou já usado."""
+    chave = _chave_ticket(ticket)
+    destinatario = await cache.aget(chave)
+    # só a conexão que de fato apagou a chave usa o ticket
+    if destinatario is None or not await cache.adelete(chave):
+        return None
+    return destinatario
+
+
+def _token_do_header(request):
+    """Token JWT do header Authorization (clientes que não são o EventSource do navegador)."""
+    header = request.headers.get("Authorization", "")
+    tipo, _, valor = header.partition(" ")
+    if tipo in jwt_settings.AUTH_HEADER_TYPES and valor:
+        return valor
+    return None
+
+
+async def _resolver_destinatario(token):
+    """Retorna o filtro do destinatário (participante/organizador) do token, ou None."""
+    try:
+        access = AccessToken(token)
+        user_id = access[jwt_settings.USER_ID_CLAIM]
+    except (TokenError, KeyError):
+        return None
+    if not await User.objects.filter(pk=user_id, is_active=True).aexists():
+        return None
+    # tokens emitidos com as claims de papel dispensam a busca do perfil
+    if access.get("organizador_id") is not None:
+        return {"organizador_id": access["organizador_id"]}
+    if access.get("participante_id") is not None:
+        return {"participante_id": access["participante_id"]}
+    organizador_id = await Organizador.objects.filter(user_id=user_id).values_list("id", flat=True).afirst()
+    if organizador_id is not None:
+        return {"organizador_id": organizador_id}
+    participante_id = await Participante.objects.filter(user_id=user_id).values_list("id", flat=True).afirst()
+    if participante_id is not None:
+        return {"participante_id": participante_id}
+    return None
+
+
+def _evento_sse(nome, dados):
+    return f"event: {nome}\ndata: {json.dumps(dados, default=str)}\n\n"
+
+
+async def _eventos(destinatario):
+    assinatura = await get_broker().assinar(canal_destinatario(**destinatario))
+    try:
+        # Assina antes de contar para não perder notificações criadas no meio
+        unread = await sync_to_async(obter_nao_lidas)(**destinatario)
+        yield "retry: 5000\n\n"
+        yield _evento_sse("unread", {"tipo": "unread", "unread": unread})
+        while True:
+            mensagem = await assinatura.receber(timeout=HEARTBEAT_SEGUNDOS)
+            if mensagem is None:
+                yield ": ping\n\n"
+                continue
+            yield _evento_sse(mensagem["tipo"], mensagem)
+    finally:
+        await assinatura.fechar()
+
+
+@require_GET
+async def notificacoes_stream(request):
+    """Server-Sent Events com novas notificações e mudanças no total de não lidas.
+
+    Substitui o polling de ``unread_count``: cada cliente conectado é apenas
+    uma corrotina aguardando sua fila, sem consultas ao banco enquanto ocioso.
+    Precisa ser servido por um servidor ASGI (ex.: ``uvicorn EventHub.asgi:application``).
+    Autentica pelo header Authorization ou por ``?ticket=`` obtido em
+    ``POST /notificacoes/stream/ticket/``; o access token nunca vai na URL.
+    """
+    token = _token_do_header(request)
+    ticket = request.GET.get("ticket")
+    if token:
+        destinatario = await _resolver_destinatario(token)
+    else:
+        destinatario = await _consumir_ticket(ticket) if ticket else None
+    if destinatario is None:
+        return JsonResponse({"detail": "Token ou ticket inválido ou ausente."}, status=401)
+
+    response = StreamingHttpResponse(_eventos(destinatario), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # não bufferizar atrás de proxies (nginx)
+    return response
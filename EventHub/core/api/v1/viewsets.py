@@ -1,9 +1,23 @@
+from datetime import datetime, time, timedelta
+
 from rest_framework import viewsets, mixins
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Left
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
 from rest_framework import serializers
 from ...models import Evento, Participante, Inscricao, Notificacao, Organizador
 from .serializers import (
     EventoSerializer,
     EventoDetailSerializer,
+    EventoListSerializer,
+    EventoResumoListSerializer,
+    EventoDashboardSerializer,
+    SerieInscricoesSerializer,
     ParticipanteSerializer,
     ParticipanteDetailSerializer,
     InscricaoSerializer,
@@ -14,7 +28,19 @@ from .serializers import (
 )
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
-from .permissions import IsOrganizador
+from .authentication import ROLE_ORGANIZADOR, ROLE_PARTICIPANTE, perfil_da_requisicao
+from .permissions import IsOrganizador, IsProvedorPagamentos
+from .pagination import PaginacaoOpcionalCursor
+from .stream import emitir_ticket
+from ...cache_eventos import chave_resposta, etag_para, guardar_resposta, obter_resposta
+from ...contadores import ajustar_nao_lidas, invalidar_nao_lidas, obter_nao_lidas
+from ...dashboard import metricas_eventos
+from ...exportacao import FORMATOS as FORMATOS_EXPORTACAO, resposta_exportacao
+from ...inscricoes import inscrever_em_lote
+from ...notificacoes import agendar_broadcast, publicar_unread
+from ...pagamentos import confirmar_pagamentos
+from ...search import buscar_eventos
+from ...series import GRANULARIDADES, serie_evento
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
@@ -28,31 +54,26 @@ class RegisterViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     permission_classes = [AllowAny]
 
     def create(self, request, *args, **kwargs):
+        # duplicidades (inclusive entre cadastros simultâneos) chegam como ValidationError do serializer
         serializer = self.get_serializer(data=request.data)
         try:
             serializer.is_valid(raise_exception=True)
-            user = serializer.save()
+            serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         except serializers.ValidationError as e:
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            # Se for erro de integridade (duplicidade), retorna 400 em vez de 500
-            if 'UNIQUE constraint failed' in str(e):
-                if 'auth_user.username' in str(e):
-                    return Response(
-                        {'username': ['Este nome de usuário já está em uso.']},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-                if 'core_participante.email' in str(e):
-                    return Response(
-                        {'email': ['Este e-mail já está em uso.']},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            raise
+
+# Limite de linhas aceitas por requisição de inscrição em lote / confirmações de pagamento
+INSCRICOES_LOTE_MAXIMO = 10000
+CONFIRMACOES_LOTE_MAXIMO = 10000
+
 
 class EventoViewSet(viewsets.ModelViewSet):
     queryset = Evento.objects.all()
     serializer_class = EventoSerializer
+    pagination_class = PaginacaoOpcionalCursor
+    # leituras do catálogo servidas pelas réplicas (core.replicas)
+    acoes_em_replica = ("list", "retrieve")
     
     def get_permissions(self):
         # leitura pública é permitida (ajuste se necessário)
@@ -61,43 +82,289 @@ class EventoViewSet(viewsets.ModelViewSet):
         # criação/edição/exclusão exigem usuário autenticado e organizador
         return [IsAuthenticated(), IsOrganizador()]
 
+    # Campos lidos na listagem (EventoListSerializer); com ``?resumo=1`` a
+    # descrição completa dá lugar a ``descricao_resumo`` (EventoResumoListSerializer)
+    CAMPOS_LISTAGEM = (
+        "id", "titulo", "data_inicio", "data_fim", "local", "capacidade", "vagas_ocupadas",
+        "is_active", "tipo", "preco", "organizer", "organizer__nome", "created_at", "updated_at",
+    )
+    TAMANHO_RESUMO = 200
+
     def get_queryset(self):
         """Restringe eventos para o organizador autenticado ver apenas os próprios.
         Participantes/usuários anônimos continuam vendo todos os eventos públicos.
+        Na listagem, ``?search=`` filtra e ordena os eventos por relevância.
+
+        O formato da query depende da ação: a listagem lê só as colunas do card
+        (sem inscrições; com ``?resumo=1``, só os primeiros caracteres da
+        descrição); o detalhe pré-carrega as inscrições e anota o total com
+        ``Count``; as escritas não carregam relacionamentos.
         """
-        base_qs = Evento.objects.select_related("organizer").prefetch_related("inscricoes__participante")
-        user = getattr(self.request, "user", None)
-        try:
-            if user and user.is_authenticated and hasattr(user, "organizador") and user.organizador is not None:
-                return base_qs.filter(organizer=user.organizador)
-        except Exception:
-            pass
+        base_qs = Evento.objects.select_related("organizer")
+        if self.action == "list":
+            if self._listagem_resumida():
+                base_qs = base_qs.only(*self.CAMPOS_LISTAGEM).annotate(
+                    descricao_resumo=Left("descricao", self.TAMANHO_RESUMO)
+                )
+            else:
+                base_qs = base_qs.only(*self.CAMPOS_LISTAGEM, "descricao")
+            base_qs = buscar_eventos(base_qs, self.request.query_params.get("search"))
+        elif self.action == "retrieve":
+            inscricoes = Inscricao.objects.select_related("participante").only(
+                "id", "evento", "participante__nome", "status", "data_inscricao", "updated_at"
+            )
+            base_qs = base_qs.prefetch_related(Prefetch("inscricoes", queryset=inscricoes)).annotate(
+                total_inscricoes=Count("inscricoes", filter=Q(inscricoes__is_deleted=False))
+            )
+        perfil = perfil_da_requisicao(self.request)
+        if perfil.organizador_id is not None:
+            return base_qs.filter(organizer_id=perfil.organizador_id)
+        if perfil.participante_id is not None and self.action in ("list", "retrieve"):
+            return self._annotate_inscricao_status(base_qs, perfil.participante_id)
         return base_qs
 
+    @staticmethod
+    def _annotate_inscricao_status(queryset, participante_id):
+        """Anota o status da inscrição do participante em cada evento.
+
+        Resolve isInscrito/inscricaoStatus da página inteira na própria query
+        de eventos, em vez de duas consultas por evento no serializer.
+        """
+        inscricao = Inscricao.objects.filter(
+            evento=OuterRef("pk"),
+            participante_id=participante_id,
+        ).order_by("-data_inscricao")
+        return queryset.annotate(inscricao_status=Subquery(inscricao.values("status")[:1]))
+
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return EventoDetailSerializer
+        if self.action == 'list':
+            return EventoResumoListSerializer if self._listagem_resumida() else EventoListSerializer
         return super().get_serializer_class()
 
-    def perform_create(self, serializer):
-        """Ao criar um evento, atribui automaticamente o organizador logado."""
+    def _listagem_resumida(self):
+        return self.request.query_params.get("resumo") in ("1", "true")
+
+    def list(self, request, *args, **kwargs):
+        """Listagem com ETag/Last-Modified (maior ``updated_at`` da página).
+
+        Respostas anônimas ficam no cache compartilhado: um acerto não consulta
+        o banco nem serializa. O 304 é decidido antes da serialização.
+        """
+        chave = self._chave_cache_publico(request)
+        if chave:
+            resposta = self._resposta_em_cache(request, chave)
+            if resposta is not None:
+                return resposta
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        eventos = page if page is not None else list(queryset)
+        etag = etag_para(
+            request.get_full_path(),
+            request.user.pk,
+            self._total_paginado(),
+            *((e.pk, e.updated_at.isoformat(), getattr(e, "inscricao_status", None)) for e in eventos),
+        )
+        last_modified = int(max(e.updated_at for e in eventos).timestamp()) if eventos else None
+        nao_modificado = self._nao_modificado(request, etag, last_modified)
+        if nao_modificado is not None:
+            return nao_modificado
+
+        serializer = self.get_serializer(eventos, many=True)
+        if page is not None:
+            response = self.get_paginated_response(serializer.data)
+        else:
+            response = Response(serializer.data)
+        self._chave_cache = chave
+        return self._aplicar_validadores(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Detalhe com ETag/Last-Modified do evento e das inscrições (já pré-carregadas)."""
+        chave = self._chave_cache_publico(request)
+        if chave:
+            resposta = self._resposta_em_cache(request, chave)
+            if resposta is not None:
+                return resposta
+
+        instance = self.get_object()
+        inscricoes = list(instance.inscricoes.all())
+        etag = etag_para(
+            request.get_full_path(),
+            request.user.pk,
+            instance.pk,
+            instance.updated_at.isoformat(),
+            getattr(instance, "inscricao_status", None),
+            *((i.pk, i.updated_at.isoformat()) for i in inscricoes),
+        )
+        last_modified = int(max([instance.updated_at] + [i.updated_at for i in inscricoes]).timestamp())
+        nao_modificado = self._nao_modificado(request, etag, last_modified)
+        if nao_modificado is not None:
+            return nao_modificado
+
+        response = Response(self.get_serializer(instance).data)
+        self._chave_cache = chave
+        return self._aplicar_validadores(response, etag, last_modified)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        chave = getattr(self, "_chave_cache", None)
+        if chave and response.status_code == 200 and isinstance(response, Response):
+            response.render()
+            guardar_resposta(chave, response)
+        return response
+
+    def _chave_cache_publico(self, request):
+        """Chave no cache compartilhado; só respostas JSON de anônimos são guardadas."""
+        if request.user.is_authenticated or request.accepted_renderer.format != "json":
+            return None
+        return chave_resposta(self.action, request.path, request.query_params)
+
+    def _resposta_em_cache(self, request, chave):
+        guardada = obter_resposta(chave)
+        if guardada is None:
+            return None
+        last_modified = parse_http_date_safe(guardada["last_modified"] or "")
+        nao_modificado = self._nao_modificado(request, guardada["etag"], last_modified)
+        if nao_modificado is not None:
+            return nao_modificado
+        response = HttpResponse(guardada["content"], content_type=guardada["content_type"])
+        return self._aplicar_validadores(response, guardada["etag"], last_modified)
+
+    def _total_paginado(self):
         try:
-            organizador = self.request.user.organizador
-        except Exception:
-            organizador = None
+            return self.paginator.page.paginator.count
+        except AttributeError:
+            return None
+
+    def _nao_modificado(self, request, etag, last_modified):
+        """304 quando If-None-Match/If-Modified-Since batem com os validadores; senão None."""
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            return None
+        return self._aplicar_validadores(response, etag, last_modified)
+
+    @staticmethod
+    def _aplicar_validadores(response, etag, last_modified):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        # o cliente pode guardar, mas deve revalidar (If-None-Match) a cada uso
+        patch_cache_control(response, no_cache=True)
+        patch_vary_headers(response, ("Authorization",))
+        return response
 
-        if organizador is None:
+    def perform_create(self, serializer):
+        """Ao criar um evento, atribui automaticamente o organizador logado."""
+        organizador_id = perfil_da_requisicao(self.request).organizador_id
+        if organizador_id is None:
             # segurança: não permitir criação sem organizador
-            from rest_framework.exceptions import ValidationError
             raise ValidationError("Usuário não possui perfil de organizador")
 
-        serializer.save(organizer=organizador)
+        serializer.save(organizer_id=organizador_id)
 
     def perform_update(self, serializer):
         """Ao atualizar, garante que o organizador do evento não seja alterado."""
-        instance = self.get_object()
-        # preserva o organizador original
-        serializer.save(organizer=instance.organizer)
+        # preserva o organizador original (instância já carregada por get_object)
+        serializer.save(organizer_id=serializer.instance.organizer_id)
+
+    @action(detail=False, methods=["get"])
+    def dashboard(self, request):
+        """Indicadores por evento do organizador: inscrições por status, ocupação e receita."""
+        linhas = metricas_eventos(perfil_da_requisicao(request).organizador_id)
+        return Response(EventoDashboardSerializer(linhas, many=True).data)
+
+    @action(detail=True, methods=["get"], url_path="inscricoes/serie", url_name="inscricoes-serie")
+    def inscricoes_serie(self, request, pk=None):
+        """Inscrições por período (``?granularidade=dia|hora&inicio=&fim=``).
+
+        Lê só as séries pré-agregadas; sem ``inicio``/``fim``, devolve os
+        últimos 30 dias (ou 48 horas). Datas aceitam ``AAAA-MM-DD`` ou ISO 8601.
+        """
+        evento = self.get_object()
+        granularidade = request.query_params.get("granularidade", "dia")
+        if granularidade not in GRANULARIDADES:
+            raise ValidationError({"granularidade": [f"Use um destes valores: {', '.join(GRANULARIDADES)}."]})
+        fim = self._data_do_filtro(request, "fim") or timezone.now()
+        padrao = timedelta(days=30) if granularidade == "dia" else timedelta(hours=48)
+        inicio = self._data_do_filtro(request, "inicio") or fim - padrao
+        if inicio >= fim:
+            raise ValidationError({"inicio": ["Deve ser anterior a fim."]})
+        periodos = serie_evento(evento.pk, granularidade, inicio, fim)
+        return Response({
+            "granularidade": granularidade,
+            "inicio": serializers.DateTimeField().to_representation(inicio),
+            "fim": serializers.DateTimeField().to_representation(fim),
+            "periodos": SerieInscricoesSerializer(periodos, many=True).data,
+        })
+
+    @staticmethod
+    def _data_do_filtro(request, nome):
+        valor = request.query_params.get(nome)
+        if not valor:
+            return None
+        try:
+            momento = parse_datetime(valor)
+            if momento is None and (data := parse_date(valor)) is not None:
+                momento = datetime.combine(data, time.min)
+        except ValueError:
+            momento = None
+        if momento is None:
+            raise ValidationError({nome: ["Data inválida; use AAAA-MM-DD ou ISO 8601."]})
+        return timezone.make_aware(momento) if timezone.is_naive(momento) else momento
+
+    @action(detail=True, methods=["post"], url_path="inscricoes/lote", url_name="inscricoes-lote")
+    def inscricoes_lote(self, request, pk=None):
+        """Inscreve vários participantes (ids ou e-mails) no evento do organizador.
+
+        Corpo: ``{"participantes": [12, "ana@empresa.com", ...]}``. Retorna o
+        resultado de cada linha e um resumo por tipo de resultado.
+        """
+        evento = self.get_object()
+        participantes = request.data.get("participantes")
+        if not isinstance(participantes, list) or not participantes:
+            return Response(
+                {"participantes": ["Informe uma lista de ids ou e-mails de participantes."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(participantes) > INSCRICOES_LOTE_MAXIMO:
+            return Response(
+                {"participantes": [f"Máximo de {INSCRICOES_LOTE_MAXIMO} participantes por lote."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        resultados = inscrever_em_lote(evento, participantes)
+        resumo = {}
+        for resultado in resultados:
+            resumo[resultado["resultado"]] = resumo.get(resultado["resultado"], 0) + 1
+        return Response({"resumo": resumo, "resultados": resultados}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"], url_path="inscricoes/exportar", url_name="inscricoes-exportar")
+    def inscricoes_exportar(self, request, pk=None):
+        """Exporta as inscrições do evento (``?formato=csv`` ou ``jsonl``) em streaming."""
+        formato = request.query_params.get("formato", "csv")
+        if formato not in FORMATOS_EXPORTACAO:
+            return Response(
+                {"formato": [f"Use um destes formatos: {', '.join(FORMATOS_EXPORTACAO)}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return resposta_exportacao(self.get_object(), formato)
+
+    @action(detail=True, methods=["post"])
+    def broadcast(self, request, pk=None):
+        """Agenda uma mensagem do organizador a todos os inscritos (não cancelados) do evento.
+
+        O envio é feito pelo worker do outbox, em blocos; a resposta (202)
+        informa quantos inscritos serão avisados.
+        """
+        evento = self.get_object()
+        mensagem = (request.data.get("mensagem") or "").strip()
+        if not mensagem:
+            return Response({"mensagem": ["Este campo é obrigatório."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        agendar_broadcast(evento, f"📣 {evento.titulo}: {mensagem}")
+        destinatarios = Inscricao.objects.filter(evento=evento).exclude(status="cancelada").count()
+        return Response({"destinatarios": destinatarios}, status=status.HTTP_202_ACCEPTED)
 
     
 
@@ -108,7 +375,9 @@ class ParticipanteViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Participante.objects.all().prefetch_related("inscricoes__evento")
+        # A listagem não exibe inscrições e o detalhe as filtra no serializer
+        # (apenas confirmadas, por organizador): pré-carregá-las só gastava queries
+        return Participante.objects.all()
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -119,25 +388,23 @@ class ParticipanteViewSet(viewsets.ModelViewSet):
 class InscricaoViewSet(viewsets.ModelViewSet):
     queryset = Inscricao.objects.all()
     serializer_class = InscricaoSerializer
+    pagination_class = PaginacaoOpcionalCursor
     permission_classes = [IsAuthenticated]
     filterset_fields = ['status', 'evento', 'participante']  # Filtros básicos
 
     def get_queryset(self):
-        user = self.request.user
+        perfil = perfil_da_requisicao(self.request)
         base_qs = Inscricao.objects.select_related("participante", "evento", "evento__organizer")
         
         # Filtros via query params
         status_filter = self.request.query_params.get('status', None)
         evento_filter = self.request.query_params.get('evento', None)
         
-        try:
-            if hasattr(user, 'participante'):
-                qs = base_qs.filter(participante=user.participante)
-            elif hasattr(user, 'organizador'):
-                qs = base_qs.filter(evento__organizer=user.organizador)
-            else:
-                qs = Inscricao.objects.none()
-        except Exception:
+        if perfil.participante_id is not None:
+            qs = base_qs.filter(participante_id=perfil.participante_id)
+        elif perfil.organizador_id is not None:
+            qs = base_qs.filter(evento__organizer_id=perfil.organizador_id)
+        else:
             qs = Inscricao.objects.none()
         
         # Aplicar filtros de status e evento
@@ -205,8 +472,16 @@ class InscricaoViewSet(viewsets.ModelViewSet):
 
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
-        # Salvar garantindo o status inicial correto mesmo sendo read_only no input
-        instance = serializer.save(status=status_inicial)
+        with transaction.atomic():
+            # Reserva a vaga e cria a inscrição na mesma transação: se a criação
+            # falhar, a vaga é devolvida no rollback
+            if not Evento.reservar_vaga(evento.pk):
+                return Response(
+                    {"detail": "Não há vagas disponíveis para este evento."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            # Salvar garantindo o status inicial correto mesmo sendo read_only no input
+            instance = serializer.save(status=status_inicial)
         headers = self.get_success_headers(serializer.data)
 
         # Retornar informações adicionais para o frontend exibir a mensagem adequada
@@ -230,7 +505,7 @@ class InscricaoViewSet(viewsets.ModelViewSet):
         # Garante autenticação e papel
         if not user or not user.is_authenticated:
             return Response({"detail": "Não autenticado"}, status=status.HTTP_401_UNAUTHORIZED)
-        if not hasattr(user, 'organizador') or user.organizador is None:
+        if perfil_da_requisicao(request).role != ROLE_ORGANIZADOR:
             return Response({"detail": "Acesso restrito a organizadores"}, status=status.HTTP_403_FORBIDDEN)
 
         queryset = self.get_queryset()  # já filtrado por organizador no get_queryset
@@ -248,59 +523,114 @@ class InscricaoViewSet(viewsets.ModelViewSet):
         verão a inscrição via get_queryset, então self.get_object() já respeita o escopo.
         """
         inscricao = self.get_object()
-        if inscricao.status == "cancelada":
+        if not inscricao.cancelar():
             return Response({"detail": "Inscrição já está cancelada"}, status=status.HTTP_200_OK)
 
-        inscricao.status = "cancelada"
-        inscricao.save(update_fields=["status", "updated_at"])
         serializer = self.get_serializer(inscricao)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 class NotificacaoViewSet(viewsets.ModelViewSet):
     queryset = Notificacao.objects.all()
     serializer_class = NotificacaoSerializer
+    pagination_class = PaginacaoOpcionalCursor
 
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        user = self.request.user
+        perfil = perfil_da_requisicao(self.request)
         base_qs = Notificacao.objects.select_related("participante", "evento", "evento__organizer", "organizador")
         # Se for organizador, retornar notificações destinadas ao organizador logado
-        try:
-            if hasattr(user, 'organizador') and user.organizador is not None:
-                return base_qs.filter(organizador=user.organizador)
-        except Exception:
-            pass
+        if perfil.organizador_id is not None:
+            return base_qs.filter(organizador_id=perfil.organizador_id)
 
         # Se for participante, retornar notificações destinadas ao participante logado
-        try:
-            if hasattr(user, 'participante') and user.participante is not None:
-                return base_qs.filter(participante=user.participante)
-        except Exception:
-            pass
+        if perfil.participante_id is not None:
+            return base_qs.filter(participante_id=perfil.participante_id)
 
         return Notificacao.objects.none()
 
+    def perform_update(self, serializer):
+        # Edição genérica pode alterar is_read: o contador é recalculado na próxima leitura
+        notificacao = serializer.save()
+        invalidar_nao_lidas([(notificacao.participante_id, notificacao.organizador_id)])
+
+    def _destinatario(self):
+        """(participante_id, organizador_id) do usuário autenticado."""
+        perfil = perfil_da_requisicao(self.request)
+        if perfil.organizador_id is not None:
+            return None, perfil.organizador_id
+        return perfil.participante_id, None
+
+    def _marcar_como_lidas(self, ids=None):
+        """Marca como lidas, em um único UPDATE, as notificações não lidas do usuário.
+
+        Sem ``save()`` por objeto: não reescreve as demais colunas nem dispara
+        post_save. Retorna a quantidade de notificações atualizadas.
+        """
+        participante_id, organizador_id = self._destinatario()
+        if participante_id is None and organizador_id is None:
+            return 0
+        if organizador_id is not None:
+            qs = Notificacao.objects.filter(organizador_id=organizador_id, is_read=False)
+        else:
+            qs = Notificacao.objects.filter(participante_id=participante_id, is_read=False)
+        if ids is not None:
+            qs = qs.filter(pk__in=ids)
+        marcadas = qs.update(is_read=True, updated_at=timezone.now())
+        if marcadas:
+            ajustar_nao_lidas(-marcadas, participante_id, organizador_id)
+            publicar_unread(participante_id, organizador_id)
+        return marcadas
+
     @action(detail=True, methods=["post"])
     def mark_read(self, request, pk=None):
         """Marca uma notificação como lida."""
         try:
             notificacao = self.get_object()
-            notificacao.is_read = True
-            notificacao.save()
+            self._marcar_como_lidas([notificacao.pk])
             return Response({'status': 'marked'}, status=status.HTTP_200_OK)
         except Exception:
             return Response({'detail': 'Erro ao marcar como lida'}, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=["post"], url_path="mark_read", url_name="mark-read-lista")
+    def mark_read_lista(self, request):
+        """Marca como lidas as notificações informadas em ``ids`` (apenas as do usuário)."""
+        ids = request.data.get("ids")
+        if not isinstance(ids, list) or not ids:
+            return Response({"ids": ["Informe uma lista de ids."]}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            ids = [int(i) for i in ids]
+        except (TypeError, ValueError):
+            return Response({"ids": ["Os ids devem ser números inteiros."]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'marcadas': self._marcar_como_lidas(ids)}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["post"])
+    def mark_all_read(self, request):
+        """Marca como lidas todas as notificações do usuário."""
+        return Response({'marcadas': self._marcar_como_lidas()}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["post"], url_path="stream/ticket", url_name="stream-ticket")
+    def stream_ticket(self, request):
+        """Ticket de uso único para abrir o stream de notificações (``?ticket=``)."""
+        perfil = perfil_da_requisicao(request)
+        if perfil.organizador_id is not None:
+            destinatario = {"organizador_id": perfil.organizador_id}
+        elif perfil.participante_id is not None:
+            destinatario = {"participante_id": perfil.participante_id}
+        else:
+            raise PermissionDenied("Usuário sem perfil de participante ou organizador.")
+        return Response({"ticket": emitir_ticket(destinatario)}, status=status.HTTP_201_CREATED)
+
     @action(detail=False, methods=["get"])
     def unread_count(self, request):
-        user = request.user
+        perfil = perfil_da_requisicao(request)
         count = 0
         try:
-            if hasattr(user, 'organizador') and user.organizador is not None:
-                count = Notificacao.objects.filter(organizador=user.organizador, is_read=False).count()
-            elif hasattr(user, 'participante') and user.participante is not None:
-                count = Notificacao.objects.filter(participante=user.participante, is_read=False).count()
+            # Contador mantido no cache; o banco só é consultado se a chave faltar
+            if perfil.organizador_id is not None:
+                count = obter_nao_lidas(organizador_id=perfil.organizador_id)
+            elif perfil.participante_id is not None:
+                count = obter_nao_lidas(participante_id=perfil.participante_id)
         except Exception:
             count = 0
         return Response({'unread': count}, status=status.HTTP_200_OK)
@@ -309,6 +639,7 @@ class NotificacaoViewSet(viewsets.ModelViewSet):
 class OrganizadorViewSet(viewsets.ModelViewSet):
     queryset = Organizador.objects.all()
     serializer_class = OrganizadorSerializer
+    acoes_em_replica = ("list", "retrieve")
 
     # Exigir autenticação para criar e gerenciar organizadores
     def get_permissions(self):
@@ -324,7 +655,7 @@ class OrganizadorViewSet(viewsets.ModelViewSet):
         if not user or not user.is_authenticated:
             raise PermissionDenied("É necessário estar autenticado para criar um organizador.")
 
-        if hasattr(user, "organizador") and user.organizador is not None:
+        if perfil_da_requisicao(self.request).organizador_id is not None:
             raise ValidationError({"detail": "Usuário já possui perfil de organizador."})
 
         serializer.save(user=user)
@@ -343,18 +674,10 @@ class MeView(APIView):
 
     def get(self, request):
         user = request.user
-        role = 'participante'
-        participante_id = None
-        organizador_id = None
-        try:
-            if hasattr(user, 'organizador') and user.organizador is not None:
-                role = 'organizador'
-                organizador_id = user.organizador.id
-            elif hasattr(user, 'participante') and user.participante is not None:
-                role = 'participante'
-                participante_id = user.participante.id
-        except Exception:
-            pass
+        perfil = perfil_da_requisicao(request)
+        role = perfil.role or ROLE_PARTICIPANTE
+        participante_id = perfil.participante_id
+        organizador_id = perfil.organizador_id
 
         return Response({
             'user': {
@@ -366,3 +689,31 @@ class MeView(APIView):
                 'organizador_id': organizador_id,
             }
         }, status=status.HTTP_200_OK)
+
+
+class ConfirmacoesPagamentoView(APIView):
+    """Recebe do provedor um lote de confirmações de pagamento.
+
+    Corpo: ``{"confirmacoes": [{"token": "pay_123", "inscricao": 42}, ...]}``.
+    Idempotente pelo ``token``: reenvios voltam como ``repetida`` sem efeito.
+    """
+    authentication_classes = []
+    permission_classes = [IsProvedorPagamentos]
+
+    def post(self, request):
+        confirmacoes = request.data.get("confirmacoes")
+        if not isinstance(confirmacoes, list) or not confirmacoes:
+            return Response(
+                {"confirmacoes": ["Informe uma lista de confirmações."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(confirmacoes) > CONFIRMACOES_LOTE_MAXIMO:
+            return Response(
+                {"confirmacoes": [f"Máximo de {CONFIRMACOES_LOTE_MAXIMO} confirmações por lote."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        resultados = confirmar_pagamentos(confirmacoes)
+        resumo = {}
+        for resultado in resultados:
+            resumo[resultado["resultado"]] = resumo.get(resultado["resultado"], 0) + 1
+        return Response({"resumo": resumo, "resultados": resultados}, status=status.HTTP_200_OK)
@@ -0,0 +1,69 @@
+"""Cache compartilhado das respostas públicas (anônimas) de eventos.
+
+As chaves embutem uma versão global do catálogo; qualquer gravação em
+``Evento`` ou ``Inscricao`` troca a versão (ver core.signals; o soft delete
+em conjunto, em core.models) e as entradas antigas deixam de ser lidas,
+expirando sozinhas pelo timeout.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+CHAVE_VERSAO = "eventos:versao"
+
+
+def _timeout():
+    return getattr(settings, "EVENTOS_CACHE_TIMEOUT", 60 * 5)
+
+
+def versao_catalogo():
+    versao = cache.get(CHAVE_VERSAO)
+    if versao is None:
+        versao = time.time_ns()
+        cache.add(CHAVE_VERSAO, versao, None)
+        versao = cache.get(CHAVE_VERSAO, versao)
+    return versao
+
+
+def invalidar_catalogo():
+    """Troca a versão do catálogo agora e novamente após o commit.
+
+    A segunda troca descarta respostas montadas por leitores concorrentes
+    antes que a transação corrente ficasse visível.
+    """
+    cache.set(CHAVE_VERSAO, time.time_ns(), None)
+    transaction.on_commit(lambda: cache.set(CHAVE_VERSAO, time.time_ns(), None))
+
+
+def chave_resposta(acao, path, query_params):
+    """Chave da resposta para a ação/caminho/query string (parâmetros ordenados)."""
+    query = urlencode(sorted(query_params.lists()), doseq=True)
+    digest = hashlib.md5(f"{path}?{query}".encode()).hexdigest()
+    return f"eventos:{versao_catalogo()}:{acao}:{digest}"
+
+
+def obter_resposta(chave):
+    return cache.get(chave)
+
+
+def guardar_resposta(chave, response):
+    """Guarda o corpo já renderizado e os validadores (ETag/Last-Modified)."""
+    cache.set(
+        chave,
+        {
+            "content": response.content,
+            "content_type": response["Content-Type"],
+            "etag": response.get("ETag"),
+            "last_modified": response.get("Last-Modified"),
+        },
+        _timeout(),
+    )
+
+
+def etag_para(*partes):
+    """ETag forte a partir das partes que determinam o conteúdo da resposta."""
+    return '"%s"' % hashlib.md5("|".join(str(p) for p in partes).encode()).hexdigest()
@@ -0,0 +1,90 @@
+"""Contadores de notificações não lidas por destinatário, mantidos no cache.
+
+As alterações pontuais (criar, marcar como lida, excluir) ajustam o contador
+com ``incr``/``decr``; inserções em lote apenas invalidam as chaves afetadas.
+Chave ausente ou inconsistente é reconstruída com um ``COUNT`` no banco.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import Notificacao, Organizador, Participante
+
+
+def _timeout():
+    return getattr(settings, "UNREAD_CACHE_TIMEOUT", 60 * 60 * 24)
+
+
+def chave_nao_lidas(participante_id=None, organizador_id=None):
+    if organizador_id is not None:
+        return f"unread:organizador:{organizador_id}"
+    return f"unread:participante:{participante_id}"
+
+
+def _filtro(participante_id=None, organizador_id=None):
+    if organizador_id is not None:
+        return {"organizador_id": organizador_id}
+    return {"participante_id": participante_id}
+
+
+def reconstruir_nao_lidas(participante_id=None, organizador_id=None):
+    """Recalcula o contador a partir do banco e grava no cache."""
+    total = Notificacao.objects.filter(is_read=False, **_filtro(participante_id, organizador_id)).count()
+    cache.set(chave_nao_lidas(participante_id, organizador_id), total, _timeout())
+    return total
+
+
+def obter_nao_lidas(participante_id=None, organizador_id=None):
+    """Total de não lidas; só consulta o banco quando o contador não está no cache."""
+    total = cache.get(chave_nao_lidas(participante_id, organizador_id))
+    if total is None or total < 0:
+        return reconstruir_nao_lidas(participante_id, organizador_id)
+    return total
+
+
+def ajustar_nao_lidas(delta, participante_id=None, organizador_id=None):
+    """Soma ``delta`` ao contador. Se a chave não existir, ela será reconstruída na próxima leitura."""
+    if not delta:
+        return
+    chave = chave_nao_lidas(participante_id, organizador_id)
+    try:
+        total = cache.incr(chave, delta)
+    except ValueError:
+        return
+    if total < 0:
+        cache.delete(chave)
+
+
+def invalidar_nao_lidas(destinatarios):
+    """Descarta os contadores de vários destinatários ``(participante_id, organizador_id)``."""
+    chaves = {chave_nao_lidas(p, o) for p, o in destinatarios}
+    if chaves:
+        cache.delete_many(list(chaves))
+
+
+def reconstruir_todos(batch_size=1000):
+    """Reconstrói os contadores de todos os destinatários (reparo após divergências).
+
+    Usa um ``COUNT ... GROUP BY`` por tipo de destinatário e grava em lotes
+    com ``set_many``; quem não tem não lidas recebe zero.
+    """
+    total_chaves = 0
+    for campo, modelo in (("participante_id", Participante), ("organizador_id", Organizador)):
+        totais = dict(
+            Notificacao.objects.filter(is_read=False, **{f"{campo}__isnull": False})
+            .order_by()
+            .values_list(campo)
+            .annotate(total=Count("id"))
+        )
+        lote = {}
+        for destinatario_id in modelo.objects.values_list("id", flat=True).iterator(chunk_size=batch_size):
+            chave = chave_nao_lidas(**{campo: destinatario_id})
+            lote[chave] = totais.get(destinatario_id, 0)
+            if len(lote) >= batch_size:
+                cache.set_many(lote, _timeout())
+                total_chaves += len(lote)
+                lote = {}
+        if lote:
+            cache.set_many(lote, _timeout())
+            total_chaves += len(lote)
+    return total_chaves
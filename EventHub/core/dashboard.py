@@ -0,0 +1,48 @@
+"""Indicadores dos eventos de um organizador (painel de acompanhamento).
+
+Tudo é calculado no banco em uma única query agrupada por evento: contagem
+de inscrições por status, taxa de ocupação e receita prevista/confirmada.
+"""
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, FloatField, Q
+from django.db.models.functions import Cast, NullIf
+
+from .models import Evento
+
+CAMPOS = (
+    "id", "titulo", "data_inicio", "capacidade", "preco",
+    "pendentes", "confirmadas", "canceladas", "taxa_ocupacao",
+    "receita_prevista", "receita_confirmada",
+)
+
+_MOEDA = DecimalField(max_digits=14, decimal_places=2)
+
+
+def _por_status(status):
+    return Count("inscricoes", filter=Q(inscricoes__is_deleted=False, inscricoes__status=status))
+
+
+def metricas_eventos(organizador_id):
+    """Uma linha por evento do organizador, na ordem de ``data_inicio``.
+
+    ``taxa_ocupacao`` considera inscrições pendentes e confirmadas sobre a
+    capacidade; ``receita_prevista`` usa as mesmas inscrições e
+    ``receita_confirmada`` só as confirmadas.
+    """
+    ativas = F("pendentes") + F("confirmadas")
+    return (
+        Evento.objects.filter(organizer_id=organizador_id)
+        .annotate(
+            pendentes=_por_status("pendente"),
+            confirmadas=_por_status("confirmada"),
+            canceladas=_por_status("cancelada"),
+        )
+        .annotate(
+            taxa_ocupacao=ExpressionWrapper(
+                Cast(ativas, FloatField()) / NullIf(F("capacidade"), 0), output_field=FloatField()
+            ),
+            receita_prevista=ExpressionWrapper(F("preco") * ativas, output_field=_MOEDA),
+            receita_confirmada=ExpressionWrapper(F("preco") * F("confirmadas"), output_field=_MOEDA),
+        )
+        .order_by("data_inicio", "id")
+        .values(*CAMPOS)
+    )
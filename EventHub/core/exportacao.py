@@ -0,0 +1,88 @@
+"""Exportação das inscrições de um evento em CSV ou JSON Lines.
+
+As linhas saem de um ``values()`` lido com ``iterator(chunk_size=...)`` e são
+enviadas em blocos por um ``StreamingHttpResponse``: a memória usada não
+depende do número de inscrições e os primeiros bytes saem logo, sem esperar
+a exportação inteira.
+"""
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+
+from .models import Inscricao
+
+CAMPOS = ("participante__nome", "participante__email", "status", "data_inscricao")
+CABECALHO = ("nome", "email", "status", "data_inscricao")
+
+FORMATOS = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+
+# Linhas lidas do banco por vez e linhas enviadas por bloco da resposta
+CHUNK_SIZE = 2000
+LINHAS_POR_BLOCO = 500
+
+
+class _Eco:
+    """Pseudo-arquivo para o ``csv.writer``: devolve a linha em vez de gravá-la."""
+
+    def write(self, valor):
+        return valor
+
+
+def linhas_inscricoes(evento_id, chunk_size=CHUNK_SIZE):
+    """Tuplas (nome, email, status, data_inscricao) das inscrições do evento."""
+    data = serializers.DateTimeField()
+    queryset = (
+        Inscricao.objects.filter(evento_id=evento_id)
+        .order_by("pk")
+        .values_list(*CAMPOS)
+    )
+    for nome, email, status, data_inscricao in queryset.iterator(chunk_size=chunk_size):
+        # mesmo formato de data da API (REST_FRAMEWORK["DATETIME_FORMAT"])
+        yield nome, email, status, data.to_representation(data_inscricao)
+
+
+def _csv(linhas):
+    escritor = csv.writer(_Eco())
+    yield escritor.writerow(CABECALHO)
+    for linha in linhas:
+        yield escritor.writerow(linha)
+
+
+def _jsonl(linhas):
+    for linha in linhas:
+        yield json.dumps(dict(zip(CABECALHO, linha)), ensure_ascii=False) + "\n"
+
+
+def _em_blocos(textos, tamanho=LINHAS_POR_BLOCO):
+    """Agrupa as linhas para não escrever no socket uma vez por inscrição.
+
+    A primeira linha (o cabeçalho, no CSV) é enviada sozinha, logo de início.
+    """
+    textos = iter(textos)
+    for primeiro in textos:
+        yield primeiro.encode("utf-8")
+        break
+    bloco = []
+    for texto in textos:
+        bloco.append(texto)
+        if len(bloco) >= tamanho:
+            yield "".join(bloco).encode("utf-8")
+            bloco = []
+    if bloco:
+        yield "".join(bloco).encode("utf-8")
+
+
+def resposta_exportacao(evento, formato):
+    """``StreamingHttpResponse`` com as inscrições do evento no formato pedido."""
+    gerador = _csv if formato == "csv" else _jsonl
+    response = StreamingHttpResponse(
+        _em_blocos(gerador(linhas_inscricoes(evento.pk))),
+        content_type=FORMATOS[formato],
+    )
+    response["Content-Disposition"] = f'attachment; filename="evento-{evento.pk}-inscricoes.{formato}"'
+    return response
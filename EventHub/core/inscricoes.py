@@ -0,0 +1,157 @@
+"""Inscrição em lote de participantes em um evento (planilhas corporativas).
+
+Toda a validação é feita por conjuntos: uma query resolve os participantes
+(por id ou e-mail), outra as inscrições já existentes, e as novas linhas
+entram com ``bulk_create``. A capacidade é garantida com o evento bloqueado
+durante a transação, então o lote convive com inscrições individuais.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .cache_eventos import invalidar_catalogo
+from .models import Evento, Inscricao, Notificacao, Participante
+from .notificacoes import criar_notificacoes, mensagens_inscricao_criada
+from .series import registrar as registrar_series, variacao_inscricoes
+
+# Resultados possíveis de cada linha do lote
+INSCRITO = "inscrito"
+JA_INSCRITO = "ja_inscrito"
+CANCELADA = "cancelada"
+EXCLUIDA = "excluida"
+DUPLICADA = "duplicada"
+NAO_ENCONTRADO = "nao_encontrado"
+INVALIDO = "invalido"
+SEM_VAGA = "sem_vaga"
+
+
+def _referencia(valor):
+    """Normaliza um item da planilha em ("id", int) ou ("email", str); None se inválido."""
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, int):
+        return ("id", valor)
+    if isinstance(valor, str):
+        valor = valor.strip()
+        if valor.isdigit():
+            return ("id", int(valor))
+        if "@" in valor:
+            return ("email", valor.lower())
+    return None
+
+
+def inscrever_em_lote(evento, valores, batch_size=1000):
+    """Inscreve os participantes indicados por ``valores`` (ids ou e-mails) no evento.
+
+    Ignora duplicatas, quem já está inscrito, quem cancelou a inscrição e
+    quem teve a inscrição excluída (soft delete; reativável com ``restore()``);
+    inscreve na ordem recebida até esgotar as vagas. Retorna a lista de
+    resultados por linha (``linha``, ``valor``, ``resultado``, ``participante``,
+    ``inscricao``).
+    """
+    referencias = [_referencia(valor) for valor in valores]
+    ids = {ref[1] for ref in referencias if ref and ref[0] == "id"}
+    emails = {ref[1] for ref in referencias if ref and ref[0] == "email"}
+
+    participantes = []
+    if ids:
+        participantes += Participante.objects.filter(pk__in=ids).only("id", "nome", "email")
+    if emails:
+        # e-mails da planilha são comparados sem diferenciar maiúsculas
+        # (índice funcional ``participante_email_lower_idx``)
+        participantes += (
+            Participante.objects.annotate(email_normalizado=Lower("email"))
+            .filter(email_normalizado__in=emails)
+            .only("id", "nome", "email")
+        )
+    por_id = {p.pk: p for p in participantes}
+    por_email = {p.email.lower(): p for p in participantes}
+
+    resultados = []
+    candidatos = []
+    vistos = set()
+    for linha, (valor, ref) in enumerate(zip(valores, referencias), start=1):
+        resultado = {"linha": linha, "valor": valor, "resultado": None, "participante": None, "inscricao": None}
+        resultados.append(resultado)
+        if ref is None:
+            resultado["resultado"] = INVALIDO
+            continue
+        participante = por_id.get(ref[1]) if ref[0] == "id" else por_email.get(ref[1])
+        if participante is None:
+            resultado["resultado"] = NAO_ENCONTRADO
+            continue
+        resultado["participante"] = participante.pk
+        if participante.pk in vistos:
+            resultado["resultado"] = DUPLICADA
+            continue
+        vistos.add(participante.pk)
+        candidatos.append((resultado, participante))
+
+    status_inicial = "pendente" if evento.preco > Decimal("0.00") else "confirmada"
+    with transaction.atomic():
+        # bloqueia o evento antes de olhar as inscrições: inscrições individuais
+        # (que reservam a vaga com UPDATE no evento) esperam o fim do lote
+        ocupacao = (
+            Evento.all_objects.select_for_update()
+            .values("capacidade", "vagas_ocupadas")
+            .get(pk=evento.pk)
+        )
+        existentes = {
+            participante_id: (status, excluida)
+            for participante_id, status, excluida in Inscricao.all_objects.filter(
+                evento_id=evento.pk, participante_id__in=vistos
+            ).values_list("participante_id", "status", "is_deleted")
+        }
+        novos = []
+        for resultado, participante in candidatos:
+            status_existente, excluida = existentes.get(participante.pk, (None, False))
+            if excluida:
+                resultado["resultado"] = EXCLUIDA
+            elif status_existente == "cancelada":
+                resultado["resultado"] = CANCELADA
+            elif status_existente is not None:
+                resultado["resultado"] = JA_INSCRITO
+            else:
+                novos.append((resultado, participante))
+
+        livres = max(ocupacao["capacidade"] - ocupacao["vagas_ocupadas"], 0)
+        for resultado, _ in novos[livres:]:
+            resultado["resultado"] = SEM_VAGA
+        novos = novos[:livres]
+        if not novos:
+            return resultados
+
+        inscricoes = Inscricao.objects.bulk_create(
+            [Inscricao(participante=p, evento=evento, status=status_inicial) for _, p in novos],
+            batch_size=batch_size,
+        )
+        Evento.all_objects.filter(pk=evento.pk).update(
+            vagas_ocupadas=F("vagas_ocupadas") + len(inscricoes), updated_at=timezone.now()
+        )
+        registrar_series(variacao_inscricoes(inscricoes))
+        for (resultado, _), inscricao in zip(novos, inscricoes):
+            resultado["resultado"] = INSCRITO
+            resultado["inscricao"] = inscricao.pk
+
+        notificacoes = [
+            Notificacao(
+                participante_id=inscricao.participante_id,
+                evento_id=evento.pk,
+                mensagem=mensagens_inscricao_criada(inscricao, status_inicial)[0],
+            )
+            for inscricao in inscricoes
+        ]
+        if evento.organizer_id is not None:
+            # um resumo para o organizador em vez de uma notificação por inscrição
+            notificacoes.append(Notificacao(
+                organizador_id=evento.organizer_id,
+                evento_id=evento.pk,
+                mensagem=f"📋 {len(inscricoes)} inscrições ({status_inicial}) adicionadas em lote ao evento '{evento.titulo}'.",
+            ))
+        criar_notificacoes(notificacoes, batch_size=batch_size)
+        # bulk_create não dispara os signals (séries acima, catálogo em cache aqui)
+        invalidar_catalogo()
+    return resultados
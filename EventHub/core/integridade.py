@@ -0,0 +1,49 @@
+"""Qual restrição de unicidade um ``IntegrityError`` violou, em qualquer banco.
+
+Cada banco informa a violação de um jeito: o PostgreSQL traz o nome da
+restrição no diagnóstico do driver, o MySQL o nome da chave na mensagem e o
+SQLite só ``tabela.coluna`` na mensagem. ``restricao_violada`` compara o
+erro com as restrições conhecidas pelos dois identificadores, então o código
+que grava não depende de ``exists()`` prévios nem do texto de um banco.
+"""
+import re
+from collections import namedtuple
+
+_SQLITE = re.compile(r"UNIQUE constraint failed: (?P<colunas>[\w.]+(?:, [\w.]+)*)")
+_MYSQL = re.compile(r"Duplicate entry .* for key '(?P<chave>[\w.]+)'")
+
+
+class Restricao(namedtuple("Restricao", ["nome", "modelo", "campos"])):
+    """Restrição de unicidade: ``nome`` no banco e os campos do modelo que ela cobre."""
+
+    @property
+    def identificadores(self):
+        tabela = self.modelo._meta.db_table
+        colunas = ", ".join(f"{tabela}.{self.modelo._meta.get_field(campo).column}" for campo in self.campos)
+        return {self.nome, colunas}
+
+
+def _identificadores_do_erro(erro):
+    diagnostico = getattr(erro.__cause__, "diag", None)  # psycopg 2 e 3
+    nome = getattr(diagnostico, "constraint_name", None)
+    if nome:
+        return {nome}
+    texto = str(erro)
+    encontrado = _SQLITE.search(texto)
+    if encontrado:
+        return {encontrado["colunas"]}
+    encontrado = _MYSQL.search(texto)
+    if encontrado:
+        # MySQL 8 prefixa a chave com a tabela; chaves de ``unique=True`` têm o nome da coluna
+        chave = encontrado["chave"]
+        return {chave, chave.rpartition(".")[2]}
+    return set()
+
+
+def restricao_violada(erro, restricoes):
+    """A restrição de ``restricoes`` violada por ``erro``; None se for outra (ou não identificada)."""
+    identificadores = _identificadores_do_erro(erro)
+    for restricao in restricoes:
+        if identificadores & restricao.identificadores:
+            return restricao
+    return None
@@ -0,0 +1,64 @@
+import gzip
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.retencao import Relatorio, arquivar_notificacoes, prazo_excluidos, prazo_notificacoes, purgar_excluidos
+
+
+def _formatar_bytes(valor):
+    if valor is None:
+        return "n/d"
+    for unidade in ("B", "KB", "MB", "GB"):
+        if valor < 1024 or unidade == "GB":
+            return f"{valor:.0f} {unidade}" if unidade == "B" else f"{valor:.1f} {unidade}"
+        valor /= 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Aplica a política de retenção: arquiva notificações lidas antigas e remove de vez os "
+        "registros excluídos (soft delete) há mais que o prazo, em blocos pequenos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dias-notificacoes", type=int,
+            help="Idade mínima das notificações lidas a arquivar (padrão: RETENCAO_NOTIFICACOES_DIAS).",
+        )
+        parser.add_argument(
+            "--dias-excluidos", type=int,
+            help="Carência após o soft delete antes da remoção (padrão: RETENCAO_EXCLUIDOS_DIAS).",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Linhas por transação.")
+        parser.add_argument("--pausa", type=float, default=0.0, help="Segundos de espera entre blocos.")
+        parser.add_argument(
+            "--arquivo",
+            help="Grava as notificações arquivadas neste .jsonl.gz em vez da tabela de arquivo (acrescenta).",
+        )
+
+    def handle(self, *args, **options):
+        for opcao in ("dias_notificacoes", "dias_excluidos"):
+            if options[opcao] is not None and options[opcao] < 0:
+                raise CommandError(f"--{opcao.replace('_', '-')} não pode ser negativo.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size deve ser ao menos 1.")
+
+        def prazo(opcao, padrao):
+            return timedelta(days=options[opcao]) if options[opcao] is not None else padrao()
+
+        relatorio = Relatorio()
+        comum = {"batch_size": options["batch_size"], "pausa": options["pausa"], "relatorio": relatorio}
+        if options["arquivo"]:
+            with gzip.open(options["arquivo"], "at", encoding="utf-8") as destino:
+                arquivar_notificacoes(prazo("dias_notificacoes", prazo_notificacoes), destino=destino, **comum)
+        else:
+            arquivar_notificacoes(prazo("dias_notificacoes", prazo_notificacoes), **comum)
+        purgar_excluidos(prazo("dias_excluidos", prazo_excluidos), **comum)
+
+        for tabela, dados in relatorio.tabelas.items():
+            if dados["linhas"]:
+                self.stdout.write(f"{tabela}: {dados['linhas']} linhas (~{_formatar_bytes(dados['bytes'])})")
+        self.stdout.write(self.style.SUCCESS(
+            f"{relatorio.linhas} linhas arquivadas ou removidas (~{_formatar_bytes(relatorio.bytes)} a recuperar no VACUUM)."
+        ))
@@ -0,0 +1,273 @@
+import http.client
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# Operações exercitadas e peso padrão de cada uma no sorteio
+PESOS_PADRAO = {
+    "eventos_lista": 30,
+    "evento_detalhe": 25,
+    "inscrever": 10,
+    "cancelar": 5,
+    "notificacoes": 15,
+    "nao_lidas": 15,
+}
+# Fora da mistura padrão: cada chamada grava um usuário novo (ex.: --pesos cadastro=1)
+OPERACOES_OPCIONAIS = ("cadastro",)
+
+# Total de queries informado pelo QueryMetricsMiddleware no Server-Timing
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def percentil(valores_ordenados, p):
+    """Percentil pelo método nearest-rank (valores já ordenados)."""
+    if not valores_ordenados:
+        return None
+    indice = max(math.ceil(p / 100 * len(valores_ordenados)) - 1, 0)
+    return valores_ordenados[indice]
+
+
+def resumir(amostras, duracao):
+    """Estatísticas de uma lista de amostras ``(latencia_s, resultado[, queries])``.
+
+    ``resultado`` é "ok" (2xx/304), "rejeitada" (4xx, ex.: evento lotado) ou "erro".
+    ``queries`` vem do Server-Timing quando o servidor roda com ``QUERY_METRICS``.
+    """
+    latencias = sorted(amostra[0] * 1000 for amostra in amostras)
+    contagem = {"ok": 0, "rejeitada": 0, "erro": 0}
+    for amostra in amostras:
+        contagem[amostra[1]] += 1
+    queries = [amostra[2] for amostra in amostras if len(amostra) > 2 and amostra[2] is not None]
+
+    def ms(valor):
+        return round(valor, 2) if valor is not None else None
+
+    return {
+        "requisicoes": len(amostras),
+        "ok": contagem["ok"],
+        "rejeitadas": contagem["rejeitada"],
+        "erros": contagem["erro"],
+        "rps": round(len(amostras) / duracao, 2) if duracao else None,
+        "p50_ms": ms(percentil(latencias, 50)),
+        "p95_ms": ms(percentil(latencias, 95)),
+        "p99_ms": ms(percentil(latencias, 99)),
+        "media_ms": ms(sum(latencias) / len(latencias)) if latencias else None,
+        "max_ms": ms(latencias[-1]) if latencias else None,
+        "queries_media": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+class ClienteHttp:
+    """Conexão HTTP/1.1 persistente de um cliente simulado."""
+
+    def __init__(self, base_url, timeout):
+        partes = urlsplit(base_url)
+        classe = http.client.HTTPSConnection if partes.scheme == "https" else http.client.HTTPConnection
+        self._nova_conexao = lambda: classe(partes.hostname, partes.port, timeout=timeout)
+        self.prefixo = partes.path.rstrip("/")
+        self.conexao = self._nova_conexao()
+        self.token = None
+        self.ultimas_queries = None
+
+    def requisicao(self, metodo, caminho, corpo=None):
+        headers = {"Accept": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        dados = None
+        if corpo is not None:
+            dados = json.dumps(corpo)
+            headers["Content-Type"] = "application/json"
+        inicio = time.perf_counter()
+        self.ultimas_queries = None
+        try:
+            self.conexao.request(metodo, self.prefixo + caminho, body=dados, headers=headers)
+            resposta = self.conexao.getresponse()
+            conteudo = resposta.read()
+        except (OSError, http.client.HTTPException):
+            self.conexao.close()
+            self.conexao = self._nova_conexao()
+            return None, None, time.perf_counter() - inicio
+        duracao = time.perf_counter() - inicio
+        encontrado = _QUERIES.search(resposta.getheader("Server-Timing") or "")
+        if encontrado:
+            self.ultimas_queries = int(encontrado[1])
+        try:
+            payload = json.loads(conteudo) if conteudo else None
+        except ValueError:
+            payload = None
+        return resposta.status, payload, duracao
+
+    def fechar(self):
+        self.conexao.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede latência (p50/p95/p99) e vazão dos principais endpoints com clientes concorrentes "
+        "contra um servidor já rodando. Use após `popular_base` (mesmo --prefixo/--senha)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Endereço do servidor.")
+        parser.add_argument("--clientes", type=int, default=10, help="Clientes simultâneos.")
+        parser.add_argument("--duracao", type=float, default=30.0, help="Duração da medição (s).")
+        parser.add_argument(
+            "--requisicoes",
+            type=int,
+            default=None,
+            help="Requisições por cliente; quando informado, substitui --duracao.",
+        )
+        parser.add_argument(
+            "--pesos",
+            default=",".join(f"{op}={peso}" for op, peso in PESOS_PADRAO.items()),
+            help="Mistura de operações, ex.: eventos_lista=50,nao_lidas=50.",
+        )
+        parser.add_argument("--paginas", type=int, default=5, help="Páginas de eventos usadas no sorteio.")
+        parser.add_argument("--prefixo", default="bench", help="Prefixo dos usuários criados por popular_base.")
+        parser.add_argument("--senha", default="bench-senha-123")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Timeout de cada requisição (s).")
+        parser.add_argument("--rotulo", default="", help="Identificação da rodada (ex.: versão/commit).")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--saida", help="Arquivo onde gravar o JSON (padrão: stdout).")
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.pesos = self._ler_pesos(options["pesos"])
+        if options["clientes"] < 1:
+            raise CommandError("--clientes deve ser ao menos 1.")
+
+        clientes = [self._autenticar(i) for i in range(options["clientes"])]
+        self.evento_ids = self._carregar_eventos(clientes[0])
+        if not self.evento_ids:
+            raise CommandError("Nenhum evento encontrado; rode `manage.py popular_base` antes.")
+
+        self.amostras = {op: [] for op in self.pesos}
+        self.lock = threading.Lock()
+        self.fim = None if options["requisicoes"] else time.perf_counter() + options["duracao"]
+        inicio_iso = timezone.now().isoformat()
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(clientes)) as executor:
+            list(executor.map(self._rodar_cliente, range(len(clientes)), clientes))
+        duracao = time.perf_counter() - inicio
+        for cliente in clientes:
+            cliente.fechar()
+
+        todas = [amostra for amostras in self.amostras.values() for amostra in amostras]
+        relatorio = {
+            "rotulo": options["rotulo"],
+            "inicio": inicio_iso,
+            "url": options["url"],
+            "clientes": len(clientes),
+            "duracao_s": round(duracao, 3),
+            "pesos": self.pesos,
+            "total": resumir(todas, duracao),
+            "endpoints": {op: resumir(amostras, duracao) for op, amostras in self.amostras.items()},
+        }
+        saida = json.dumps(relatorio, indent=2, ensure_ascii=False)
+        if options["saida"]:
+            with open(options["saida"], "w", encoding="utf-8") as arquivo:
+                arquivo.write(saida + "\n")
+            self.stderr.write(f"Relatório gravado em {options['saida']}")
+        else:
+            self.stdout.write(saida)
+
+    @staticmethod
+    def _ler_pesos(texto):
+        pesos = {}
+        for item in filter(None, (parte.strip() for parte in texto.split(","))):
+            op, _, peso = item.partition("=")
+            if op not in PESOS_PADRAO and op not in OPERACOES_OPCIONAIS:
+                raise CommandError(f"Operação desconhecida em --pesos: {op}")
+            try:
+                pesos[op] = float(peso)
+            except ValueError:
+                raise CommandError(f"Peso inválido para {op}: {peso!r}")
+        if not pesos or sum(pesos.values()) <= 0:
+            raise CommandError("--pesos precisa de ao menos uma operação com peso positivo.")
+        return pesos
+
+    def _autenticar(self, indice):
+        """Cada cliente usa um participante diferente criado por popular_base."""
+        cliente = ClienteHttp(self.options["url"], self.options["timeout"])
+        username = f"{self.options['prefixo']}_part_{indice}"
+        status, dados, _ = cliente.requisicao(
+            "POST", "/api/token/", {"username": username, "password": self.options["senha"]}
+        )
+        if status != 200:
+            raise CommandError(f"Falha ao autenticar {username} (HTTP {status}).")
+        cliente.token = dados["access"]
+        return cliente
+
+    def _carregar_eventos(self, cliente):
+        ids = []
+        for pagina in range(1, self.options["paginas"] + 1):
+            status, dados, _ = cliente.requisicao("GET", f"/api/v1/eventos/?page={pagina}")
+            if status != 200:
+                break
+            ids.extend(evento["id"] for evento in dados.get("results", []))
+            if not dados.get("next"):
+                break
+        return ids
+
+    def _rodar_cliente(self, indice, cliente):
+        rng = random.Random(self.options["seed"] + indice)
+        operacoes, pesos = zip(*self.pesos.items())
+        inscricoes = []
+        feitas = 0
+        while True:
+            if self.fim is not None and time.perf_counter() >= self.fim:
+                break
+            if self.fim is None and feitas >= self.options["requisicoes"]:
+                break
+            op = rng.choices(operacoes, pesos)[0]
+            if op == "cancelar" and not inscricoes:
+                op = "inscrever" if "inscrever" in self.pesos else op
+                if op == "cancelar":
+                    continue
+            status, dados, duracao = self._executar(cliente, op, rng, inscricoes)
+            feitas += 1
+            if status is None or status >= 500:
+                resultado = "erro"
+            elif status >= 400:
+                resultado = "rejeitada"
+            else:
+                resultado = "ok"
+            with self.lock:
+                self.amostras[op].append((duracao, resultado, cliente.ultimas_queries))
+
+    def _executar(self, cliente, op, rng, inscricoes):
+        if op == "eventos_lista":
+            return cliente.requisicao("GET", f"/api/v1/eventos/?page={rng.randint(1, self.options['paginas'])}")
+        if op == "evento_detalhe":
+            return cliente.requisicao("GET", f"/api/v1/eventos/{rng.choice(self.evento_ids)}/")
+        if op == "inscrever":
+            status, dados, duracao = cliente.requisicao(
+                "POST", "/api/v1/inscricoes/", {"evento": rng.choice(self.evento_ids)}
+            )
+            if status == 201:
+                inscricoes.append(dados["inscricao"]["id"])
+            return status, dados, duracao
+        if op == "cancelar":
+            inscricao_id = inscricoes.pop(rng.randrange(len(inscricoes)))
+            return cliente.requisicao("POST", f"/api/v1/inscricoes/{inscricao_id}/cancel/")
+        if op == "cadastro":
+            username = f"{self.options['prefixo']}_cad_{uuid.uuid4().hex[:12]}"
+            return cliente.requisicao("POST", "/api/v1/auth/register/", {
+                "username": username,
+                "password": self.options["senha"],
+                "email": f"{username}@example.com",
+                "role": "participante",
+                "nome": username,
+            })
+        if op == "notificacoes":
+            return cliente.requisicao("GET", "/api/v1/notificacoes/")
+        return cliente.requisicao("GET", "/api/v1/notificacoes/unread_count/")
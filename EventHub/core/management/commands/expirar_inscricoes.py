@@ -0,0 +1,43 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.pagamentos import expirar_pendentes, prazo_pagamento
+
+
+class Command(BaseCommand):
+    help = (
+        "Cancela as inscrições pendentes cujo pagamento não foi confirmado no prazo "
+        "(INSCRICAO_PENDENTE_TTL_MINUTOS) e libera as vagas. Pode rodar em vários workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ttl-minutos", type=int, help="Prazo em minutos (padrão: configuração do projeto).")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Inscrições por transação.")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Continua rodando, verificando periodicamente (modo worker).",
+        )
+        parser.add_argument(
+            "--intervalo",
+            type=float,
+            default=60.0,
+            help="Segundos de espera quando não há inscrições a expirar (apenas com --loop).",
+        )
+
+    def handle(self, *args, **options):
+        if options["ttl_minutos"] is not None and options["ttl_minutos"] < 0:
+            raise CommandError("--ttl-minutos não pode ser negativo.")
+        prazo = timedelta(minutes=options["ttl_minutos"]) if options["ttl_minutos"] is not None else prazo_pagamento()
+        total = 0
+        while True:
+            expiradas = expirar_pendentes(prazo, chunk_size=options["chunk_size"])
+            total += expiradas
+            if expiradas:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["intervalo"])
+        self.stdout.write(self.style.SUCCESS(f"{total} inscrições pendentes expiradas."))
@@ -0,0 +1,67 @@
+import json
+import sys
+from collections import Counter
+from itertools import chain
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.pagamentos import confirmar_pagamentos
+
+
+class Command(BaseCommand):
+    help = (
+        "Aplica confirmações de pagamento de um arquivo JSON Lines "
+        '(uma por linha: {"token": "...", "inscricao": 42}) ou de um array JSON. '
+        "Reexecutar o mesmo arquivo não tem efeito: os tokens já processados são ignorados."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("arquivo", help="Caminho do arquivo ou '-' para a entrada padrão.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Confirmações por transação.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size deve ser ao menos 1.")
+        resumo = Counter()
+        lote = []
+        for confirmacao in self._ler(options["arquivo"]):
+            lote.append(confirmacao)
+            if len(lote) >= options["batch_size"]:
+                resumo.update(r["resultado"] for r in confirmar_pagamentos(lote))
+                lote = []
+        if lote:
+            resumo.update(r["resultado"] for r in confirmar_pagamentos(lote))
+
+        detalhes = ", ".join(f"{resultado}: {total}" for resultado, total in sorted(resumo.items()))
+        self.stdout.write(self.style.SUCCESS(
+            f"{sum(resumo.values())} confirmações processadas ({detalhes or 'nenhuma'})."
+        ))
+
+    def _ler(self, caminho):
+        """Itera as confirmações sem carregar arquivos JSON Lines inteiros na memória."""
+        if caminho == "-":
+            yield from self._decodificar(sys.stdin)
+            return
+        try:
+            arquivo = open(caminho, encoding="utf-8")
+        except OSError as erro:
+            raise CommandError(f"Não foi possível abrir {caminho}: {erro}")
+        with arquivo:
+            yield from self._decodificar(arquivo)
+
+    @staticmethod
+    def _decodificar(arquivo):
+        primeira = arquivo.readline()
+        if primeira.lstrip().startswith("["):
+            try:
+                yield from json.loads(primeira + arquivo.read())
+            except ValueError as erro:
+                raise CommandError(f"JSON inválido: {erro}")
+            return
+        for numero, linha in enumerate(chain([primeira], arquivo), start=1):
+            if not linha.strip():
+                continue
+            try:
+                yield json.loads(linha)
+            except ValueError:
+                raise CommandError(f"Linha {numero}: JSON inválido.")
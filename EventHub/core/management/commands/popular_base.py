@@ -0,0 +1,201 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.cache_eventos import invalidar_catalogo
+from core.models import Evento, Inscricao, Notificacao, Organizador, Participante
+from core.series import reconstruir as reconstruir_series
+
+TIPOS = ("presencial", "virtual", "hibrido")
+LOCAIS = ("Recife", "São Paulo", "Rio de Janeiro", "Belo Horizonte", "Porto Alegre", "Online")
+
+
+class Command(BaseCommand):
+    help = (
+        "Popula a base com dados sintéticos para testes de carga (bulk_create em blocos). "
+        "Usuários: <prefixo>_org_<n> e <prefixo>_part_<n>, todos com a mesma senha."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--organizadores", type=int, default=50)
+        parser.add_argument("--eventos", type=int, default=1000)
+        parser.add_argument("--participantes", type=int, default=10000)
+        parser.add_argument("--inscricoes-por-participante", type=int, default=5)
+        parser.add_argument("--notificacoes-por-participante", type=int, default=10)
+        parser.add_argument(
+            "--eventos-quentes",
+            type=int,
+            default=5,
+            help="Quantos eventos concentram parte das inscrições (assimetria).",
+        )
+        parser.add_argument(
+            "--fracao-quente",
+            type=float,
+            default=0.3,
+            help="Fração das inscrições direcionada aos eventos quentes (0 a 1).",
+        )
+        parser.add_argument("--fracao-pagos", type=float, default=0.4, help="Fração de eventos pagos.")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Linhas por bulk_create/transação.")
+        parser.add_argument("--prefixo", default="bench", help="Prefixo dos usernames (permite várias cargas).")
+        parser.add_argument("--senha", default="bench-senha-123", help="Senha de todos os usuários criados.")
+        parser.add_argument("--seed", type=int, default=42, help="Semente do gerador (carga reproduzível).")
+
+    def handle(self, *args, **options):
+        if options["eventos"] < 1 or options["organizadores"] < 1:
+            raise CommandError("Informe ao menos um organizador e um evento.")
+        if not 0 <= options["fracao_quente"] <= 1:
+            raise CommandError("--fracao-quente deve estar entre 0 e 1.")
+        prefixo = options["prefixo"]
+        if User.objects.filter(username__startswith=f"{prefixo}_").exists():
+            raise CommandError(f"Já existem usuários com o prefixo '{prefixo}_'; use outro --prefixo.")
+
+        self.rng = random.Random(options["seed"])
+        self.chunk_size = options["chunk_size"]
+        # o hash é caro: calculado uma vez e reutilizado em todos os usuários
+        self.senha = make_password(options["senha"])
+        inicio = time.perf_counter()
+
+        organizadores = self._criar_perfis(Organizador, f"{prefixo}_org", options["organizadores"])
+        eventos = self._criar_eventos(organizadores, options["eventos"], options["fracao_pagos"])
+        participantes = self._criar_perfis(Participante, f"{prefixo}_part", options["participantes"])
+        total_inscricoes = self._criar_inscricoes(participantes, eventos, options)
+        total_notificacoes = self._criar_notificacoes(participantes, eventos, options["notificacoes_por_participante"])
+        self._ajustar_vagas([e.pk for e in eventos])
+        reconstruir_series([e.pk for e in eventos], batch_size=self.chunk_size)
+        invalidar_catalogo()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(organizadores)} organizadores, {len(eventos)} eventos, {len(participantes)} participantes, "
+            f"{total_inscricoes} inscrições e {total_notificacoes} notificações criados "
+            f"em {time.perf_counter() - inicio:.1f}s."
+        ))
+
+    def _em_blocos(self, objetos, guardar=True):
+        """Insere ``objetos`` (iterável) com bulk_create, uma transação por bloco.
+
+        Retorna os objetos criados, ou só a quantidade com ``guardar=False``
+        (as tabelas grandes não ficam inteiras em memória).
+        """
+        bloco = []
+        criados = []
+        total = 0
+        for objeto in objetos:
+            bloco.append(objeto)
+            if len(bloco) >= self.chunk_size:
+                inseridos = self._inserir(bloco)
+                total += len(inseridos)
+                if guardar:
+                    criados.extend(inseridos)
+                bloco = []
+        if bloco:
+            inseridos = self._inserir(bloco)
+            total += len(inseridos)
+            if guardar:
+                criados.extend(inseridos)
+        return criados if guardar else total
+
+    @staticmethod
+    def _inserir(bloco):
+        with transaction.atomic():
+            return type(bloco[0]).objects.bulk_create(bloco)
+
+    def _criar_perfis(self, modelo, prefixo, quantidade):
+        users = self._em_blocos(
+            User(username=f"{prefixo}_{i}", email=f"{prefixo}_{i}@example.com", password=self.senha)
+            for i in range(quantidade)
+        )
+        extra = {"empresa": "EventHub Bench"} if modelo is Organizador else {}
+        return self._em_blocos(
+            modelo(user_id=user.pk, nome=user.username, email=user.email, **extra) for user in users
+        )
+
+    def _criar_eventos(self, organizadores, quantidade, fracao_pagos):
+        agora = timezone.now()
+
+        def gerar():
+            for i in range(quantidade):
+                inicio = agora + timedelta(hours=self.rng.randint(-24 * 30, 24 * 180))
+                pago = self.rng.random() < fracao_pagos
+                yield Evento(
+                    titulo=f"Evento de carga {i}",
+                    descricao=f"Evento sintético {i} gerado para testes de carga. " * 5,
+                    data_inicio=inicio,
+                    data_fim=inicio + timedelta(hours=self.rng.choice((2, 4, 8, 24))),
+                    local=self.rng.choice(LOCAIS),
+                    tipo=self.rng.choice(TIPOS),
+                    preco=Decimal(self.rng.choice((20, 50, 100, 250))) if pago else Decimal("0.00"),
+                    capacidade=self.rng.choice((50, 100, 200, 500)),
+                    organizer_id=self.rng.choice(organizadores).pk,
+                )
+
+        return self._em_blocos(gerar())
+
+    def _criar_inscricoes(self, participantes, eventos, options):
+        """Cada participante se inscreve em eventos distintos; parte vai para os eventos quentes."""
+        quentes = eventos[: max(0, min(options["eventos_quentes"], len(eventos)))]
+        por_participante = min(options["inscricoes_por_participante"], len(eventos))
+        fracao_quente = options["fracao_quente"]
+
+        def gerar():
+            for participante in participantes:
+                escolhidos = set()
+                while len(escolhidos) < por_participante:
+                    if quentes and self.rng.random() < fracao_quente and len(escolhidos) < len(quentes):
+                        evento = self.rng.choice(quentes)
+                    else:
+                        evento = self.rng.choice(eventos)
+                    escolhidos.add(evento)
+                for evento in escolhidos:
+                    sorteio = self.rng.random()
+                    if sorteio < 0.05:
+                        status = "cancelada"
+                    elif evento.preco > 0 and sorteio < 0.35:
+                        status = "pendente"
+                    else:
+                        status = "confirmada"
+                    yield Inscricao(participante_id=participante.pk, evento_id=evento.pk, status=status)
+
+        return self._em_blocos(gerar(), guardar=False)
+
+    def _criar_notificacoes(self, participantes, eventos, por_participante):
+        def gerar():
+            for participante in participantes:
+                for _ in range(por_participante):
+                    evento = self.rng.choice(eventos)
+                    yield Notificacao(
+                        participante_id=participante.pk,
+                        evento_id=evento.pk,
+                        mensagem=f"Atualização sobre o evento '{evento.titulo}'.",
+                        is_read=self.rng.random() < 0.6,
+                    )
+
+        return self._em_blocos(gerar(), guardar=False)
+
+    def _ajustar_vagas(self, evento_ids):
+        """Recalcula ``vagas_ocupadas`` com um UPDATE e garante capacidade para os eventos quentes."""
+        for i in range(0, len(evento_ids), self.chunk_size):
+            bloco = evento_ids[i:i + self.chunk_size]
+            ativas = (
+                Inscricao.objects.filter(evento=OuterRef("pk"))
+                .exclude(status="cancelada")
+                .order_by()
+                .values("evento")
+                .annotate(total=Count("id"))
+                .values("total")
+            )
+            with transaction.atomic():
+                Evento.all_objects.filter(pk__in=bloco).update(
+                    vagas_ocupadas=Coalesce(Subquery(ativas), 0)
+                )
+                Evento.all_objects.filter(pk__in=bloco, capacidade__lt=F("vagas_ocupadas")).update(
+                    capacidade=F("vagas_ocupadas") + 10
+                )
@@ -0,0 +1,48 @@
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from core.notificacoes import processar_outbox
+from core.pubsub import exigir_broker_entre_processos
+
+
+class Command(BaseCommand):
+    help = "Processa o outbox de notificações, criando as Notificacao pendentes em lote."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Entradas por transação.")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Continua rodando, aguardando novas entradas (modo worker).",
+        )
+        parser.add_argument(
+            "--intervalo",
+            type=float,
+            default=1.0,
+            help="Segundos de espera quando a fila está vazia (apenas com --loop).",
+        )
+        parser.add_argument(
+            "--sem-push",
+            action="store_true",
+            help="Roda mesmo com um broker restrito ao processo (sem push aos clientes conectados).",
+        )
+
+    def handle(self, *args, **options):
+        if not options["sem_push"]:
+            # o worker publica as notificações para clientes conectados ao servidor ASGI
+            try:
+                exigir_broker_entre_processos()
+            except ImproperlyConfigured as exc:
+                raise CommandError(f"{exc} (ou use --sem-push)") from exc
+        total = 0
+        while True:
+            processadas = processar_outbox(batch_size=options["batch_size"])
+            total += processadas
+            if processadas:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["intervalo"])
+        self.stdout.write(self.style.SUCCESS(f"{total} entradas do outbox processadas."))
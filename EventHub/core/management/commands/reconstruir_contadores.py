@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.contadores import reconstruir_todos
+
+
+class Command(BaseCommand):
+    help = "Reconstrói no cache os contadores de notificações não lidas a partir do banco."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Chaves gravadas por set_many.")
+
+    def handle(self, *args, **options):
+        total = reconstruir_todos(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{total} contadores reconstruídos."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from core.series import reconstruir
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula as séries de inscrições por dia/hora a partir das inscrições "
+        "(carga inicial após a migração, backfill ou correção)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--evento", type=int, action="append", dest="eventos", help="Id do evento (repetível); padrão: todos.")
+        parser.add_argument("--eventos-por-bloco", type=int, default=500, help="Eventos refeitos por transação.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Linhas por bulk_create.")
+
+    def handle(self, *args, **options):
+        total = reconstruir(
+            options["eventos"],
+            eventos_por_bloco=options["eventos_por_bloco"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"{total} períodos gravados."))
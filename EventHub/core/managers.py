@@ -1,5 +1,68 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count
+from django.utils import timezone
 
-class ActiveManager(models.Manager):
+
+class SoftDeleteQuerySet(models.QuerySet):
+    """QuerySet com soft delete e restauração por conjunto.
+
+    ``soft_delete()`` e ``restore()`` marcam todas as linhas com um único
+    ``UPDATE`` em vez de um ``save()`` por objeto (e sem signals). Os modelos
+    com efeitos colaterais (vagas, séries, contadores, cascata) declaram em
+    ``campos_efeitos`` as colunas de que os efeitos dependem: antes do
+    ``UPDATE`` as linhas afetadas são bloqueadas e agrupadas por essas colunas
+    (com a contagem em ``total``), e ``_ao_excluir``/``_ao_restaurar`` recebem
+    só esses grupos, na mesma transação. Sem signals, o cache do catálogo
+    também fica com esses hooks (só eventos e inscrições entram nele).
+    ``delete()`` continua removendo de fato (usado pela retenção).
+    """
+
+    campos_efeitos = None
+
+    def soft_delete(self, momento=None):
+        """Marca as linhas ativas como excluídas; retorna quantas foram afetadas."""
+        return self._alternar(self.filter(is_deleted=False), excluir=True, momento=momento or timezone.now())
+
+    def restore(self):
+        """Reativa as linhas excluídas (use a partir de ``all_objects``); retorna quantas foram afetadas."""
+        return self._alternar(self.filter(is_deleted=True), excluir=False, momento=timezone.now())
+
+    def _alternar(self, alvo, excluir, momento):
+        valores = {"is_deleted": excluir, "deleted_at": momento if excluir else None, "updated_at": momento}
+        with transaction.atomic(using=self.db):
+            if self.campos_efeitos is None:
+                return alvo.update(**valores)
+            grupos = self._efeitos(alvo)
+            if not grupos:
+                return 0
+            total = alvo.update(**valores)
+            if excluir:
+                self._ao_excluir(grupos, momento)
+            else:
+                self._ao_restaurar(grupos)
+        return total
+
+    def _efeitos(self, alvo):
+        """Bloqueia as linhas de ``alvo`` e as conta por ``campos_efeitos``.
+
+        Só os grupos saem do banco: o ``SELECT ... FOR UPDATE`` fica numa
+        subconsulta, então o custo em Python não depende de quantas linhas são
+        afetadas.
+        """
+        bloqueadas = alvo.select_for_update(of=("self",)).values("pk")
+        linhas = self.model._base_manager.using(self.db).filter(pk__in=bloqueadas)
+        return list(self._agrupar(linhas).annotate(total=Count("pk")).order_by())
+
+    def _agrupar(self, linhas):
+        return linhas.values(*self.campos_efeitos)
+
+    def _ao_excluir(self, grupos, momento):
+        pass
+
+    def _ao_restaurar(self, grupos):
+        pass
+
+
+class ActiveManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
     def get_queryset(self):
-        return super().get_queryset().filter(is_deleted=False)
\ No newline at end of file
+        return super().get_queryset().filter(is_deleted=False)
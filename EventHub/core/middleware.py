@@ -0,0 +1,85 @@
+"""Métricas de banco por requisição (debug/staging).
+
+``QueryMetricsMiddleware`` conta as queries e o tempo gasto no banco em cada
+requisição e devolve os valores no header ``Server-Timing`` (visível no
+DevTools do navegador). Queries com o mesmo formato repetidas várias vezes
+(mesmo SQL a menos dos parâmetros) são registradas como provável N+1.
+
+Ativado por ``QUERY_METRICS`` (padrão: igual a ``DEBUG``).
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("core.queries")
+
+_LITERAIS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s|\?")
+_LISTAS = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+
+
+def formato_query(sql):
+    """SQL sem os valores: literais e listas do IN viram ``?``."""
+    return _LISTAS.sub("(?)", _LITERAIS.sub("?", sql))
+
+
+class ColetorQueries:
+    """``execute_wrapper`` que registra SQL e duração de cada query executada."""
+
+    def __init__(self):
+        self.queries = []
+        self.tempo = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracao = time.perf_counter() - inicio
+            self.tempo += duracao
+            self.queries.append((sql, duracao))
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for conexao in connections.all():
+            self._stack.enter_context(conexao.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc):
+        self._stack.close()
+
+    @property
+    def total(self):
+        return len(self.queries)
+
+    def repetidas(self, limite=None):
+        """Formatos executados ``limite`` vezes ou mais: ``{formato: vezes}``."""
+        if limite is None:
+            limite = getattr(settings, "QUERY_NPLUS1_THRESHOLD", 3)
+        contagem = Counter(formato_query(sql) for sql, _ in self.queries)
+        return {formato: vezes for formato, vezes in contagem.items() if vezes >= limite}
+
+
+class QueryMetricsMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_METRICS", settings.DEBUG):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with ColetorQueries() as coletor:
+            response = self.get_response(request)
+
+        repetidas = coletor.repetidas()
+        metricas = [f'db;dur={coletor.tempo * 1000:.1f};desc="{coletor.total} queries"']
+        if repetidas:
+            metricas.append(f'nplus1;desc="{sum(repetidas.values())} queries repetidas"')
+            for formato, vezes in repetidas.items():
+                logger.warning("Provável N+1 em %s %s (%dx): %s", request.method, request.path, vezes, formato)
+        response["Server-Timing"] = ", ".join(metricas)
+        return response
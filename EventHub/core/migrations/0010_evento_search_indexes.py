@@ -0,0 +1,49 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+SEARCH_INDEX = "evento_search_vector_gin"
+TRIGRAM_INDEX = "evento_titulo_trgm_gin"
+
+
+def _indexes():
+    # A expressão deve ser idêntica a core.search.evento_search_vector()
+    vector = (
+        SearchVector("titulo", weight="A", config="portuguese")
+        + SearchVector("descricao", weight="B", config="portuguese")
+        + SearchVector("local", weight="C", config="portuguese")
+    )
+    return [
+        GinIndex(vector, name=SEARCH_INDEX),
+        GinIndex(fields=["titulo"], opclasses=["gin_trgm_ops"], name=TRIGRAM_INDEX),
+    ]
+
+
+def criar_indices_busca(apps, schema_editor):
+    """Índices de busca só existem no PostgreSQL; demais bancos usam o fallback."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Evento = apps.get_model("core", "Evento")
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index in _indexes():
+        schema_editor.add_index(Evento, index)
+
+
+def remover_indices_busca(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Evento = apps.get_model("core", "Evento")
+    for index in _indexes():
+        schema_editor.remove_index(Evento, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_notificacao_recipient_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indices_busca, remover_indices_busca),
+    ]
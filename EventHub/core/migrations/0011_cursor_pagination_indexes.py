@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_evento_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evento',
+            index=models.Index(fields=['created_at', 'id'], name='evento_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscricao',
+            index=models.Index(fields=['participante', 'created_at', 'id'], name='inscricao_part_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscricao',
+            index=models.Index(fields=['evento', 'created_at', 'id'], name='inscricao_evento_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificacao',
+            index=models.Index(fields=['participante', 'created_at', 'id'], name='notif_part_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificacao',
+            index=models.Index(fields=['organizador', 'created_at', 'id'], name='notif_org_created_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:36
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def preencher_vagas_ocupadas(apps, schema_editor):
+    """Inicializa o contador com as inscrições ativas de cada evento."""
+    Evento = apps.get_model("core", "Evento")
+    Inscricao = apps.get_model("core", "Inscricao")
+    ativas = (
+        Inscricao.objects.filter(evento=OuterRef("pk"), is_deleted=False)
+        .exclude(status="cancelada")
+        .order_by()
+        .values("evento")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Evento.objects.update(
+        vagas_ocupadas=Coalesce(Subquery(ativas, output_field=IntegerField()), Value(0))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='vagas_ocupadas',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(preencher_vagas_ocupadas, migrations.RunPython.noop),
+    ]
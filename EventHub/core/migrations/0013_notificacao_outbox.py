@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_evento_vagas_ocupadas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificacaoOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('inscricao_criada', 'Inscrição criada'), ('inscricao_cancelada', 'Inscrição cancelada')], max_length=30)),
+                ('status', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processado_em', models.DateTimeField(blank=True, null=True)),
+                ('inscricao', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.inscricao')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('processado_em__isnull', True)), fields=['id'], name='notif_outbox_pendente_idx')],
+            },
+        ),
+    ]
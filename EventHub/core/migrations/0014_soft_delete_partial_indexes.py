@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_notificacao_outbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evento',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['organizer', 'data_inicio'], name='evento_org_inicio_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscricao',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['participante', 'evento'], name='inscricao_part_ev_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscricao',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['evento', 'status'], name='inscricao_ev_status_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificacao',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['participante', 'is_read'], name='notif_part_lida_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificacao',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['organizador', 'is_read'], name='notif_org_lida_ativo_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 02:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_soft_delete_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SerieInscricoes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularidade', models.CharField(choices=[('dia', 'Dia'), ('hora', 'Hora')], max_length=4)),
+                ('inicio', models.DateTimeField()),
+                ('status', models.CharField(max_length=20)),
+                ('total', models.IntegerField(default=0)),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.evento')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('evento', 'granularidade', 'inicio', 'status'), name='serie_inscricoes_periodo_uniq')],
+            },
+        ),
+    ]
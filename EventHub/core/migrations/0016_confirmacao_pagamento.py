@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-18 02:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_serie_inscricoes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConfirmacaoPagamento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=100, unique=True)),
+                ('resultado', models.CharField(max_length=20)),
+                ('recebido_em', models.DateTimeField(auto_now_add=True)),
+                ('inscricao', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.inscricao')),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_confirmacao_pagamento'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inscricao',
+            index=models.Index(condition=models.Q(('is_deleted', False), ('status', 'pendente')), fields=['data_inscricao', 'id'], name='inscricao_pendente_data_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-18 02:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_inscricao_pendente_data_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificacaoArquivada',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('mensagem', models.TextField()),
+                ('participante_id', models.BigIntegerField(blank=True, null=True)),
+                ('organizador_id', models.BigIntegerField(blank=True, null=True)),
+                ('evento_id', models.BigIntegerField()),
+                ('created_at', models.DateTimeField()),
+                ('arquivada_em', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 02:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_notificacao_arquivada'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='organizador',
+            name='email',
+            field=models.EmailField(max_length=254),
+        ),
+        migrations.AlterField(
+            model_name='participante',
+            name='email',
+            field=models.EmailField(max_length=254),
+        ),
+        migrations.AddConstraint(
+            model_name='organizador',
+            constraint=models.UniqueConstraint(fields=('email',), name='organizador_email_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='participante',
+            constraint=models.UniqueConstraint(fields=('email',), name='participante_email_uniq'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-18 02:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_email_unique_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificacaooutbox',
+            name='evento',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.evento'),
+        ),
+        migrations.AddField(
+            model_name='notificacaooutbox',
+            name='mensagem',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='notificacaooutbox',
+            name='progresso',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='notificacaooutbox',
+            name='inscricao',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.inscricao'),
+        ),
+        migrations.AlterField(
+            model_name='notificacaooutbox',
+            name='status',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='notificacaooutbox',
+            name='tipo',
+            field=models.CharField(choices=[('inscricao_criada', 'Inscrição criada'), ('inscricao_cancelada', 'Inscrição cancelada'), ('broadcast', 'Broadcast para os inscritos')], max_length=30),
+        ),
+        migrations.AddIndex(
+            model_name='inscricao',
+            index=models.Index(fields=['evento', 'id'], name='inscricao_evento_id_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 02:58
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_broadcast_outbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='participante',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='participante_email_lower_idx'),
+        ),
+    ]
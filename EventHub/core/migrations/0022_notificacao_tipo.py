@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_participante_email_lower_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificacao',
+            name='tipo',
+            field=models.CharField(blank=True, choices=[('', 'Aviso'), ('evento_cancelado', 'Evento cancelado')], default='', max_length=30),
+        ),
+    ]
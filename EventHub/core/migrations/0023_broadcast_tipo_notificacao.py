@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_notificacao_tipo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificacaooutbox',
+            name='tipo_notificacao',
+            field=models.CharField(blank=True, max_length=30),
+        ),
+    ]
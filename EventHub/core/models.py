@@ -1,7 +1,12 @@
-from django.db import models
+from collections import Counter, defaultdict
+
+from django.db import models, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Greatest, Lower, TruncHour
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.utils import timezone
-from core.managers import ActiveManager 
+from core.managers import ActiveManager, SoftDeleteQuerySet
 
 # Base para Soft Delete e controle de datas
 class BaseModel(models.Model):
@@ -14,16 +19,95 @@ class BaseModel(models.Model):
         abstract = True  # não cria tabela no banco
 
     def delete(self, using=None, keep_parents=False):
-        """Soft delete: marca como deletado em vez de remover"""
+        """Soft delete: marca como deletado em vez de remover (via ``SoftDeleteQuerySet``)"""
+        momento = timezone.now()
+        gerenciador = type(self).all_objects.db_manager(using or self._state.db)
+        if gerenciador.filter(pk=self.pk).soft_delete(momento):
+            self.deleted_at = momento
+            self.updated_at = momento
         self.is_deleted = True
-        self.deleted_at = timezone.now()
-        self.save()
 
     def restore(self):
         """Restaura um item deletado"""
+        type(self).all_objects.db_manager(self._state.db).filter(pk=self.pk).restore()
         self.is_deleted = False
         self.deleted_at = None
-        self.save()
+
+
+class EventoQuerySet(SoftDeleteQuerySet):
+    """Excluir eventos leva junto as inscrições e as notificações deles.
+
+    Para os eventos ativos é agendado o aviso de cancelamento
+    (``agendar_broadcast``), que o worker entrega também às inscrições que
+    saíram junto com o evento. Restaurar traz de volta só o que saiu junto
+    (mesmo ``deleted_at``) e revoga os avisos de cancelamento, inclusive os
+    ainda não enviados; quem já tinha lido o aviso recebe o de reativação.
+    """
+    # um grupo por evento
+    campos_efeitos = ("pk", "titulo", "is_active", "deleted_at")
+
+    def _ao_excluir(self, eventos, momento):
+        from .cache_eventos import invalidar_catalogo
+        from .notificacoes import agendar_broadcast, mensagem_evento_cancelado
+
+        ids = [evento["pk"] for evento in eventos]
+        Inscricao.objects.using(self.db).filter(evento_id__in=ids).soft_delete(momento)
+        Notificacao.objects.using(self.db).filter(evento_id__in=ids).soft_delete(momento)
+        for evento in eventos:
+            if evento["is_active"]:
+                agendar_broadcast(
+                    self.model(pk=evento["pk"]),
+                    mensagem_evento_cancelado(evento["titulo"]),
+                    Notificacao.TIPO_EVENTO_CANCELADO,
+                )
+        invalidar_catalogo()
+
+    def _ao_restaurar(self, eventos):
+        from .cache_eventos import invalidar_catalogo
+
+        por_momento = defaultdict(list)
+        for evento in eventos:
+            por_momento[evento["deleted_at"]].append(evento["pk"])
+        titulos = {evento["pk"]: evento["titulo"] for evento in eventos}
+        for momento, ids in por_momento.items():
+            Inscricao.all_objects.using(self.db).filter(evento_id__in=ids, deleted_at=momento).restore()
+            Notificacao.all_objects.using(self.db).filter(evento_id__in=ids, deleted_at=momento).restore()
+            self._revogar_avisos_de_cancelamento({pk: titulos[pk] for pk in ids}, momento)
+        invalidar_catalogo()
+
+    def _revogar_avisos_de_cancelamento(self, titulos, momento):
+        """Exclui os avisos de cancelamento (``TIPO_EVENTO_CANCELADO``) criados a partir de ``momento``.
+
+        ``titulos`` mapeia evento → título. Quem já tinha lido o aviso é
+        avisado de que o evento voltou, em vez de a notificação só sumir.
+        """
+        from .notificacoes import criar_notificacoes, mensagem_evento_reativado
+
+        # broadcast ainda pendente não é mais enviado; o UPDATE espera o bloco
+        # que o worker estiver gravando, que então é revogado abaixo
+        NotificacaoOutbox.objects.using(self.db).filter(
+            tipo=NotificacaoOutbox.TIPO_BROADCAST,
+            tipo_notificacao=Notificacao.TIPO_EVENTO_CANCELADO,
+            evento_id__in=titulos,
+            created_at__gte=momento,
+            processado_em__isnull=True,
+        ).update(processado_em=timezone.now())
+        avisos = Notificacao.objects.using(self.db).filter(
+            evento_id__in=titulos,
+            tipo=Notificacao.TIPO_EVENTO_CANCELADO,
+            created_at__gte=momento,
+        )
+        lidos = list(avisos.filter(is_read=True).values_list("participante_id", "evento_id"))
+        avisos.soft_delete()
+        if lidos:
+            criar_notificacoes([
+                Notificacao(
+                    participante_id=participante_id,
+                    evento_id=evento_id,
+                    mensagem=mensagem_evento_reativado(titulos[evento_id]),
+                )
+                for participante_id, evento_id in lidos
+            ])
 
 
 class Evento(BaseModel):
@@ -40,6 +124,8 @@ class Evento(BaseModel):
         related_name="eventos",
     )
     capacidade = models.PositiveIntegerField()
+    # Inscrições ativas (pendentes/confirmadas); mantido por reservar_vaga/liberar_vaga
+    vagas_ocupadas = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
     tipo = models.CharField(max_length=20, choices=[
         ("presencial", "Presencial"),
@@ -51,24 +137,156 @@ class Evento(BaseModel):
     preco = models.DecimalField(max_digits=8, decimal_places=2, default=0.00)
 
     
-    objects = ActiveManager()       # só retorna registros ativos
-    all_objects = models.Manager()  # retorna tudo (inclusive deletados)
+    objects = ActiveManager.from_queryset(EventoQuerySet)()  # só retorna registros ativos
+    all_objects = EventoQuerySet.as_manager()                # retorna tudo (inclusive deletados)
+
+    class Meta:
+        indexes = [
+            # paginação por cursor: (created_at, id)
+            models.Index(fields=["created_at", "id"], name="evento_created_id_idx"),
+            # eventos do organizador por data; parciais: o ActiveManager filtra is_deleted=False
+            models.Index(
+                fields=["organizer", "data_inicio"],
+                name="evento_org_inicio_ativo_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
 
     def __str__(self):
         return self.titulo
 
+    def save(self, *args, **kwargs):
+        """Grava o evento sem ``vagas_ocupadas``, a menos que pedido em ``update_fields``.
+
+        O contador só muda por UPDATEs condicionais com ``F()``
+        (``reservar_vaga``/``liberar_vaga``); regravar o valor lido antes
+        apagaria as reservas feitas nesse meio-tempo e permitiria overbooking.
+        """
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                campo.name for campo in self._meta.concrete_fields
+                if not campo.primary_key and campo.name != "vagas_ocupadas"
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def vagas_restantes(self):
+        return max(self.capacidade - self.vagas_ocupadas, 0)
+
+    @classmethod
+    def reservar_vaga(cls, evento_id):
+        """Ocupa uma vaga do evento se houver; retorna False quando lotado.
+
+        O UPDATE condicional é atômico no banco, então inscrições simultâneas
+        nunca ultrapassam a capacidade. ``updated_at`` acompanha a mudança para
+        que ETag/Last-Modified do evento reflitam as vagas.
+        """
+        atualizados = cls.all_objects.filter(
+            pk=evento_id, vagas_ocupadas__lt=F("capacidade")
+        ).update(vagas_ocupadas=F("vagas_ocupadas") + 1, updated_at=timezone.now())
+        return atualizados == 1
+
+    @classmethod
+    def liberar_vaga(cls, evento_id):
+        """Devolve uma vaga ocupada ao evento."""
+        cls.all_objects.filter(pk=evento_id, vagas_ocupadas__gt=0).update(
+            vagas_ocupadas=F("vagas_ocupadas") - 1, updated_at=timezone.now()
+        )
+
+    @staticmethod
+    def _por_evento(quantidades):
+        return Case(
+            *[When(pk=evento_id, then=Value(total)) for evento_id, total in quantidades.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+
+    @classmethod
+    def reservar_vagas(cls, quantidades):
+        """Ocupa ``{evento_id: vagas}`` em vários eventos com um único UPDATE.
+
+        Retorna False se algum evento não comporta as vagas pedidas; os
+        demais já foram atualizados, então o chamador desfaz a transação.
+        """
+        quantidades = {evento_id: total for evento_id, total in quantidades.items() if total}
+        if not quantidades:
+            return True
+        vagas = cls._por_evento(quantidades)
+        atualizados = cls.all_objects.filter(
+            pk__in=quantidades, vagas_ocupadas__lte=F("capacidade") - vagas
+        ).update(vagas_ocupadas=F("vagas_ocupadas") + vagas, updated_at=timezone.now())
+        return atualizados == len(quantidades)
+
+    @classmethod
+    def liberar_vagas(cls, quantidades):
+        """Devolve ``{evento_id: vagas}`` a vários eventos com um único UPDATE."""
+        quantidades = {evento_id: total for evento_id, total in quantidades.items() if total}
+        if quantidades:
+            cls.all_objects.filter(pk__in=quantidades).update(
+                vagas_ocupadas=Greatest(F("vagas_ocupadas") - cls._por_evento(quantidades), Value(0)),
+                updated_at=timezone.now(),
+            )
+
 class Participante(BaseModel):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     nome = models.CharField(max_length=150)
-    email = models.EmailField(unique=True)
+    email = models.EmailField()
+
+    objects = ActiveManager()                      # só retorna registros ativos
+    all_objects = SoftDeleteQuerySet.as_manager()  # retorna tudo (inclusive deletados)
 
-    objects = ActiveManager()       # só retorna registros ativos
-    all_objects = models.Manager()  # retorna tudo (inclusive deletados)
+    class Meta:
+        constraints = [
+            # nome explícito: o cadastro identifica a duplicidade pelo nome (core.integridade)
+            models.UniqueConstraint(fields=["email"], name="participante_email_uniq"),
+        ]
+        indexes = [
+            # busca por e-mail sem diferenciar maiúsculas (inscrição em lote, core.inscricoes)
+            models.Index(Lower("email"), name="participante_email_lower_idx"),
+        ]
 
     def __str__(self):
         return self.nome
 
 
+class InscricaoQuerySet(SoftDeleteQuerySet):
+    """Soft delete/restore de inscrições devolve ou reserva as vagas e move as séries."""
+    campos_efeitos = ("evento_id", "status")
+
+    def _agrupar(self, linhas):
+        # também pela hora da inscrição, o menor período das séries
+        return linhas.values(*self.campos_efeitos, hora=TruncHour("data_inscricao"))
+
+    def _ao_excluir(self, grupos, momento):
+        Evento.liberar_vagas(self._vagas(grupos))
+        self._registrar_series(grupos, -1)
+
+    def _ao_restaurar(self, grupos):
+        if not Evento.reservar_vagas(self._vagas(grupos)):
+            raise ValidationError("O evento não possui vagas disponíveis.")
+        self._registrar_series(grupos, 1)
+
+    @staticmethod
+    def _vagas(grupos):
+        vagas = Counter()
+        for grupo in grupos:
+            if grupo["status"] != "cancelada":
+                vagas[grupo["evento_id"]] += grupo["total"]
+        return vagas
+
+    @staticmethod
+    def _registrar_series(grupos, delta):
+        from .cache_eventos import invalidar_catalogo
+        from .series import registrar
+
+        # update() não dispara os signals das séries e do cache
+        variacoes = Counter()
+        for grupo in grupos:
+            variacoes[(grupo["evento_id"], grupo["hora"], grupo["status"])] += delta * grupo["total"]
+        registrar(variacoes)
+        invalidar_catalogo()
+
+
 class Inscricao(BaseModel):
     participante = models.ForeignKey(
         Participante,
@@ -91,18 +309,107 @@ class Inscricao(BaseModel):
         default="pendente"
     )
 
-    objects = ActiveManager()       # só retorna registros ativos
-    all_objects = models.Manager()  # retorna tudo (inclusive deletados)
+    objects = ActiveManager.from_queryset(InscricaoQuerySet)()  # só retorna registros ativos
+    all_objects = InscricaoQuerySet.as_manager()                # retorna tudo (inclusive deletados)
 
     class Meta:
         unique_together = ("participante", "evento")  # evita duplicação
+        indexes = [
+            # paginação por cursor das inscrições do participante e dos eventos
+            models.Index(fields=["participante", "created_at", "id"], name="inscricao_part_created_idx"),
+            models.Index(fields=["evento", "created_at", "id"], name="inscricao_evento_created_idx"),
+            # broadcast: inscritos do evento em blocos por id (core.notificacoes)
+            models.Index(fields=["evento", "id"], name="inscricao_evento_id_idx"),
+            # inscrição do participante em um evento / inscrições de um evento por status
+            models.Index(
+                fields=["participante", "evento"],
+                name="inscricao_part_ev_ativo_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["evento", "status"],
+                name="inscricao_ev_status_ativo_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            # fila de expiração: pendentes mais antigas primeiro (core.pagamentos)
+            models.Index(
+                fields=["data_inscricao", "id"],
+                name="inscricao_pendente_data_idx",
+                condition=models.Q(is_deleted=False, status="pendente"),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.participante.nome} - {self.evento.titulo}"
 
+    @property
+    def ocupa_vaga(self):
+        return not self.is_deleted and self.status != "cancelada"
+
+    def cancelar(self):
+        """Cancela a inscrição e libera a vaga no evento.
+
+        Retorna False se ela já estava cancelada. A linha é bloqueada para
+        que dois cancelamentos simultâneos não liberem a vaga duas vezes.
+        """
+        with transaction.atomic():
+            atual = Inscricao.all_objects.select_for_update().get(pk=self.pk)
+            if atual.status == "cancelada":
+                self.status = atual.status
+                return False
+            ocupava = atual.ocupa_vaga
+            self.status = "cancelada"
+            self.save(update_fields=["status", "updated_at"])
+            if ocupava:
+                Evento.liberar_vaga(self.evento_id)
+        return True
+
+
+class NotificacaoQuerySet(SoftDeleteQuerySet):
+    """Soft delete/restore de notificações acompanha os contadores de não lidas."""
+    campos_efeitos = ("participante_id", "organizador_id", "is_read")
+    # acima disso os contadores são descartados (e recalculados na leitura) em vez de ajustados
+    AJUSTES_MAXIMOS = 100
+
+    def _ao_excluir(self, grupos, momento):
+        self._ajustar_contadores(grupos, -1)
+
+    def _ao_restaurar(self, grupos):
+        self._ajustar_contadores(grupos, 1)
+
+    def _ajustar_contadores(self, grupos, sinal):
+        from .contadores import ajustar_nao_lidas, invalidar_nao_lidas
+
+        nao_lidas = {
+            (grupo["participante_id"], grupo["organizador_id"]): grupo["total"]
+            for grupo in grupos
+            if not grupo["is_read"]
+        }
+        if not nao_lidas:
+            return
+
+        def apos_commit():
+            # só depois do commit: um rollback não deixa o contador divergir do banco
+            if len(nao_lidas) > self.AJUSTES_MAXIMOS:
+                invalidar_nao_lidas(nao_lidas)
+                return
+            for (participante_id, organizador_id), total in nao_lidas.items():
+                ajustar_nao_lidas(sinal * total, participante_id, organizador_id)
+
+        transaction.on_commit(apos_commit, using=self.db)
+
 
 class Notificacao(BaseModel):
+    TIPO_AVISO = ""
+    TIPO_EVENTO_CANCELADO = "evento_cancelado"
+
     mensagem = models.TextField()
+    # Marca estável dos avisos que precisam ser localizados depois (ex.: os de
+    # cancelamento, revogados quando o evento é restaurado)
+    tipo = models.CharField(max_length=30, blank=True, default=TIPO_AVISO, choices=[
+        (TIPO_AVISO, "Aviso"),
+        (TIPO_EVENTO_CANCELADO, "Evento cancelado"),
+    ])
     # Destinatário: ou participante OU organizador (um dos dois)
     participante = models.ForeignKey(
         Participante,
@@ -125,8 +432,26 @@ class Notificacao(BaseModel):
     )
     is_read = models.BooleanField(default=False)
 
-    objects = ActiveManager()       # só retorna registros ativos
-    all_objects = models.Manager()  # retorna tudo (inclusive deletados)
+    objects = ActiveManager.from_queryset(NotificacaoQuerySet)()  # só retorna registros ativos
+    all_objects = NotificacaoQuerySet.as_manager()                # retorna tudo (inclusive deletados)
+
+    class Meta:
+        indexes = [
+            # paginação por cursor das notificações de cada destinatário
+            models.Index(fields=["participante", "created_at", "id"], name="notif_part_created_idx"),
+            models.Index(fields=["organizador", "created_at", "id"], name="notif_org_created_idx"),
+            # não lidas por destinatário (contadores, marcar como lidas)
+            models.Index(
+                fields=["participante", "is_read"],
+                name="notif_part_lida_ativo_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["organizador", "is_read"],
+                name="notif_org_lida_ativo_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
 
     def __str__(self):
         destinatario = None
@@ -139,16 +464,140 @@ class Notificacao(BaseModel):
         return f"Notificação: {destinatario} -> {self.evento.titulo}"
 
 
+class NotificacaoOutbox(models.Model):
+    """Entrada leve gravada na transação da inscrição (ou do aviso a um evento).
+
+    O worker (``manage.py processar_notificacoes``) transforma as entradas
+    pendentes em ``Notificacao`` fora do ciclo da requisição. Broadcasts são
+    enviados em blocos; ``progresso`` guarda a última inscrição já avisada.
+    """
+    TIPO_INSCRICAO_CRIADA = "inscricao_criada"
+    TIPO_INSCRICAO_CANCELADA = "inscricao_cancelada"
+    TIPO_BROADCAST = "broadcast"
+
+    tipo = models.CharField(max_length=30, choices=[
+        (TIPO_INSCRICAO_CRIADA, "Inscrição criada"),
+        (TIPO_INSCRICAO_CANCELADA, "Inscrição cancelada"),
+        (TIPO_BROADCAST, "Broadcast para os inscritos"),
+    ])
+    inscricao = models.ForeignKey(
+        Inscricao,
+        on_delete=models.CASCADE,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    # Status da inscrição no momento do evento (define a mensagem)
+    status = models.CharField(max_length=20, blank=True)
+    # Broadcast: evento, mensagem e id da última inscrição avisada
+    evento = models.ForeignKey(
+        Evento,
+        on_delete=models.CASCADE,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    mensagem = models.TextField(blank=True)
+    # ``Notificacao.tipo`` das notificações geradas pelo broadcast
+    tipo_notificacao = models.CharField(max_length=30, blank=True)
+    progresso = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processado_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # fila: apenas entradas ainda não processadas, na ordem de chegada
+            models.Index(
+                fields=["id"],
+                name="notif_outbox_pendente_idx",
+                condition=models.Q(processado_em__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        if self.tipo == self.TIPO_BROADCAST:
+            return f"{self.tipo} evento #{self.evento_id}"
+        return f"{self.tipo} #{self.inscricao_id}"
+
+
+class NotificacaoArquivada(models.Model):
+    """Notificação lida antiga, movida para fora de ``core_notificacao``.
+
+    Guarda os ids originais sem chaves estrangeiras: o arquivo não é
+    consultado pela API e não impede a remoção de eventos e perfis.
+    """
+    id = models.BigIntegerField(primary_key=True)  # mesmo id da Notificacao
+    mensagem = models.TextField()
+    participante_id = models.BigIntegerField(null=True, blank=True)
+    organizador_id = models.BigIntegerField(null=True, blank=True)
+    evento_id = models.BigIntegerField()
+    created_at = models.DateTimeField()
+    arquivada_em = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"#{self.pk} ({self.created_at:%Y-%m-%d})"
+
+
+class ConfirmacaoPagamento(models.Model):
+    """Confirmação de pagamento já processada, pela chave de idempotência.
+
+    Reenvios da mesma confirmação (mesmo ``token``) são ignorados pela
+    ingestão em ``core.pagamentos``.
+    """
+    token = models.CharField(max_length=100, unique=True)
+    inscricao = models.ForeignKey(Inscricao, on_delete=models.CASCADE, related_name="+")
+    # resultado da primeira vez em que o token foi processado
+    resultado = models.CharField(max_length=20)
+    recebido_em = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.token} → #{self.inscricao_id} ({self.resultado})"
+
+
+class SerieInscricoes(models.Model):
+    """Total de inscrições de um evento por período (dia/hora) e status.
+
+    Mantida incrementalmente a cada inscrição criada ou alterada
+    (``core.series``); os gráficos leem só esta tabela. Cada inscrição
+    ativa conta no período da sua ``data_inscricao``, com o status atual.
+    """
+    DIA = "dia"
+    HORA = "hora"
+
+    evento = models.ForeignKey(Evento, on_delete=models.CASCADE, related_name="+")
+    granularidade = models.CharField(max_length=4, choices=[(DIA, "Dia"), (HORA, "Hora")])
+    inicio = models.DateTimeField()  # início do período, no fuso do projeto
+    status = models.CharField(max_length=20)
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # também atende às consultas por intervalo de um evento
+            models.UniqueConstraint(
+                fields=["evento", "granularidade", "inicio", "status"],
+                name="serie_inscricoes_periodo_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.evento_id} {self.granularidade} {self.inicio:%Y-%m-%d %H:%M} {self.status}: {self.total}"
+
+
 class Organizador(BaseModel):
     """Representa um organizador de eventos."""
     user = models.OneToOneField(User, on_delete=models.SET_NULL, null=True, blank=True)
     nome = models.CharField(max_length=150)
-    email = models.EmailField(unique=True)
+    email = models.EmailField()
     telefone = models.CharField(max_length=30, blank=True, null=True)
     empresa = models.CharField(max_length=200, blank=True, null=True)
 
     objects = ActiveManager()
-    all_objects = models.Manager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["email"], name="organizador_email_uniq"),
+        ]
 
     def __str__(self):
         return self.nome
\ No newline at end of file
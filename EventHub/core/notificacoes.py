@@ -0,0 +1,305 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .contadores import invalidar_nao_lidas, obter_nao_lidas
+from .models import Inscricao, Notificacao, NotificacaoOutbox
+from .pubsub import canal_destinatario, get_broker
+
+
+def mensagens_inscricao_criada(inscricao, status):
+    """Mensagens (participante, organizador) para uma nova inscrição.
+
+    - Evento gratuito (preco = 0): status "confirmada" → mensagem de sucesso
+    - Evento pago (preco > 0): status "pendente" → mensagem de aguardando pagamento
+    """
+    evento = inscricao.evento
+    is_evento_pago = evento.preco > Decimal('0.00')
+
+    if status == 'confirmada':
+        if is_evento_pago:
+            mensagem_participante = (
+                f"✅ Sua inscrição no evento '{evento.titulo}' foi confirmada! "
+                f"O pagamento foi processado com sucesso."
+            )
+        else:
+            mensagem_participante = (
+                f"✅ Parabéns! Sua inscrição no evento gratuito '{evento.titulo}' "
+                f"foi confirmada com sucesso. Aguardamos você!"
+            )
+    elif status == 'pendente':
+        mensagem_participante = (
+            f"⏳ Sua inscrição no evento '{evento.titulo}' foi registrada com status PENDENTE. "
+            f"Verifique seu e-mail para instruções de pagamento (valor: R$ {evento.preco})."
+        )
+    else:  # cancelada (não deve acontecer na criação, mas por segurança)
+        mensagem_participante = (
+            f"❌ Sua inscrição no evento '{evento.titulo}' foi cancelada."
+        )
+
+    mensagem_organizador = (
+        f"🎉 Nova inscrição ({status}) recebida no evento '{evento.titulo}' "
+        f"de {inscricao.participante.nome}."
+    )
+    return mensagem_participante, mensagem_organizador
+
+
+def mensagens_inscricao_cancelada(inscricao):
+    """Mensagens (participante, organizador) para o cancelamento de uma inscrição."""
+    evento = inscricao.evento
+    mensagem_participante = (
+        f"❌ Sua inscrição no evento '{evento.titulo}' foi cancelada. "
+        f"Você não poderá se inscrever novamente neste evento."
+    )
+    mensagem_organizador = (
+        f"ℹ️ A inscrição de {inscricao.participante.nome} no evento "
+        f"'{evento.titulo}' foi cancelada."
+    )
+    return mensagem_participante, mensagem_organizador
+
+
+def mensagem_inscricao_expirada(inscricao):
+    """Mensagem ao participante quando a inscrição pendente expira sem pagamento."""
+    return (
+        f"⌛ Sua inscrição no evento '{inscricao.evento.titulo}' foi cancelada porque o "
+        f"pagamento não foi confirmado no prazo."
+    )
+
+
+def notificacoes_para_inscricao(inscricao, mensagens):
+    """Monta (sem salvar) as notificações do participante e do organizador."""
+    mensagem_participante, mensagem_organizador = mensagens
+    notificacoes = [
+        Notificacao(
+            participante_id=inscricao.participante_id,
+            evento_id=inscricao.evento_id,
+            mensagem=mensagem_participante,
+        )
+    ]
+    if inscricao.evento.organizer_id is not None:
+        notificacoes.append(
+            Notificacao(
+                organizador_id=inscricao.evento.organizer_id,
+                evento_id=inscricao.evento_id,
+                mensagem=mensagem_organizador,
+            )
+        )
+    return notificacoes
+
+
+def criar_notificacoes(notificacoes, batch_size=1000):
+    """Insere notificações em lote. Todos os caminhos em massa passam por aqui.
+
+    ``bulk_create`` não dispara post_save, então a invalidação dos contadores
+    de não lidas e a publicação para os clientes conectados são feitas aqui,
+    após o commit.
+    """
+    criadas = Notificacao.objects.bulk_create(notificacoes, batch_size=batch_size)
+
+    def apos_commit():
+        invalidar_nao_lidas({(n.participante_id, n.organizador_id) for n in criadas})
+        publicar_notificacoes(criadas)
+
+    transaction.on_commit(apos_commit)
+    return criadas
+
+
+def mensagem_push_notificacao(notificacao):
+    """Payload enviado pelo canal de push para uma nova notificação."""
+    return {
+        "tipo": "notificacao",
+        "notificacao": {
+            "id": notificacao.pk,
+            "mensagem": notificacao.mensagem,
+            "evento": notificacao.evento_id,
+            "is_read": notificacao.is_read,
+            "created_at": notificacao.created_at.isoformat() if notificacao.created_at else None,
+        },
+    }
+
+
+def publicar_notificacoes(notificacoes):
+    """Empurra as notificações recém-criadas para os destinatários conectados."""
+    broker = get_broker()
+    for notificacao in notificacoes:
+        canal = canal_destinatario(notificacao.participante_id, notificacao.organizador_id)
+        broker.publicar(canal, mensagem_push_notificacao(notificacao))
+
+
+def publicar_unread(participante_id=None, organizador_id=None):
+    """Avisa o destinatário conectado de que o total de não lidas mudou."""
+    canal = canal_destinatario(participante_id, organizador_id)
+    unread = obter_nao_lidas(participante_id, organizador_id)
+    get_broker().publicar(canal, {"tipo": "unread", "unread": unread})
+
+
+def mensagem_evento_cancelado(titulo):
+    return f"🚫 O evento '{titulo}' foi cancelado pelo organizador."
+
+
+def mensagem_evento_reativado(titulo):
+    return f"✅ O evento '{titulo}' foi reativado pelo organizador e sua inscrição continua valendo."
+
+
+def mensagem_alteracao_evento(evento, anterior):
+    """Mensagem de aviso quando um evento muda de data/local ou é desativado.
+
+    ``anterior`` é o dicionário com data_inicio, local, is_active e is_deleted
+    antes da alteração. Retorna None quando não há o que avisar.
+    """
+    if evento_desativado(evento, anterior):
+        return mensagem_evento_cancelado(evento.titulo)
+
+    mudancas = []
+    if evento.data_inicio != anterior["data_inicio"]:
+        data = timezone.localtime(evento.data_inicio).strftime("%d/%m/%Y %H:%M")
+        mudancas.append(f"nova data: {data}")
+    if evento.local != anterior["local"]:
+        mudancas.append(f"novo local: {evento.local}")
+    if not mudancas:
+        return None
+    return f"📢 O evento '{evento.titulo}' foi alterado ({'; '.join(mudancas)})."
+
+
+def evento_desativado(evento, anterior):
+    """Se a alteração desativou (ou excluiu) um evento que estava ativo."""
+    desativado_antes = not anterior["is_active"] or anterior["is_deleted"]
+    return (not evento.is_active or evento.is_deleted) and not desativado_antes
+
+
+def _broadcast_bloco(evento_id, mensagem, apos_inscricao_id, chunk_size, tipo=Notificacao.TIPO_AVISO):
+    """Avisa o próximo bloco de inscritos (não cancelados) depois de ``apos_inscricao_id``.
+
+    As inscrições excluídas junto com o evento (mesmo ``deleted_at``) contam
+    como inscritos: assim o aviso de cancelamento agendado na exclusão chega
+    a quem estava inscrito. Retorna ``(notificações criadas, id da última
+    inscrição do bloco)``.
+    """
+    linhas = list(
+        Inscricao.all_objects.filter(evento_id=evento_id, pk__gt=apos_inscricao_id)
+        .filter(Q(is_deleted=False) | Q(deleted_at=F("evento__deleted_at")))
+        .exclude(status="cancelada")
+        .order_by("pk")
+        .values_list("pk", "participante_id")[:chunk_size]
+    )
+    if not linhas:
+        return 0, apos_inscricao_id
+    criar_notificacoes(
+        [Notificacao(participante_id=participante_id, evento_id=evento_id, mensagem=mensagem, tipo=tipo)
+         for _, participante_id in linhas],
+        batch_size=chunk_size,
+    )
+    return len(linhas), linhas[-1][0]
+
+
+def broadcast_evento(evento, mensagem, chunk_size=2000):
+    """Envia uma notificação a todos os inscritos (não cancelados) do evento.
+
+    Os inscritos são lidos por id em blocos de ``chunk_size`` e cada bloco é
+    gravado e publicado na sua própria transação: a memória fica limitada ao
+    bloco e os clientes recebem os avisos à medida que os blocos entram.
+    Retorna a quantidade de notificações criadas. Fora de scripts e testes,
+    use ``agendar_broadcast``, que deixa o envio para o worker.
+    """
+    total = 0
+    apos_inscricao_id = 0
+    while True:
+        with transaction.atomic():
+            criadas, apos_inscricao_id = _broadcast_bloco(evento.pk, mensagem, apos_inscricao_id, chunk_size)
+        if not criadas:
+            return total
+        total += criadas
+
+
+def agendar_broadcast(evento, mensagem, tipo=Notificacao.TIPO_AVISO):
+    """Grava no outbox, na transação corrente, o aviso a todos os inscritos do evento.
+
+    O envio fica com o worker, em blocos, fora do ciclo da requisição; se a
+    transação sofrer rollback, o aviso não é enviado. ``tipo`` é gravado nas
+    notificações geradas (ver ``Notificacao.tipo``).
+    """
+    entrada = NotificacaoOutbox.objects.create(
+        tipo=NotificacaoOutbox.TIPO_BROADCAST, evento_id=evento.pk, mensagem=mensagem, tipo_notificacao=tipo
+    )
+    if getattr(settings, "NOTIFICACOES_OUTBOX_INLINE", False):
+        transaction.on_commit(processar_outbox)
+    return entrada
+
+
+def registrar_outbox(inscricao, tipo):
+    """Grava a entrada de outbox na transação corrente da inscrição.
+
+    Se a transação sofrer rollback, a entrada some junto com a inscrição;
+    após o commit o worker é acordado (ou a fila é processada na hora,
+    quando ``NOTIFICACOES_OUTBOX_INLINE`` estiver ligado).
+    """
+    NotificacaoOutbox.objects.create(inscricao_id=inscricao.pk, tipo=tipo, status=inscricao.status)
+    if getattr(settings, "NOTIFICACOES_OUTBOX_INLINE", False):
+        transaction.on_commit(processar_outbox)
+
+
+def processar_outbox(batch_size=500):
+    """Processa um lote do outbox: inscrições pendentes e um bloco de broadcast.
+
+    As entradas são travadas com ``SELECT ... FOR UPDATE SKIP LOCKED`` e
+    marcadas como processadas na mesma transação do ``bulk_create``: vários
+    workers podem rodar em paralelo e um worker reiniciado no meio do lote
+    não gera duplicatas. Retorna a quantidade de entradas processadas ou
+    avançadas (0 quando a fila está vazia).
+    """
+    return _processar_inscricoes(batch_size) + _processar_broadcast(batch_size)
+
+
+def _processar_inscricoes(batch_size):
+    with transaction.atomic():
+        entradas = list(
+            NotificacaoOutbox.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(processado_em__isnull=True)
+            .exclude(tipo=NotificacaoOutbox.TIPO_BROADCAST)
+            .select_related("inscricao__evento", "inscricao__participante")
+            .order_by("id")[:batch_size]
+        )
+        if not entradas:
+            return 0
+
+        notificacoes = []
+        for entrada in entradas:
+            inscricao = entrada.inscricao
+            if entrada.tipo == NotificacaoOutbox.TIPO_INSCRICAO_CANCELADA:
+                mensagens = mensagens_inscricao_cancelada(inscricao)
+            else:
+                mensagens = mensagens_inscricao_criada(inscricao, entrada.status)
+            notificacoes.extend(notificacoes_para_inscricao(inscricao, mensagens))
+
+        criar_notificacoes(notificacoes)
+        NotificacaoOutbox.objects.filter(pk__in=[e.pk for e in entradas]).update(
+            processado_em=timezone.now()
+        )
+    return len(entradas)
+
+
+def _processar_broadcast(batch_size):
+    """Envia o próximo bloco do broadcast pendente mais antigo.
+
+    O bloco e o avanço de ``progresso`` são gravados juntos, então um worker
+    reiniciado continua de onde parou sem repetir avisos.
+    """
+    with transaction.atomic():
+        entrada = (
+            NotificacaoOutbox.objects.select_for_update(skip_locked=True)
+            .filter(processado_em__isnull=True, tipo=NotificacaoOutbox.TIPO_BROADCAST)
+            .order_by("id")
+            .first()
+        )
+        if entrada is None:
+            return 0
+        criadas, entrada.progresso = _broadcast_bloco(
+            entrada.evento_id, entrada.mensagem, entrada.progresso, batch_size, entrada.tipo_notificacao
+        )
+        if criadas < batch_size:
+            entrada.processado_em = timezone.now()
+        entrada.save(update_fields=["progresso", "processado_em"])
+    return 1
@@ -0,0 +1,223 @@
+"""Confirmações de pagamento e expiração das inscrições não pagas.
+
+Cada confirmação traz a inscrição e um ``token`` de idempotência (o id do
+evento no provedor de pagamento). Um lote inteiro é aplicado com poucas
+queries: as inscrições são lidas e bloqueadas de uma vez, as pendentes passam
+a ``confirmada`` com um único ``UPDATE`` e as notificações são criadas em
+lote. Tokens já processados são ignorados, então reenvios do provedor (ou do
+mesmo arquivo) não confirmam nem notificam de novo.
+
+Inscrições que continuam ``pendente`` depois do prazo de pagamento
+(``INSCRICAO_PENDENTE_TTL_MINUTOS``) são canceladas em blocos por
+``expirar_pendentes``, devolvendo as vagas aos eventos.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .cache_eventos import invalidar_catalogo
+from .models import ConfirmacaoPagamento, Evento, Inscricao, Notificacao
+from .notificacoes import criar_notificacoes, mensagem_inscricao_expirada, mensagens_inscricao_criada
+from .series import registrar as registrar_series
+
+# Resultados possíveis de cada confirmação
+CONFIRMADA = "confirmada"
+JA_CONFIRMADA = "ja_confirmada"
+CANCELADA = "cancelada"
+REPETIDA = "repetida"
+NAO_ENCONTRADA = "nao_encontrada"
+INVALIDA = "invalida"
+
+TAMANHO_TOKEN = ConfirmacaoPagamento._meta.get_field("token").max_length
+
+
+def _ler(confirmacao):
+    """(token, inscricao_id) de um item do lote; None se malformado."""
+    if not isinstance(confirmacao, dict):
+        return None
+    token = confirmacao.get("token")
+    inscricao_id = confirmacao.get("inscricao")
+    if not isinstance(token, str) or not token.strip() or len(token.strip()) > TAMANHO_TOKEN:
+        return None
+    if isinstance(inscricao_id, bool):
+        return None
+    try:
+        inscricao_id = int(inscricao_id)
+    except (TypeError, ValueError):
+        return None
+    return token.strip(), inscricao_id
+
+
+def confirmar_pagamentos(confirmacoes, batch_size=1000):
+    """Aplica um lote de confirmações ``[{"token": ..., "inscricao": id}, ...]``.
+
+    Retorna o resultado de cada item (``linha``, ``token``, ``inscricao``,
+    ``resultado``). Só inscrições ``pendente`` são confirmadas; as demais
+    são apenas registradas com o motivo.
+    """
+    resultados = []
+    novos = []
+    tokens_no_lote = set()
+    for linha, confirmacao in enumerate(confirmacoes, start=1):
+        lido = _ler(confirmacao)
+        resultado = {
+            "linha": linha,
+            "token": lido[0] if lido else None,
+            "inscricao": lido[1] if lido else None,
+            "resultado": None,
+        }
+        resultados.append(resultado)
+        if lido is None:
+            resultado["resultado"] = INVALIDA
+        elif lido[0] in tokens_no_lote:
+            resultado["resultado"] = REPETIDA
+        else:
+            tokens_no_lote.add(lido[0])
+            novos.append(resultado)
+    if not novos:
+        return resultados
+
+    with transaction.atomic():
+        processados = set(
+            ConfirmacaoPagamento.objects.filter(token__in=tokens_no_lote).values_list("token", flat=True)
+        )
+        for resultado in novos:
+            if resultado["token"] in processados:
+                resultado["resultado"] = REPETIDA
+        novos = [resultado for resultado in novos if resultado["resultado"] is None]
+
+        # bloqueia as inscrições: cancelamentos e lotes simultâneos esperam
+        inscricoes = {
+            inscricao.pk: inscricao
+            for inscricao in Inscricao.objects.select_for_update(of=("self",))
+            .select_related("evento", "participante")
+            .only(
+                "id", "status", "participante_id", "evento_id", "data_inscricao", "participante__nome",
+                "evento__titulo", "evento__preco", "evento__organizer_id",
+            )
+            .filter(pk__in={resultado["inscricao"] for resultado in novos})
+        }
+        confirmar = {}
+        registros = []
+        for resultado in novos:
+            inscricao = inscricoes.get(resultado["inscricao"])
+            if inscricao is None:
+                resultado["resultado"] = NAO_ENCONTRADA
+                continue
+            if inscricao.status == "pendente" and inscricao.pk not in confirmar:
+                confirmar[inscricao.pk] = inscricao
+                resultado["resultado"] = CONFIRMADA
+            elif inscricao.status == "cancelada":
+                resultado["resultado"] = CANCELADA
+            else:
+                resultado["resultado"] = JA_CONFIRMADA
+            registros.append(ConfirmacaoPagamento(
+                token=resultado["token"], inscricao_id=inscricao.pk, resultado=resultado["resultado"]
+            ))
+
+        # um reenvio simultâneo do mesmo token já pode ter gravado o registro
+        ConfirmacaoPagamento.objects.bulk_create(registros, batch_size=batch_size, ignore_conflicts=True)
+        if confirmar:
+            _confirmar(list(confirmar.values()), batch_size)
+    return resultados
+
+
+def _confirmar(inscricoes, batch_size):
+    Inscricao.objects.filter(pk__in=[i.pk for i in inscricoes], status="pendente").update(
+        status="confirmada", updated_at=timezone.now()
+    )
+    # update() não dispara os signals: séries e notificações são tratadas aqui
+    variacoes = Counter()
+    for inscricao in inscricoes:
+        variacoes[(inscricao.evento_id, inscricao.data_inscricao, "pendente")] -= 1
+        variacoes[(inscricao.evento_id, inscricao.data_inscricao, "confirmada")] += 1
+        inscricao.status = "confirmada"
+    registrar_series(variacoes)
+
+    notificacoes = []
+    por_evento = defaultdict(list)
+    for inscricao in inscricoes:
+        notificacoes.append(Notificacao(
+            participante_id=inscricao.participante_id,
+            evento_id=inscricao.evento_id,
+            mensagem=mensagens_inscricao_criada(inscricao, "confirmada")[0],
+        ))
+        por_evento[inscricao.evento_id].append(inscricao)
+    for evento_inscricoes in por_evento.values():
+        evento = evento_inscricoes[0].evento
+        if evento.organizer_id is not None:
+            # um resumo por evento para o organizador
+            notificacoes.append(Notificacao(
+                organizador_id=evento.organizer_id,
+                evento_id=evento.pk,
+                mensagem=f"💳 {len(evento_inscricoes)} pagamento(s) confirmado(s) no evento '{evento.titulo}'.",
+            ))
+    criar_notificacoes(notificacoes, batch_size=batch_size)
+    invalidar_catalogo()
+
+
+def prazo_pagamento():
+    """Tempo que uma inscrição pode ficar ``pendente`` (``INSCRICAO_PENDENTE_TTL_MINUTOS``)."""
+    return timedelta(minutes=getattr(settings, "INSCRICAO_PENDENTE_TTL_MINUTOS", 24 * 60))
+
+
+def expirar_pendentes(prazo=None, chunk_size=500):
+    """Cancela um bloco de inscrições pendentes há mais que ``prazo``.
+
+    As inscrições são travadas com ``SELECT ... FOR UPDATE SKIP LOCKED`` (o
+    índice parcial de pendentes por ``data_inscricao`` atende o filtro), então
+    vários workers podem rodar juntos e linhas em uso por um cancelamento ou
+    confirmação são deixadas para a próxima rodada. Cada bloco é uma transação
+    curta: um ``UPDATE`` das inscrições e um ``UPDATE`` que devolve as vagas
+    de todos os eventos do bloco. Retorna a quantidade de inscrições expiradas.
+    """
+    limite = timezone.now() - (prazo if prazo is not None else prazo_pagamento())
+    with transaction.atomic():
+        inscricoes = list(
+            Inscricao.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("evento")
+            .only(
+                "id", "status", "participante_id", "evento_id", "data_inscricao",
+                "evento__titulo", "evento__organizer_id",
+            )
+            .filter(status="pendente", data_inscricao__lt=limite)
+            .order_by("data_inscricao", "id")[:chunk_size]
+        )
+        if not inscricoes:
+            return 0
+
+        Inscricao.objects.filter(pk__in=[i.pk for i in inscricoes]).update(status="cancelada", updated_at=timezone.now())
+
+        por_evento = defaultdict(list)
+        for inscricao in inscricoes:
+            por_evento[inscricao.evento_id].append(inscricao)
+        Evento.liberar_vagas({evento_id: len(lista) for evento_id, lista in por_evento.items()})
+
+        variacoes = Counter()
+        for inscricao in inscricoes:
+            variacoes[(inscricao.evento_id, inscricao.data_inscricao, "pendente")] -= 1
+            variacoes[(inscricao.evento_id, inscricao.data_inscricao, "cancelada")] += 1
+        registrar_series(variacoes)
+
+        notificacoes = [
+            Notificacao(
+                participante_id=inscricao.participante_id,
+                evento_id=inscricao.evento_id,
+                mensagem=mensagem_inscricao_expirada(inscricao),
+            )
+            for inscricao in inscricoes
+        ]
+        for lista in por_evento.values():
+            evento = lista[0].evento
+            if evento.organizer_id is not None:
+                notificacoes.append(Notificacao(
+                    organizador_id=evento.organizer_id,
+                    evento_id=evento.pk,
+                    mensagem=f"⌛ {len(lista)} inscrição(ões) pendente(s) expirada(s) sem pagamento no evento '{evento.titulo}'.",
+                ))
+        criar_notificacoes(notificacoes)
+        invalidar_catalogo()
+    return len(inscricoes)
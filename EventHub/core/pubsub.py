@@ -0,0 +1,168 @@
+"""Pub/sub usado para empurrar notificações aos clientes conectados (SSE).
+
+O backend é escolhido por ``PUBSUB_BACKEND`` nas settings:
+
+- ``core.pubsub.InProcessBroker`` (padrão): filas asyncio no próprio processo.
+  Suficiente para um único worker ASGI e para os testes.
+- ``core.pubsub.RedisBroker``: canais do Redis, para vários workers/servidores
+  (requer o pacote ``redis`` e ``PUBSUB_REDIS_URL``).
+"""
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+
+def canal_destinatario(participante_id=None, organizador_id=None):
+    """Nome do canal de notificações de um participante ou organizador."""
+    if organizador_id is not None:
+        return f"notificacoes:organizador:{organizador_id}"
+    return f"notificacoes:participante:{participante_id}"
+
+
+class Assinatura:
+    """Fila de mensagens de um cliente conectado a um canal."""
+
+    def __init__(self, broker, canal):
+        self.broker = broker
+        self.canal = canal
+        self.loop = asyncio.get_running_loop()
+        self.fila = asyncio.Queue()
+
+    async def receber(self, timeout=None):
+        """Próxima mensagem do canal, ou None se o timeout expirar."""
+        try:
+            return await asyncio.wait_for(self.fila.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def fechar(self):
+        self.broker._remover(self)
+
+
+class InProcessBroker:
+    """Broker em memória: cada assinatura é uma ``asyncio.Queue``.
+
+    ``publicar`` pode ser chamado de qualquer thread (views síncronas,
+    signals, workers); a entrega é agendada no event loop de cada assinante.
+    Um cliente ocioso custa apenas uma fila vazia e uma corrotina suspensa.
+    Só alcança os clientes conectados ao mesmo processo.
+    """
+
+    ENTRE_PROCESSOS = False
+
+    def __init__(self):
+        self._assinaturas = defaultdict(set)
+        self._lock = threading.Lock()
+
+    async def assinar(self, canal):
+        assinatura = Assinatura(self, canal)
+        with self._lock:
+            self._assinaturas[canal].add(assinatura)
+        return assinatura
+
+    def _remover(self, assinatura):
+        with self._lock:
+            assinaturas = self._assinaturas.get(assinatura.canal)
+            if assinaturas is not None:
+                assinaturas.discard(assinatura)
+                if not assinaturas:
+                    del self._assinaturas[assinatura.canal]
+
+    def assinantes(self, canal):
+        with self._lock:
+            return len(self._assinaturas.get(canal, ()))
+
+    def publicar(self, canal, mensagem):
+        with self._lock:
+            assinaturas = list(self._assinaturas.get(canal, ()))
+        for assinatura in assinaturas:
+            try:
+                assinatura.loop.call_soon_threadsafe(assinatura.fila.put_nowait, mensagem)
+            except RuntimeError:
+                # event loop já encerrado: cliente desconectado
+                self._remover(assinatura)
+
+
+class _RedisAssinatura:
+    def __init__(self, pubsub, canal):
+        self.pubsub = pubsub
+        self.canal = canal
+
+    async def receber(self, timeout=None):
+        mensagem = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if mensagem is None:
+            return None
+        return json.loads(mensagem["data"])
+
+    async def fechar(self):
+        await self.pubsub.unsubscribe(self.canal)
+        await self.pubsub.aclose()
+
+
+class RedisBroker:
+    """Broker sobre canais do Redis, compartilhado entre processos."""
+
+    ENTRE_PROCESSOS = True
+
+    def __init__(self):
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError as exc:
+            raise ImproperlyConfigured("RedisBroker requer o pacote 'redis'.") from exc
+        url = getattr(settings, "PUBSUB_REDIS_URL", None)
+        if not url:
+            raise ImproperlyConfigured("Defina PUBSUB_REDIS_URL para usar o RedisBroker.")
+        self._cliente = redis.Redis.from_url(url)
+        self._cliente_async = redis.asyncio.Redis.from_url(url)
+
+    async def assinar(self, canal):
+        pubsub = self._cliente_async.pubsub()
+        await pubsub.subscribe(canal)
+        return _RedisAssinatura(pubsub, canal)
+
+    def publicar(self, canal, mensagem):
+        self._cliente.publish(canal, json.dumps(mensagem, default=str))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Instância única (por processo) do backend configurado."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                caminho = getattr(settings, "PUBSUB_BACKEND", "core.pubsub.InProcessBroker")
+                _broker = import_string(caminho)()
+    return _broker
+
+
+def exigir_broker_entre_processos():
+    """Falha (``ImproperlyConfigured``) se o broker não alcança outros processos.
+
+    Usado por quem publica fora do servidor ASGI, como o worker do outbox:
+    com o ``InProcessBroker`` as mensagens ficariam no próprio worker e
+    nenhum cliente conectado seria avisado.
+    """
+    broker = get_broker()
+    if not getattr(broker, "ENTRE_PROCESSOS", True):
+        raise ImproperlyConfigured(
+            f"{type(broker).__name__} não entrega mensagens a outros processos: configure "
+            "PUBSUB_BACKEND=core.pubsub.RedisBroker (e PUBSUB_REDIS_URL) ou ligue "
+            "NOTIFICACOES_OUTBOX_INLINE para processar o outbox no próprio servidor."
+        )
+
+
+def reset_broker():
+    """Descarta a instância atual (usado nos testes ao trocar de backend)."""
+    global _broker
+    with _broker_lock:
+        _broker = None
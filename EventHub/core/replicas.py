@@ -0,0 +1,120 @@
+"""Leituras do catálogo em réplicas, com leitura das próprias escritas.
+
+As réplicas são configuradas por ``DB_REPLICA_URLS`` (aliases em
+``REPLICAS_LEITURA``). Só entram nelas as ações marcadas nas views com
+``acoes_em_replica`` (listagem/detalhe de eventos e organizadores), em
+requisições GET/HEAD/OPTIONS; todo o resto, inclusive a leitura dos usuários
+na autenticação, continua no primário.
+
+Depois de uma escrita bem-sucedida, o usuário lê do primário por
+``REPLICA_STICKY_SEGUNDOS`` (marca no cache, compartilhado entre processos
+quando o cache é o Redis), para não ver a inscrição que acabou de fazer ou
+cancelar com o estado antigo enquanto a réplica não alcança o primário.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+# Réplica escolhida para a requisição corrente (None: primário)
+_replica = ContextVar("replica_leitura", default=None)
+
+
+def replicas():
+    return list(getattr(settings, "REPLICAS_LEITURA", []))
+
+
+def chave_primario(usuario_id):
+    return f"replica:primario:{usuario_id}"
+
+
+def marcar_escrita(usuario_id):
+    """Faz as próximas leituras do usuário irem ao primário durante a janela."""
+    segundos = getattr(settings, "REPLICA_STICKY_SEGUNDOS", 5)
+    if usuario_id is not None and segundos > 0:
+        cache.set(chave_primario(usuario_id), True, segundos)
+
+
+def preso_ao_primario(usuario_id):
+    return usuario_id is not None and bool(cache.get(chave_primario(usuario_id)))
+
+
+def _usuario_do_token(request):
+    """Id do usuário do access token (sem consultar o banco); None se anônimo/inválido."""
+    autenticacao = JWTAuthentication()
+    header = autenticacao.get_header(request)
+    bruto = autenticacao.get_raw_token(header) if header else None
+    if bruto is None:
+        return None
+    try:
+        return autenticacao.get_validated_token(bruto).get(api_settings.USER_ID_CLAIM)
+    except (InvalidToken, TokenError):
+        return None
+
+
+class ReplicaRouter:
+    """Leituras dos modelos do ``core`` vão para a réplica escolhida pelo middleware."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != "core":
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # dentro de uma transação no primário, as leituras ficam nela
+            return None
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        # escrita no meio de uma leitura em réplica: o resto da requisição lê do primário
+        _replica.set(None)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # réplicas têm os mesmos dados do primário
+        bancos = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in bancos and obj2._state.db in bancos:
+            return True
+        return None
+
+
+class ReplicaLeituraMiddleware:
+    """Escolhe o banco das leituras de cada requisição e marca quem escreveu.
+
+    Desligado quando não há réplicas configuradas.
+    """
+
+    def __init__(self, get_response):
+        if not replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        marca = _replica.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica.reset(marca)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            # o DRF grava o usuário autenticado no HttpRequest
+            usuario = getattr(request, "user", None)
+            if usuario is not None and usuario.is_authenticated:
+                marcar_escrita(usuario.pk)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in SAFE_METHODS:
+            return None
+        # ViewSets do DRF: a classe e o mapa método → ação ficam na função da view
+        acao = (getattr(view_func, "actions", None) or {}).get(request.method.lower())
+        if acao not in getattr(getattr(view_func, "cls", None), "acoes_em_replica", ()):
+            return None
+        if preso_ao_primario(_usuario_do_token(request)):
+            return None
+        _replica.set(random.choice(replicas()))
+        return None
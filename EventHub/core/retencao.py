@@ -0,0 +1,195 @@
+"""Política de retenção: arquivamento de notificações e remoção definitiva.
+
+- Notificações lidas mais antigas que ``RETENCAO_NOTIFICACOES_DIAS`` saem de
+  ``core_notificacao`` para ``NotificacaoArquivada`` (ou para um arquivo
+  JSON Lines compactado).
+- Registros com soft delete há mais de ``RETENCAO_EXCLUIDOS_DIAS`` são
+  removidos de vez, começando pelos dependentes (notificações e inscrições de
+  eventos/perfis removidos) para que nenhum ``DELETE`` arraste milhares de
+  linhas em cascata.
+
+Tudo roda em blocos pequenos, cada um na sua transação: as transações são
+curtas, não seguram locks de quem está gravando e o WAL cresce aos poucos.
+"""
+import json
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import (
+    Evento,
+    Inscricao,
+    Notificacao,
+    NotificacaoArquivada,
+    NotificacaoOutbox,
+    Organizador,
+    Participante,
+)
+
+CAMPOS_ARQUIVO = ("id", "mensagem", "participante_id", "organizador_id", "evento_id", "created_at")
+
+
+def prazo_notificacoes():
+    return timedelta(days=getattr(settings, "RETENCAO_NOTIFICACOES_DIAS", 90))
+
+
+def prazo_excluidos():
+    return timedelta(days=getattr(settings, "RETENCAO_EXCLUIDOS_DIAS", 30))
+
+
+def tamanho_medio_linha(modelo):
+    """Bytes médios por linha da tabela segundo as estatísticas do banco (None se indisponível).
+
+    Usado para estimar o espaço liberado; o espaço só volta ao disco depois
+    do VACUUM (PostgreSQL) ou do VACUUM/auto_vacuum (SQLite).
+    """
+    tabela = modelo._meta.db_table
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(
+                    "SELECT pg_relation_size(oid) / NULLIF(reltuples, 0) FROM pg_class WHERE oid = %s::regclass",
+                    [tabela],
+                )
+                linha = cursor.fetchone()
+                return int(linha[0]) if linha and linha[0] is not None and linha[0] > 0 else None
+            if connection.vendor == "sqlite":
+                cursor.execute("SELECT SUM(pgsize) FROM dbstat WHERE name = %s", [tabela])
+                tamanho = cursor.fetchone()[0]
+                linhas = modelo._base_manager.count()
+                return tamanho // linhas if tamanho and linhas else None
+    except Exception:
+        # dbstat não é compilado em todo SQLite; sem estatística não há estimativa
+        return None
+    return None
+
+
+class Relatorio:
+    """Linhas removidas/arquivadas e bytes estimados por tabela."""
+
+    def __init__(self):
+        self.tabelas = {}
+
+    def somar(self, modelo, linhas, bytes_por_linha):
+        atual = self.tabelas.setdefault(modelo._meta.db_table, {"linhas": 0, "bytes": 0})
+        atual["linhas"] += linhas
+        if bytes_por_linha is None or atual["bytes"] is None:
+            atual["bytes"] = None
+        else:
+            atual["bytes"] += linhas * bytes_por_linha
+
+    @property
+    def linhas(self):
+        return sum(t["linhas"] for t in self.tabelas.values())
+
+    @property
+    def bytes(self):
+        valores = [t["bytes"] for t in self.tabelas.values() if t["linhas"]]
+        return None if any(v is None for v in valores) else sum(valores)
+
+
+def _em_blocos(queryset, processar, batch_size, pausa):
+    """Aplica ``processar(ids)`` em blocos de pks de ``queryset``, um commit por bloco.
+
+    Os blocos avançam pela chave primária (keyset), então cada bloco lê só
+    as próximas linhas em vez de varrer de novo o início da tabela.
+    """
+    total = 0
+    ultimo = None
+    while True:
+        pendentes = queryset if ultimo is None else queryset.filter(pk__gt=ultimo)
+        with transaction.atomic():
+            ids = list(pendentes.order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                return total
+            total += processar(ids)
+        ultimo = ids[-1]
+        if pausa:
+            time.sleep(pausa)
+
+
+def arquivar_notificacoes(prazo=None, batch_size=500, destino=None, pausa=0, relatorio=None):
+    """Move as notificações lidas anteriores a ``prazo`` para o arquivo.
+
+    ``destino`` (arquivo texto aberto, ex.: ``gzip.open(..., "wt")``) troca a
+    tabela de arquivo por linhas JSON. Retorna a quantidade arquivada.
+    """
+    limite = timezone.now() - (prazo if prazo is not None else prazo_notificacoes())
+    bytes_por_linha = tamanho_medio_linha(Notificacao)
+    candidatas = Notificacao.objects.filter(is_read=True, created_at__lt=limite)
+
+    def arquivar(ids):
+        linhas = list(
+            Notificacao.objects.select_for_update(skip_locked=True)
+            .filter(pk__in=ids, is_read=True)
+            .values(*CAMPOS_ARQUIVO)
+        )
+        if not linhas:
+            return 0
+        if destino is not None:
+            for linha in linhas:
+                destino.write(json.dumps({**linha, "created_at": linha["created_at"].isoformat()}, ensure_ascii=False) + "\n")
+        else:
+            NotificacaoArquivada.objects.bulk_create(
+                [NotificacaoArquivada(**linha) for linha in linhas], ignore_conflicts=True
+            )
+        removidas, _ = Notificacao.all_objects.filter(pk__in=[linha["id"] for linha in linhas]).delete()
+        return removidas
+
+    total = _em_blocos(candidatas, arquivar, batch_size, pausa)
+    if relatorio is not None:
+        relatorio.somar(Notificacao, total, bytes_por_linha)
+    return total
+
+
+def _excluido(prefixo, limite):
+    return Q(**{f"{prefixo}is_deleted": True, f"{prefixo}deleted_at__lt": limite})
+
+
+def purgar_excluidos(prazo=None, batch_size=500, pausa=0, relatorio=None):
+    """Remove de vez os registros com soft delete anterior a ``prazo``.
+
+    Dependentes primeiro: notificações e inscrições também saem quando o
+    evento ou o perfil a que pertencem será removido (as ainda ativas liberam
+    a vaga e saem das séries antes). Entradas já processadas
+    do outbox mais antigas que o prazo também são removidas. Retorna
+    ``{tabela: linhas}``.
+    """
+    limite = timezone.now() - (prazo if prazo is not None else prazo_excluidos())
+    # uma passada por condição (sem OR entre joins), dependentes antes dos donos
+    etapas = (
+        (Notificacao, ("", "evento__", "participante__", "organizador__")),
+        (NotificacaoOutbox, ("inscricao__", "inscricao__evento__", "inscricao__participante__")),
+        (Inscricao, ("", "evento__", "participante__")),
+        (Evento, ("",)),
+        (Participante, ("",)),
+        (Organizador, ("",)),
+    )
+    removidas = {}
+    for modelo, prefixos in etapas:
+        bytes_por_linha = tamanho_medio_linha(modelo)
+        gerenciador = modelo._base_manager
+        condicoes = [_excluido(prefixo, limite) for prefixo in prefixos]
+        if modelo is NotificacaoOutbox:
+            condicoes.append(Q(processado_em__lt=limite))
+
+        def remover(ids, gerenciador=gerenciador, modelo=modelo):
+            if modelo is Inscricao:
+                # inscrições ainda ativas (de participante excluído, que não cascateia)
+                # passam pelo soft delete antes: devolvem a vaga e saem das séries
+                Inscricao.objects.filter(pk__in=ids).soft_delete()
+            # o delete() do QuerySet apaga de fato (o soft delete é do modelo)
+            _, por_modelo = gerenciador.filter(pk__in=ids).delete()
+            return por_modelo.get(modelo._meta.label, 0)
+
+        total = sum(
+            _em_blocos(gerenciador.filter(condicao), remover, batch_size, pausa) for condicao in condicoes
+        )
+        removidas[modelo._meta.db_table] = total
+        if relatorio is not None:
+            relatorio.somar(modelo, total, bytes_por_linha)
+    return removidas
@@ -0,0 +1,67 @@
+from django.db import connection
+from django.db.models import Q
+
+
+# Configuração de texto do PostgreSQL usada no índice e nas consultas
+SEARCH_CONFIG = "portuguese"
+
+
+def evento_search_vector():
+    """Vetor de busca dos eventos (titulo > descricao > local).
+
+    Precisa ser idêntico à expressão do índice GIN criado na migração
+    0010_evento_search_indexes, senão o PostgreSQL não usa o índice.
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        SearchVector("titulo", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("descricao", weight="B", config=SEARCH_CONFIG)
+        + SearchVector("local", weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def buscar_eventos(queryset, termo):
+    """Filtra e ordena os eventos por relevância para o termo buscado.
+
+    No PostgreSQL usa full-text search (com ranking) e similaridade de
+    trigramas no título para tolerar erros de digitação. Em outros bancos
+    (ex.: SQLite nos testes) faz um filtro simples por ``icontains``.
+    """
+    termo = (termo or "").strip()
+    if not termo:
+        return queryset
+    if connection.vendor == "postgresql":
+        return _buscar_eventos_postgres(queryset, termo)
+    return _buscar_eventos_portavel(queryset, termo)
+
+
+def _buscar_eventos_postgres(queryset, termo):
+    from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+    from django.db.models.functions import Greatest
+
+    vector = evento_search_vector()
+    query = SearchQuery(termo, config=SEARCH_CONFIG, search_type="websearch")
+    return (
+        queryset.annotate(
+            search_vector=vector,
+            search_rank=Greatest(
+                SearchRank(vector, query),
+                TrigramWordSimilarity(termo, "titulo"),
+            ),
+        )
+        # Ambos os predicados são atendidos por índices GIN (bitmap OR)
+        .filter(Q(search_vector=query) | Q(titulo__trigram_word_similar=termo))
+        .order_by("-search_rank", "data_inicio", "id")
+    )
+
+
+def _buscar_eventos_portavel(queryset, termo):
+    # Todas as palavras precisam aparecer em algum dos campos
+    for palavra in termo.split():
+        queryset = queryset.filter(
+            Q(titulo__icontains=palavra)
+            | Q(descricao__icontains=palavra)
+            | Q(local__icontains=palavra)
+        )
+    return queryset.order_by("data_inicio", "id")
@@ -0,0 +1,153 @@
+"""Séries de inscrições por dia e por hora (gráficos do organizador).
+
+``SerieInscricoes`` guarda, por evento, período e status, quantas inscrições
+ativas existem. A tabela é atualizada de forma incremental na mesma transação
+que cria ou altera a inscrição (``registrar``), então os gráficos nunca fazem
+``GROUP BY`` sobre ``core_inscricao``. ``reconstruir`` refaz as séries a partir
+das inscrições (carga inicial, backfill ou correção).
+"""
+from collections import Counter
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .models import Evento, Inscricao, SerieInscricoes
+
+GRANULARIDADES = {
+    SerieInscricoes.DIA: TruncDay,
+    SerieInscricoes.HORA: TruncHour,
+}
+
+STATUS = ("pendente", "confirmada", "cancelada")
+
+# Períodos por instrução (5 parâmetros cada; abaixo do limite do SQLite)
+LINHAS_POR_UPSERT = 150
+
+
+def inicio_do_periodo(momento, granularidade):
+    """Início do dia/hora de ``momento`` no fuso do projeto (mesmo corte do ``Trunc``)."""
+    local = timezone.localtime(momento).replace(minute=0, second=0, microsecond=0)
+    if granularidade == SerieInscricoes.DIA:
+        local = local.replace(hour=0)
+    return local
+
+
+def registrar(variacoes):
+    """Soma as variações ``{(evento_id, data_inscricao, status): delta}`` às séries.
+
+    As variações são agrupadas por período antes de tocar o banco: um lote de
+    milhares de inscrições no mesmo evento vira poucas linhas atualizadas, em
+    uma única instrução no PostgreSQL e no SQLite.
+    """
+    por_periodo = Counter()
+    for (evento_id, data_inscricao, status), delta in variacoes.items():
+        for granularidade in GRANULARIDADES:
+            chave = (evento_id, granularidade, inicio_do_periodo(data_inscricao, granularidade), status)
+            por_periodo[chave] += delta
+
+    linhas = [(*chave, delta) for chave, delta in por_periodo.items() if delta]
+    if not linhas:
+        return
+    if connection.vendor in ("postgresql", "sqlite"):
+        _somar_com_upsert(linhas)
+    else:
+        with transaction.atomic():
+            for linha in linhas:
+                _somar(*linha)
+
+
+def _somar_com_upsert(linhas):
+    """Uma única instrução para todos os períodos (``INSERT ... ON CONFLICT``).
+
+    ``bulk_create(update_conflicts=True)`` substituiria o total em vez de somar.
+    """
+    tabela = connection.ops.quote_name(SerieInscricoes._meta.db_table)
+    with connection.cursor() as cursor:
+        for i in range(0, len(linhas), LINHAS_POR_UPSERT):
+            bloco = linhas[i:i + LINHAS_POR_UPSERT]
+            params = []
+            for evento_id, granularidade, inicio, status, delta in bloco:
+                params += [evento_id, granularidade, connection.ops.adapt_datetimefield_value(inicio), status, delta]
+            cursor.execute(
+                f"INSERT INTO {tabela} (evento_id, granularidade, inicio, status, total) "
+                f"VALUES {', '.join(['(%s, %s, %s, %s, %s)'] * len(bloco))} "
+                f"ON CONFLICT (evento_id, granularidade, inicio, status) "
+                f"DO UPDATE SET total = {tabela}.total + excluded.total",
+                params,
+            )
+
+
+def _somar(evento_id, granularidade, inicio, status, delta):
+    periodo = SerieInscricoes.objects.filter(
+        evento_id=evento_id, granularidade=granularidade, inicio=inicio, status=status
+    )
+    if periodo.update(total=F("total") + delta):
+        return
+    try:
+        with transaction.atomic():
+            SerieInscricoes.objects.create(
+                evento_id=evento_id, granularidade=granularidade, inicio=inicio, status=status, total=delta
+            )
+    except IntegrityError:
+        # outra transação criou o período entre o UPDATE e o INSERT
+        periodo.update(total=F("total") + delta)
+
+
+def variacao_inscricoes(inscricoes, delta=1):
+    """Variações de uma lista de inscrições (ex.: criadas com ``bulk_create``)."""
+    variacoes = Counter()
+    for inscricao in inscricoes:
+        variacoes[(inscricao.evento_id, inscricao.data_inscricao, inscricao.status)] += delta
+    return variacoes
+
+
+def reconstruir(evento_ids=None, eventos_por_bloco=500, batch_size=1000):
+    """Recalcula as séries dos eventos indicados (todos, se ``None``).
+
+    Cada bloco de eventos é refeito em uma transação, com as linhas dos
+    eventos bloqueadas para que inscrições simultâneas esperem a troca.
+    Retorna o número de linhas gravadas.
+    """
+    if evento_ids is None:
+        evento_ids = Evento.all_objects.order_by("pk").values_list("pk", flat=True)
+    evento_ids = list(evento_ids)
+    gravadas = 0
+    for i in range(0, len(evento_ids), eventos_por_bloco):
+        bloco = evento_ids[i:i + eventos_por_bloco]
+        with transaction.atomic():
+            list(Evento.all_objects.select_for_update().filter(pk__in=bloco).values_list("pk", flat=True))
+            SerieInscricoes.objects.filter(evento_id__in=bloco).delete()
+            for granularidade, trunc in GRANULARIDADES.items():
+                linhas = (
+                    Inscricao.objects.filter(evento_id__in=bloco)
+                    .annotate(inicio=trunc("data_inscricao"))
+                    .values("evento_id", "inicio", "status")
+                    .annotate(total=Count("id"))
+                    .order_by()
+                )
+                criadas = SerieInscricoes.objects.bulk_create(
+                    [
+                        SerieInscricoes(granularidade=granularidade, **linha)
+                        for linha in linhas.iterator(chunk_size=batch_size)
+                    ],
+                    batch_size=batch_size,
+                )
+                gravadas += len(criadas)
+    return gravadas
+
+
+def serie_evento(evento_id, granularidade, inicio, fim):
+    """Períodos de ``[inicio, fim)`` com o total por status, lidos só das séries."""
+    return (
+        SerieInscricoes.objects.filter(
+            evento_id=evento_id,
+            granularidade=granularidade,
+            inicio__gte=inicio_do_periodo(inicio, granularidade),
+            inicio__lt=fim,
+        )
+        .values("inicio")
+        .annotate(**{status: Sum("total", filter=Q(status=status), default=0) for status in STATUS})
+        .order_by("inicio")
+    )
@@ -1,82 +1,131 @@
-from django.db.models.signals import post_save
+from collections import Counter
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from .models import Inscricao, Notificacao
-from decimal import Decimal
+from .cache_eventos import invalidar_catalogo
+from .contadores import ajustar_nao_lidas
+from .models import Evento, Inscricao, Notificacao, NotificacaoOutbox
+from .notificacoes import (
+    agendar_broadcast,
+    evento_desativado,
+    mensagem_alteracao_evento,
+    publicar_notificacoes,
+    registrar_outbox,
+)
+from .series import registrar as registrar_series
+
+# Campos do evento cuja alteração é avisada aos inscritos
+CAMPOS_AVISO_EVENTO = ("data_inicio", "local", "is_active", "is_deleted")
+# Campos da inscrição que mudam as séries por período
+CAMPOS_SERIE_INSCRICAO = ("status", "is_deleted")
 
 @receiver(post_save, sender=Inscricao)
 def criar_notificacao_apos_inscricao(sender, instance, created, **kwargs):
     """
-    Cria notificações automaticamente quando uma inscrição é criada ou atualizada.
-    - Evento gratuito (preco = 0): status "confirmada" → mensagem de sucesso
-    - Evento pago (preco > 0): status "pendente" → mensagem de aguardando pagamento
-    - Status "cancelada": notificação de cancelamento
+    Registra no outbox as notificações de uma inscrição criada ou cancelada.
+    As mensagens (evento gratuito/pago, pendente/confirmada, cancelamento)
+    são montadas pelo worker em core.notificacoes, fora da requisição.
     """
     if created:
-        # Determinar se o evento é pago
-        is_evento_pago = instance.evento.preco > Decimal('0.00')
-        
-        # Mensagem para o PARTICIPANTE baseada no status e tipo de evento
-        if instance.status == 'confirmada':
-            if is_evento_pago:
-                mensagem_participante = (
-                    f"✅ Sua inscrição no evento '{instance.evento.titulo}' foi confirmada! "
-                    f"O pagamento foi processado com sucesso."
-                )
-            else:
-                mensagem_participante = (
-                    f"✅ Parabéns! Sua inscrição no evento gratuito '{instance.evento.titulo}' "
-                    f"foi confirmada com sucesso. Aguardamos você!"
-                )
-        elif instance.status == 'pendente':
-            mensagem_participante = (
-                f"⏳ Sua inscrição no evento '{instance.evento.titulo}' foi registrada com status PENDENTE. "
-                f"Verifique seu e-mail para instruções de pagamento (valor: R$ {instance.evento.preco})."
-            )
-        else:  # cancelada (não deve acontecer no created, mas por segurança)
-            mensagem_participante = (
-                f"❌ Sua inscrição no evento '{instance.evento.titulo}' foi cancelada."
-            )
-        
-        # Criar notificação para o participante
-        Notificacao.objects.create(
-            participante=instance.participante,
-            evento=instance.evento,
-            mensagem=mensagem_participante,
-        )
-
-        # Notificação para o ORGANIZADOR (nova inscrição)
-        organizador = getattr(instance.evento, 'organizer', None)
-        if organizador is not None:
-            mensagem_organizador = (
-                f"🎉 Nova inscrição ({instance.status}) recebida no evento '{instance.evento.titulo}' "
-                f"de {instance.participante.nome}."
-            )
-            Notificacao.objects.create(
-                organizador=organizador,
-                evento=instance.evento,
-                mensagem=mensagem_organizador,
-            )
-    else:
+        registrar_outbox(instance, NotificacaoOutbox.TIPO_INSCRICAO_CRIADA)
+    elif instance.status == 'cancelada':
         # Atualização: notificar apenas se mudou para cancelada
-        if instance.status == 'cancelada':
-            # Notificar o participante
-            Notificacao.objects.create(
-                participante=instance.participante,
-                evento=instance.evento,
-                mensagem=(
-                    f"❌ Sua inscrição no evento '{instance.evento.titulo}' foi cancelada. "
-                    f"Você não poderá se inscrever novamente neste evento."
-                ),
-            )
-            
-            # Notificar o organizador
-            organizador = getattr(instance.evento, 'organizer', None)
-            if organizador is not None:
-                Notificacao.objects.create(
-                    organizador=organizador,
-                    evento=instance.evento,
-                    mensagem=(
-                        f"ℹ️ A inscrição de {instance.participante.nome} no evento "
-                        f"'{instance.evento.titulo}' foi cancelada."
-                    ),
-                )
+        registrar_outbox(instance, NotificacaoOutbox.TIPO_INSCRICAO_CANCELADA)
+
+
+@receiver(pre_save, sender=Inscricao)
+def guardar_estado_anterior_inscricao(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Guarda status/situação anteriores para atualizar as séries no post_save."""
+    instance._serie_anterior = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(CAMPOS_SERIE_INSCRICAO):
+        return
+    instance._serie_anterior = (
+        Inscricao.all_objects.filter(pk=instance.pk)
+        .values("evento_id", "data_inscricao", *CAMPOS_SERIE_INSCRICAO)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Inscricao)
+def atualizar_series_inscricao(sender, instance, created, raw=False, **kwargs):
+    """Move a inscrição entre os totais por status das séries (core.series)."""
+    if raw:
+        return
+    variacoes = Counter()
+    if created:
+        if not instance.is_deleted:
+            variacoes[(instance.evento_id, instance.data_inscricao, instance.status)] += 1
+    else:
+        anterior = getattr(instance, "_serie_anterior", None)
+        if not anterior:
+            return
+        chave = (anterior["evento_id"], anterior["data_inscricao"])
+        if not anterior["is_deleted"]:
+            variacoes[(*chave, anterior["status"])] -= 1
+        if not instance.is_deleted:
+            variacoes[(*chave, instance.status)] += 1
+    registrar_series(variacoes)
+
+
+@receiver(pre_save, sender=Evento)
+def guardar_estado_anterior_evento(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Guarda data/local/situação anteriores para detectar mudanças no post_save."""
+    instance._estado_anterior = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(CAMPOS_AVISO_EVENTO):
+        return
+    instance._estado_anterior = (
+        Evento.all_objects.filter(pk=instance.pk).values(*CAMPOS_AVISO_EVENTO).first()
+    )
+
+
+@receiver(post_save, sender=Evento)
+def avisar_inscritos_sobre_alteracao(sender, instance, created, **kwargs):
+    """Avisa os inscritos quando o evento muda de data/local ou é desativado."""
+    anterior = getattr(instance, "_estado_anterior", None)
+    if created or not anterior:
+        return
+    mensagem = mensagem_alteracao_evento(instance, anterior)
+    if mensagem:
+        # Na mesma transação: só é enviado se a alteração for de fato gravada
+        if evento_desativado(instance, anterior):
+            agendar_broadcast(instance, mensagem, Notificacao.TIPO_EVENTO_CANCELADO)
+        else:
+            agendar_broadcast(instance, mensagem)
+
+
+@receiver(post_save, sender=Evento)
+@receiver(post_save, sender=Inscricao)
+@receiver(post_delete, sender=Evento)
+@receiver(post_delete, sender=Inscricao)
+def invalidar_cache_eventos(sender, raw=False, **kwargs):
+    """Descarta as respostas públicas de eventos em cache ao salvar ou remover eventos e inscrições.
+
+    O soft delete é um ``UPDATE`` sem signals: nesse caso quem invalida são os
+    hooks de ``EventoQuerySet`` e ``InscricaoQuerySet``. Excluir participantes
+    ou organizadores não invalida, porque o catálogo não depende disso (os
+    eventos e as inscrições deles continuam como estavam).
+    """
+    if not raw:
+        invalidar_catalogo()
+
+
+@receiver(post_save, sender=Notificacao)
+def publicar_notificacao_criada(sender, instance, created, raw=False, **kwargs):
+    """Atualiza o contador de não lidas e empurra notificações criadas individualmente.
+
+    As criadas em lote são tratadas em criar_notificacoes.
+    """
+    if not created or raw:
+        return
+
+    def apos_commit():
+        if not instance.is_read and not instance.is_deleted:
+            ajustar_nao_lidas(1, instance.participante_id, instance.organizador_id)
+        publicar_notificacoes([instance])
+
+    transaction.on_commit(apos_commit)
@@ -1,3 +1,2292 @@
-from django.test import TestCase
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from io import StringIO
+from decimal import Decimal
+from unittest import skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.test import LiveServerTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import (
+    Evento,
+    Inscricao,
+    Notificacao,
+    NotificacaoArquivada,
+    NotificacaoOutbox,
+    Organizador,
+    Participante,
+    SerieInscricoes,
+)
+from .notificacoes import processar_outbox
+from .pubsub import InProcessBroker, canal_destinatario, get_broker
+
+
+def executar_em_paralelo(caso, funcao, argumentos, max_workers=16):
+    """Chama ``funcao`` para cada argumento em threads (uma conexão cada); retorna os resultados.
+
+    Exige um banco que aceite conexões concorrentes de verdade: o SQLite em
+    memória é compartilhado e recusa escritas simultâneas, então o teste é
+    pulado nele (nos testes o SQLite usa um arquivo, ver ``settings``).
+    """
+    if connection.vendor == "sqlite" and connection.is_in_memory_db():
+        caso.skipTest("concorrência exige PostgreSQL ou SQLite em arquivo")
+
+    def executar(argumento):
+        try:
+            return funcao(argumento)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(executar, argumentos))
+
+
+def criar_organizador(username="org", password=None, **extra):
+    user = User.objects.create_user(username=username, password=password)
+    return Organizador.objects.create(
+        user=user,
+        nome=extra.get("nome", f"Organizador {username}"),
+        email=extra.get("email", f"{username}@example.com"),
+        empresa=extra.get("empresa", "EventHub"),
+    )
+
+
+def criar_participante(username="part", password=None, **extra):
+    user = User.objects.create_user(username=username, password=password)
+    return Participante.objects.create(
+        user=user,
+        nome=extra.get("nome", f"Participante {username}"),
+        email=extra.get("email", f"{username}@example.com"),
+    )
+
+
+def criar_evento(organizador=None, **extra):
+    inicio = extra.pop("data_inicio", timezone.now() + timedelta(days=7))
+    dados = {
+        "titulo": "Evento",
+        "descricao": "Descrição do evento",
+        "data_inicio": inicio,
+        "data_fim": inicio + timedelta(hours=4),
+        "local": "Recife",
+        "capacidade": 100,
+        "preco": Decimal("0.00"),
+    }
+    dados.update(extra)
+    return Evento.objects.create(organizer=organizador, **dados)
+
+
+class EventoListInscricaoStatusTests(TestCase):
+    """isInscrito/inscricaoStatus não devem gerar consultas por evento."""
+
+    def setUp(self):
+        self.organizador = criar_organizador()
+        self.participante = criar_participante()
+        self.client = APIClient()
+        self.client.force_authenticate(self.participante.user)
+        self.url = reverse("api:v1.0:core:evento-list")
+
+    def _criar_eventos(self, quantidade):
+        for i in range(quantidade):
+            evento = criar_evento(self.organizador, titulo=f"Evento {i}")
+            if i % 3 == 0:
+                Inscricao.objects.create(participante=self.participante, evento=evento, status="confirmada")
+            elif i % 3 == 1:
+                Inscricao.objects.create(participante=self.participante, evento=evento, status="cancelada")
+
+    def _contar_queries(self):
+        # Usuário "fresco" a cada requisição, como acontece com o JWT
+        self.client.force_authenticate(User.objects.get(pk=self.participante.user_id))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data["results"]
+
+    def test_numero_de_queries_nao_cresce_com_a_pagina(self):
+        self._criar_eventos(2)
+        poucas, _ = self._contar_queries()
+
+        self._criar_eventos(7)
+        muitas, resultados = self._contar_queries()
+
+        self.assertEqual(len(resultados), 9)
+        self.assertEqual(poucas, muitas)
+        # count + eventos (com status anotado) + papel do usuário (uma query,
+        # só quando o token não traz as claims); sem inscrições na listagem
+        self.assertEqual(muitas, 3)
+
+    def test_status_da_inscricao_por_evento(self):
+        self._criar_eventos(3)
+        _, resultados = self._contar_queries()
+        por_titulo = {e["titulo"]: e for e in resultados}
+
+        self.assertEqual(por_titulo["Evento 0"]["inscricaoStatus"], "confirmada")
+        self.assertTrue(por_titulo["Evento 0"]["isInscrito"])
+        self.assertEqual(por_titulo["Evento 1"]["inscricaoStatus"], "cancelada")
+        self.assertFalse(por_titulo["Evento 1"]["isInscrito"])
+        self.assertIsNone(por_titulo["Evento 2"]["inscricaoStatus"])
+        self.assertFalse(por_titulo["Evento 2"]["isInscrito"])
+
+    def test_anonimo_nao_esta_inscrito(self):
+        self._criar_eventos(1)
+        self.client.force_authenticate(None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["results"][0]["isInscrito"])
+        self.assertIsNone(response.data["results"][0]["inscricaoStatus"])
+
+
+class EventoSearchTests(TestCase):
+    def setUp(self):
+        self.organizador = criar_organizador()
+        self.url = reverse("api:v1.0:core:evento-list")
+        criar_evento(self.organizador, titulo="Workshop de Python", descricao="Django e DRF na prática")
+        criar_evento(self.organizador, titulo="Festival de Música", descricao="Shows ao ar livre", local="Olinda")
+        criar_evento(self.organizador, titulo="Meetup de Dados", descricao="Python para análise de dados")
+
+    def _titulos(self, termo):
+        response = APIClient().get(self.url, {"search": termo})
+        self.assertEqual(response.status_code, 200)
+        return [e["titulo"] for e in response.data["results"]]
+
+    def test_busca_em_titulo_descricao_e_local(self):
+        self.assertCountEqual(self._titulos("python"), ["Workshop de Python", "Meetup de Dados"])
+        self.assertEqual(self._titulos("olinda"), ["Festival de Música"])
+
+    def test_todas_as_palavras_precisam_casar(self):
+        self.assertEqual(self._titulos("python django"), ["Workshop de Python"])
+
+    def test_busca_vazia_retorna_todos(self):
+        self.assertEqual(len(self._titulos("  ")), 3)
+
+    @skipUnless(connection.vendor == "postgresql", "Full-text search exige PostgreSQL")
+    def test_ranking_e_tolerancia_a_erros_de_digitacao(self):
+        # Título pesa mais que descrição no ranking
+        self.assertEqual(self._titulos("python")[0], "Workshop de Python")
+        # Trigramas cobrem erros de digitação no título
+        self.assertIn("Festival de Música", self._titulos("festval"))
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.organizador = criar_organizador()
+        self.participante = criar_participante()
+        self.evento = criar_evento(self.organizador)
+        Notificacao.objects.bulk_create([
+            Notificacao(participante=self.participante, evento=self.evento, mensagem=f"Mensagem {i}")
+            for i in range(20)
+        ])
+        self.client = APIClient()
+        self.client.force_authenticate(self.participante.user)
+        self.url = reverse("api:v1.0:core:notificacao-list")
+
+    def test_paginacao_por_pagina_continua_padrao(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 20)
+        self.assertEqual(len(response.data["results"]), 9)
+
+    def test_cursor_percorre_todos_sem_repetir_e_sem_count(self):
+        ids = []
+        url = self.url + "?paginacao=cursor"
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            self.assertFalse(any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries))
+            ids.extend(n["id"] for n in response.data["results"])
+            url = response.data["next"]
+
+        esperado = list(
+            Notificacao.objects.filter(participante=self.participante)
+            .order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(ids, esperado)
+
+    def test_cursor_na_acao_organizador_de_inscricoes(self):
+        for i in range(12):
+            Inscricao.objects.create(participante=criar_participante(f"p{i}"), evento=self.evento)
+        client = APIClient()
+        client.force_authenticate(self.organizador.user)
+        url = reverse("api:v1.0:core:inscricao-organizador-inscricoes")
+        response = client.get(url, {"paginacao": "cursor"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 9)
+        self.assertIsNotNone(response.data["next"])
+        response = client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertIsNone(response.data["next"])
+
+    def test_cursor_recusado_com_busca(self):
+        # a busca ordena por relevância; o cursor a trocaria por created_at sem avisar
+        url = reverse("api:v1.0:core:evento-list")
+        response = self.client.get(url, {"search": "Evento", "paginacao": "cursor"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("paginacao", response.data)
+        response = self.client.get(url, {"search": "Evento"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("count", response.data)
+
+
+class CapacidadeEventoTests(TestCase):
+    def setUp(self):
+        self.organizador = criar_organizador()
+        self.evento = criar_evento(self.organizador, capacidade=2)
+        self.url = reverse("api:v1.0:core:inscricao-list")
+
+    def _inscrever(self, participante):
+        client = APIClient()
+        client.force_authenticate(participante.user)
+        return client.post(self.url, {"evento": self.evento.pk}, format="json")
+
+    def test_inscricao_respeita_capacidade(self):
+        self.assertEqual(self._inscrever(criar_participante("a")).status_code, 201)
+        self.assertEqual(self._inscrever(criar_participante("b")).status_code, 201)
+        response = self._inscrever(criar_participante("c"))
+        self.assertEqual(response.status_code, 400)
+
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 2)
+        self.assertEqual(self.evento.vagas_restantes, 0)
+        self.assertEqual(Inscricao.objects.filter(evento=self.evento).count(), 2)
+
+    def test_cancelamento_soft_delete_e_restore_mantem_contador(self):
+        participante = criar_participante("a")
+        self._inscrever(participante)
+        inscricao = Inscricao.objects.get(participante=participante)
+
+        inscricao.delete()
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 0)
+        inscricao.delete()  # repetir não libera a vaga de novo
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 0)
+
+        inscricao.restore()
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 1)
+
+        client = APIClient()
+        client.force_authenticate(participante.user)
+        response = client.post(reverse("api:v1.0:core:inscricao-cancel", args=[inscricao.pk]))
+        self.assertEqual(response.status_code, 200)
+        client.post(reverse("api:v1.0:core:inscricao-cancel", args=[inscricao.pk]))
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 0)
+
+    def test_edicao_do_evento_nao_sobrescreve_reservas(self):
+        # instância lida antes das reservas, gravada entre elas
+        desatualizado = Evento.objects.get(pk=self.evento.pk)
+        self.assertTrue(Evento.reservar_vaga(self.evento.pk))
+        desatualizado.titulo = "Novo título"
+        desatualizado.save()
+        self.assertTrue(Evento.reservar_vaga(self.evento.pk))
+        self.evento.refresh_from_db()
+        self.assertEqual((self.evento.titulo, self.evento.vagas_ocupadas), ("Novo título", 2))
+        self.assertFalse(Evento.reservar_vaga(self.evento.pk))
+
+    def test_patch_concorrente_com_inscricao_mantem_contador(self):
+        from unittest import mock
+
+        from .api.v1.serializers import EventoSerializer
+
+        atualizar = EventoSerializer.update
+
+        def reservar_no_meio(serializer, instance, validated_data):
+            # outra requisição inscreve alguém depois do get_object() do PATCH
+            Evento.reservar_vaga(instance.pk)
+            return atualizar(serializer, instance, validated_data)
+
+        client = APIClient()
+        client.force_authenticate(self.organizador.user)
+        url = reverse("api:v1.0:core:evento-detail", args=[self.evento.pk])
+        with mock.patch.object(EventoSerializer, "update", reservar_no_meio):
+            response = client.patch(url, {"local": "Olinda"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.evento.refresh_from_db()
+        self.assertEqual((self.evento.local, self.evento.vagas_ocupadas), ("Olinda", 1))
+
+    def test_evento_expoe_vagas_restantes(self):
+        self._inscrever(criar_participante("a"))
+        response = APIClient().get(reverse("api:v1.0:core:evento-detail", args=[self.evento.pk]))
+        self.assertEqual(response.data["vagas_restantes"], 1)
+        self.assertEqual(response.data["vagas_ocupadas"], 1)
+
+
+class CapacidadeConcorrenciaTests(TransactionTestCase):
+    """Dispara inscrições simultâneas no mesmo evento e verifica que não há overbooking."""
+
+    CAPACIDADE = 25
+    INSCRICOES = 200
+
+    def test_inscricoes_simultaneas_nao_ultrapassam_capacidade(self):
+        organizador = criar_organizador()
+        evento = criar_evento(organizador, capacidade=self.CAPACIDADE)
+        participantes = [criar_participante(f"p{i}") for i in range(self.INSCRICOES)]
+        url = reverse("api:v1.0:core:inscricao-list")
+
+        def inscrever(participante):
+            client = APIClient()
+            client.force_authenticate(participante.user)
+            return client.post(url, {"evento": evento.pk}, format="json").status_code
+
+        resultados = executar_em_paralelo(self, inscrever, participantes)
+
+        evento.refresh_from_db()
+        ativas = Inscricao.objects.filter(evento=evento).exclude(status="cancelada").count()
+        self.assertEqual(resultados.count(201), self.CAPACIDADE)
+        self.assertEqual(resultados.count(400), self.INSCRICOES - self.CAPACIDADE)
+        self.assertEqual(ativas, self.CAPACIDADE)
+        self.assertEqual(evento.vagas_ocupadas, self.CAPACIDADE)
+
+
+class NotificacaoOutboxTests(TestCase):
+    def setUp(self):
+        self.organizador = criar_organizador()
+        self.participante = criar_participante()
+        self.evento = criar_evento(self.organizador, titulo="Conferência")
+
+    def test_inscricao_grava_outbox_sem_criar_notificacoes(self):
+        # INSERT da inscrição + INSERT da entrada no outbox + upsert das séries,
+        # sem carregar evento/organizador/participante nem criar notificações
+        with self.assertNumQueries(3):
+            Inscricao.objects.create(participante=self.participante, evento=self.evento, status="confirmada")
+        self.assertEqual(NotificacaoOutbox.objects.count(), 1)
+        self.assertFalse(Notificacao.objects.exists())
+
+    def test_worker_materializa_em_lote_sem_duplicar(self):
+        inscricao = Inscricao.objects.create(participante=self.participante, evento=self.evento, status="pendente")
+        inscricao.cancelar()
+
+        self.assertEqual(processar_outbox(), 2)
+        self.assertEqual(processar_outbox(), 0)
+
+        self.assertEqual(Notificacao.objects.filter(participante=self.participante).count(), 2)
+        self.assertEqual(Notificacao.objects.filter(organizador=self.organizador).count(), 2)
+        self.assertTrue(
+            Notificacao.objects.filter(participante=self.participante, mensagem__contains="PENDENTE").exists()
+        )
+        self.assertFalse(NotificacaoOutbox.objects.filter(processado_em__isnull=True).exists())
+
+    def test_rollback_descarta_a_entrada(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                Inscricao.objects.create(participante=self.participante, evento=self.evento)
+                raise RuntimeError
+        self.assertFalse(NotificacaoOutbox.objects.exists())
+
+    @override_settings(NOTIFICACOES_OUTBOX_INLINE=True)
+    def test_modo_inline_processa_apos_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Inscricao.objects.create(participante=self.participante, evento=self.evento, status="confirmada")
+        self.assertEqual(Notificacao.objects.count(), 2)
+
+    def test_comando_processa_toda_a_fila(self):
+        for i in range(5):
+            Inscricao.objects.create(participante=criar_participante(f"p{i}"), evento=self.evento)
+        call_command("processar_notificacoes", batch_size=2, sem_push=True, stdout=StringIO())
+        self.assertEqual(Notificacao.objects.count(), 10)
+
+    def test_worker_exige_broker_entre_processos(self):
+        # InProcessBroker (padrão): o worker publicaria só para si mesmo
+        with self.assertRaisesMessage(CommandError, "RedisBroker"):
+            call_command("processar_notificacoes", stdout=StringIO())
+
+
+class BroadcastEventoTests(TestCase):
+    def setUp(self):
+        self.organizador = criar_organizador()
+        self.evento = criar_evento(self.organizador, titulo="Hackathon", local="Recife")
+        self.inscritos = [criar_participante(f"p{i}") for i in range(5)]
+        for participante in self.inscritos:
+            Inscricao.objects.create(participante=participante, evento=self.evento)
+        Inscricao.objects.filter(participante=self.inscritos[0]).update(status="cancelada")
+        NotificacaoOutbox.objects.all().delete()
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizador.user)
+        self.url = reverse("api:v1.0:core:evento-broadcast", args=[self.evento.pk])
+
+    def _mensagens(self):
+        return list(Notificacao.objects.values_list("participante_id", "mensagem"))
+
+    def test_broadcast_para_inscritos_nao_cancelados(self):
+        response = self.client.post(self.url, {"mensagem": "Traga seu notebook"}, format="json")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["destinatarios"], 4)
+        # o envio fica com o worker do outbox
+        self.assertEqual(self._mensagens(), [])
+        processar_outbox()
+        destinatarios = {pid for pid, _ in self._mensagens()}
+        self.assertEqual(destinatarios, {p.pk for p in self.inscritos[1:]})
+
+    def test_broadcast_exige_mensagem_e_dono_do_evento(self):
+        self.assertEqual(self.client.post(self.url, {}, format="json").status_code, 400)
+        outro = APIClient()
+        outro.force_authenticate(criar_organizador("outro").user)
+        self.assertEqual(outro.post(self.url, {"mensagem": "oi"}, format="json").status_code, 404)
+        participante = APIClient()
+        participante.force_authenticate(self.inscritos[1].user)
+        self.assertEqual(participante.post(self.url, {"mensagem": "oi"}, format="json").status_code, 403)
+
+    def test_broadcast_em_blocos_com_queries_limitadas(self):
+        from .notificacoes import broadcast_evento
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(broadcast_evento(self.evento, "oi", chunk_size=2), 4)
+        sqls = [q["sql"] for q in ctx.captured_queries]
+        # 1 SELECT + 1 INSERT por bloco de 2 (4 inscritos → 2 blocos) e o SELECT vazio do fim
+        self.assertEqual(sum(sql.startswith("SELECT") for sql in sqls), 3)
+        self.assertEqual(sum(sql.startswith("INSERT") for sql in sqls), 2)
+
+    def test_worker_envia_broadcast_em_blocos_sem_repetir(self):
+        from .notificacoes import agendar_broadcast
+
+        entrada = agendar_broadcast(self.evento, "oi")
+        self.assertEqual(processar_outbox(batch_size=3), 1)
+        entrada.refresh_from_db()
+        self.assertEqual(len(self._mensagens()), 3)
+        self.assertIsNone(entrada.processado_em)
+        # último bloco (incompleto) encerra a entrada; depois a fila fica vazia
+        self.assertEqual(processar_outbox(batch_size=3), 1)
+        self.assertEqual(processar_outbox(batch_size=3), 0)
+        entrada.refresh_from_db()
+        self.assertIsNotNone(entrada.processado_em)
+        destinatarios = [pid for pid, _ in self._mensagens()]
+        self.assertCountEqual(destinatarios, [p.pk for p in self.inscritos[1:]])
+
+    def test_alteracao_de_local_e_data_avisa_inscritos(self):
+        self.evento.local = "Olinda"
+        self.evento.save()
+        self.assertEqual(self._mensagens(), [])
+        processar_outbox()
+        mensagens = self._mensagens()
+        self.assertEqual(len(mensagens), 4)
+        self.assertIn("novo local: Olinda", mensagens[0][1])
+
+    def test_desativacao_avisa_inscritos_e_titulo_nao(self):
+        self.evento.titulo = "Hackathon 2026"
+        self.evento.save()
+        processar_outbox()
+        self.assertEqual(self._mensagens(), [])
+
+        self.evento.is_active = False
+        self.evento.save()
+        processar_outbox()
+        mensagens = self._mensagens()
+        self.assertEqual(len(mensagens), 4)
+        self.assertIn("cancelado", mensagens[0][1])
+
+
+class InProcessBrokerTests(TestCase):
+    async def test_publicacao_de_outra_thread_chega_ao_assinante(self):
+        broker = InProcessBroker()
+        assinatura = await broker.assinar("canal")
+        outra = await broker.assinar("outro")
+
+        await asyncio.get_running_loop().run_in_executor(None, broker.publicar, "canal", {"n": 1})
+        self.assertEqual(await assinatura.receber(timeout=1), {"n": 1})
+        self.assertIsNone(await outra.receber(timeout=0.05))
+
+        await assinatura.fechar()
+        await outra.fechar()
+        self.assertEqual(broker.assinantes("canal"), 0)
+
+
+class NotificacoesStreamTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador()
+        self.participante = criar_participante()
+        self.evento = criar_evento(self.organizador)
+        Notificacao.objects.create(participante=self.participante, evento=self.evento, mensagem="antiga")
+        self.url = reverse("api:v1.0:core:notificacao-stream")
+
+    def _token(self, user):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        return str(AccessToken.for_user(user))
+
+    def _ticket(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post(reverse("api:v1.0:core:notificacao-stream-ticket"))
+        self.assertEqual(response.status_code, 201)
+        return response.data["ticket"]
+
+    @staticmethod
+    async def _proximo_evento(stream):
+        while True:
+            chunk = await asyncio.wait_for(anext(stream), timeout=2)
+            chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+            if chunk.startswith("event:"):
+                nome, dados = chunk.strip().split("\n")
+                return nome.split(": ", 1)[1], json.loads(dados.split(": ", 1)[1])
+
+    async def test_stream_exige_token_valido(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get(self.url, {"ticket": "invalido"})
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get(self.url, headers={"Authorization": "Bearer invalido"})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_access_token_na_url_nao_e_aceito(self):
+        token = await asyncio.to_thread(self._token, self.participante.user)
+        response = await self.async_client.get(self.url, {"token": token})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_ticket_vale_uma_conexao(self):
+        from .api.v1.stream import _consumir_ticket
+
+        ticket = await sync_to_async(self._ticket)(self.participante.user)
+        self.assertEqual(await _consumir_ticket(ticket), {"participante_id": self.participante.pk})
+        response = await self.async_client.get(self.url, {"ticket": ticket})
+        self.assertEqual(response.status_code, 401)
+
+    def test_ticket_exige_autenticacao(self):
+        response = APIClient().post(reverse("api:v1.0:core:notificacao-stream-ticket"))
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_envia_unread_inicial_e_novas_notificacoes(self):
+        ticket = await sync_to_async(self._ticket)(self.participante.user)
+        response = await self.async_client.get(self.url, {"ticket": ticket})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+
+        nome, dados = await self._proximo_evento(stream)
+        self.assertEqual((nome, dados["unread"]), ("unread", 1))
+
+        canal = canal_destinatario(participante_id=self.participante.pk)
+        get_broker().publicar(canal, {"tipo": "notificacao", "notificacao": {"id": 99, "mensagem": "nova"}})
+        nome, dados = await self._proximo_evento(stream)
+        self.assertEqual(nome, "notificacao")
+        self.assertEqual(dados["notificacao"]["mensagem"], "nova")
+
+        # Desconexão do cliente: o servidor ASGI cancela a task do stream
+        pendente = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+        pendente.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pendente
+        self.assertEqual(get_broker().assinantes(canal), 0)
+
+    def test_notificacoes_criadas_sao_publicadas_apos_commit(self):
+        from .notificacoes import criar_notificacoes
+
+        publicadas = []
+        broker = get_broker()
+        original = broker.publicar
+        broker.publicar = lambda canal, mensagem: publicadas.append((canal, mensagem))
+        try:
+            with self.captureOnCommitCallbacks(execute=True):
+                Notificacao.objects.create(participante=self.participante, evento=self.evento, mensagem="uma")
+                criar_notificacoes([
+                    Notificacao(organizador=self.organizador, evento=self.evento, mensagem="lote"),
+                ])
+                self.assertEqual(publicadas, [])
+        finally:
+            broker.publicar = original
+
+        self.assertEqual(
+            [(canal, m["notificacao"]["mensagem"]) for canal, m in publicadas],
+            [
+                (canal_destinatario(participante_id=self.participante.pk), "uma"),
+                (canal_destinatario(organizador_id=self.organizador.pk), "lote"),
+            ],
+        )
+
+
+class ContadorNaoLidasTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador()
+        self.participante = criar_participante()
+        self.evento = criar_evento(self.organizador)
+        self.client = APIClient()
+        self.client.force_authenticate(self.participante.user)
+        self.url = reverse("api:v1.0:core:notificacao-unread-count")
+
+    def _notificar(self, **extra):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Notificacao.objects.create(
+                participante=self.participante, evento=self.evento, mensagem="oi", **extra
+            )
+
+    def _unread(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.data["unread"]
+
+    def _queries_em_notificacao(self):
+        with CaptureQueriesContext(connection) as ctx:
+            unread = self._unread()
+        return unread, [q["sql"] for q in ctx.captured_queries if "core_notificacao" in q["sql"]]
+
+    def test_unread_count_nao_consulta_notificacoes_com_cache_quente(self):
+        self._notificar()
+        self.assertEqual(self._unread(), 1)  # aquece o cache
+
+        self._notificar()
+        unread, queries = self._queries_em_notificacao()
+        self.assertEqual(unread, 2)
+        self.assertEqual(queries, [])
+
+    def test_marcar_lida_e_soft_delete_decrementam(self):
+        primeira = self._notificar()
+        segunda = self._notificar()
+        self._notificar(is_read=True)
+        self.assertEqual(self._unread(), 2)
+
+        url = reverse("api:v1.0:core:notificacao-mark-read", args=[primeira.pk])
+        self.client.post(url)
+        self.client.post(url)  # repetir não decrementa de novo
+        with self.captureOnCommitCallbacks(execute=True):
+            segunda.delete()
+
+        unread, queries = self._queries_em_notificacao()
+        self.assertEqual((unread, queries), (0, []))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            segunda.restore()
+        self.assertEqual(self._unread(), 1)
+
+    def test_soft_delete_desfeito_nao_altera_contador(self):
+        self._notificar()
+        self.assertEqual(self._unread(), 1)
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                Notificacao.objects.filter(participante=self.participante).soft_delete()
+                raise RuntimeError("rollback")
+        self.assertEqual(self._unread(), 1)
+
+    def test_insercao_em_lote_invalida_e_reconstroi(self):
+        from .notificacoes import criar_notificacoes
+
+        self.assertEqual(self._unread(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            criar_notificacoes([
+                Notificacao(participante=self.participante, evento=self.evento, mensagem=str(i))
+                for i in range(3)
+            ])
+        self.assertEqual(self._unread(), 3)
+
+    def test_reparo_corrige_divergencia(self):
+        self._notificar()
+        self._unread()
+        cache.set(f"unread:participante:{self.participante.pk}", 42)
+        call_command("reconstruir_contadores", stdout=StringIO())
+        self.assertEqual(self._unread(), 1)
+
+
+class MarcarLidasEmLoteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador()
+        self.participante = criar_participante()
+        self.outro = criar_participante("outro")
+        self.evento = criar_evento(self.organizador)
+        self.minhas = Notificacao.objects.bulk_create([
+            Notificacao(participante=self.participante, evento=self.evento, mensagem=str(i))
+            for i in range(5)
+        ])
+        self.alheia = Notificacao.objects.create(participante=self.outro, evento=self.evento, mensagem="x")
+        self.client = APIClient()
+        self.client.force_authenticate(self.participante.user)
+
+    def _nao_lidas(self, participante):
+        return Notificacao.objects.filter(participante=participante, is_read=False).count()
+
+    def test_mark_all_read_em_um_update(self):
+        url = reverse("api:v1.0:core:notificacao-mark-all-read")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(url)
+        self.assertEqual(response.data, {"marcadas": 5})
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self._nao_lidas(self.participante), 0)
+        self.assertEqual(self._nao_lidas(self.outro), 1)
+
+        self.assertEqual(self.client.post(url).data, {"marcadas": 0})
+
+    def test_mark_read_lista_ignora_ids_de_outros_usuarios(self):
+        url = reverse("api:v1.0:core:notificacao-mark-read-lista")
+        ids = [self.minhas[0].pk, self.minhas[1].pk, self.alheia.pk]
+        response = self.client.post(url, {"ids": ids}, format="json")
+        self.assertEqual(response.data, {"marcadas": 2})
+        self.assertEqual(self._nao_lidas(self.participante), 3)
+        self.assertEqual(self._nao_lidas(self.outro), 1)
+
+        self.assertEqual(self.client.post(url, {"ids": "1"}, format="json").status_code, 400)
+
+    def test_contador_acompanha_atualizacao_em_lote(self):
+        from .contadores import obter_nao_lidas
+
+        self.assertEqual(obter_nao_lidas(participante_id=self.participante.pk), 5)
+        self.client.post(
+            reverse("api:v1.0:core:notificacao-mark-read-lista"),
+            {"ids": [self.minhas[0].pk]},
+            format="json",
+        )
+        self.assertEqual(cache.get(f"unread:participante:{self.participante.pk}"), 4)
+
+
+class EventoCacheCondicionalTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador()
+        self.evento = criar_evento(self.organizador, titulo="Meetup", capacidade=10)
+        self.client = APIClient()
+        self.list_url = reverse("api:v1.0:core:evento-list")
+        self.detail_url = reverse("api:v1.0:core:evento-detail", args=[self.evento.pk])
+
+    def test_etag_gera_304_na_listagem_e_no_detalhe(self):
+        for url in (self.list_url, self.detail_url):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("ETag", response)
+            self.assertIn("Last-Modified", response)
+
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+            self.assertEqual(response.status_code, 304)
+
+    def test_acerto_no_cache_anonimo_nao_consulta_o_banco(self):
+        primeira = self.client.get(self.list_url, {"page": 1})
+        with self.assertNumQueries(0):
+            segunda = self.client.get(self.list_url, {"page": 1})
+        self.assertEqual(segunda.status_code, 200)
+        self.assertEqual(segunda.content, primeira.content)
+        self.assertEqual(segunda["ETag"], primeira["ETag"])
+
+        self.client.get(self.detail_url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.detail_url).status_code, 200)
+
+    def test_query_string_diferente_usa_outra_entrada(self):
+        criar_evento(self.organizador, titulo="Workshop Django")
+        todos = self.client.get(self.list_url).json()
+        filtrados = self.client.get(self.list_url, {"search": "django"}).json()
+        self.assertEqual(len(todos["results"]), 2)
+        self.assertEqual([e["titulo"] for e in filtrados["results"]], ["Workshop Django"])
+
+    def test_gravacoes_invalidam_o_cache(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        participante = criar_participante()
+        Inscricao.objects.create(participante=participante, evento=self.evento, status="confirmada")
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["total_inscricoes"], 1)
+
+        self.evento.delete()  # soft delete
+        self.assertEqual(self.client.get(self.detail_url).status_code, 404)
+        self.assertEqual(self.client.get(self.list_url).json()["results"], [])
+
+    def test_autenticado_recebe_etag_mas_nao_usa_o_cache_compartilhado(self):
+        self.client.get(self.list_url)
+        participante = criar_participante()
+        self.client.force_authenticate(participante.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.list_url)
+        self.assertTrue(ctx.captured_queries)
+        self.assertIn("ETag", response)
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+
+class EventoQuerysetPorAcaoTests(TestCase):
+    """Cada ação do EventoViewSet carrega só o que o serializer usa."""
+
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador()
+        self.eventos = [
+            criar_evento(self.organizador, titulo=f"Evento {i}", descricao="x" * 5000, capacidade=50)
+            for i in range(9)
+        ]
+        for i in range(20):
+            participante = criar_participante(f"p{i}")
+            Inscricao.objects.create(participante=participante, evento=self.eventos[0], status="confirmada")
+        self.client = APIClient()
+
+    def _queries(self, metodo, url, **kwargs):
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, metodo)(url, **kwargs)
+        sqls = [q["sql"] for q in ctx.captured_queries if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+        return response, sqls
+
+    def test_listagem_mantem_descricao_completa_por_padrao(self):
+        response, sqls = self._queries("get", reverse("api:v1.0:core:evento-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(sqls), 2)
+        self.assertFalse(any("core_inscricao" in sql for sql in sqls))
+        resultados = response.json()["results"]
+        self.assertTrue(all(e["descricao"] == "x" * 5000 for e in resultados))
+        self.assertNotIn("descricao_resumo", resultados[0])
+        self.assertNotIn("inscricoes", resultados[0])
+
+    def test_listagem_sem_inscricoes_e_com_descricao_resumida(self):
+        response, sqls = self._queries("get", reverse("api:v1.0:core:evento-list"), data={"resumo": "1"})
+        self.assertEqual(response.status_code, 200)
+        # count + página de eventos (organizador via JOIN)
+        self.assertEqual(len(sqls), 2)
+        self.assertFalse(any("core_inscricao" in sql for sql in sqls))
+        # só o resumo (SUBSTR/LEFT) da descrição é lido
+        self.assertNotRegex(sqls[1].split(" FROM ")[0], r'(?<!\()"core_evento"\."descricao"')
+
+        resultados = response.json()["results"]
+        self.assertEqual(len(resultados), 9)
+        self.assertTrue(all(len(e["descricao_resumo"]) == 200 for e in resultados))
+        self.assertNotIn("descricao", resultados[0])
+        self.assertNotIn("inscricoes", resultados[0])
+        # 9 eventos com 5.000 caracteres de descrição cada
+        self.assertLess(len(response.content), 9 * 1000)
+
+    def test_detalhe_com_inscricoes_e_total_por_count(self):
+        url = reverse("api:v1.0:core:evento-detail", args=[self.eventos[0].pk])
+        response, sqls = self._queries("get", url)
+        self.assertEqual(response.status_code, 200)
+        # evento (com COUNT das inscrições) + inscrições com participantes
+        self.assertEqual(len(sqls), 2)
+        self.assertIn("COUNT(", sqls[0])
+        dados = response.json()
+        self.assertEqual(dados["total_inscricoes"], 20)
+        self.assertEqual(len(dados["inscricoes"]), 20)
+        self.assertEqual(len(dados["descricao"]), 5000)
+
+    def test_escritas_nao_carregam_inscricoes(self):
+        self.client.force_authenticate(User.objects.get(pk=self.organizador.user_id))
+        url = reverse("api:v1.0:core:evento-detail", args=[self.eventos[0].pk])
+        response, sqls = self._queries("patch", url, data={"titulo": "Novo"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any("core_inscricao" in sql and sql.startswith("SELECT") for sql in sqls))
+        self.assertNotIn("inscricoes", response.json())
+        self.assertLess(len(response.content), 6000)
+
+
+class PlanoDeConsultaIndicesTests(TestCase):
+    """Roda EXPLAIN nas queries dos endpoints principais sobre uma base grande.
+
+    Falha se alguma delas varrer sequencialmente uma tabela do app
+    (``Seq Scan`` no PostgreSQL, ``SCAN <tabela>`` sem índice no SQLite).
+    """
+
+    ORGANIZADORES = 50
+    EVENTOS_POR_ORGANIZADOR = 20
+    PARTICIPANTES = 2000
+    INSCRICOES_POR_PARTICIPANTE = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        agora = timezone.now()
+        total_eventos = cls.ORGANIZADORES * cls.EVENTOS_POR_ORGANIZADOR
+
+        users = User.objects.bulk_create(
+            [User(username=f"org{i}", password="!") for i in range(cls.ORGANIZADORES)]
+            + [User(username=f"part{i}", password="!") for i in range(cls.PARTICIPANTES)]
+        )
+        organizadores = Organizador.objects.bulk_create(
+            Organizador(user=u, nome=u.username, email=f"{u.username}@example.com", empresa="EventHub")
+            for u in users[: cls.ORGANIZADORES]
+        )
+        participantes = Participante.objects.bulk_create(
+            Participante(user=u, nome=u.username, email=f"{u.username}@example.com")
+            for u in users[cls.ORGANIZADORES:]
+        )
+        eventos = Evento.objects.bulk_create(
+            Evento(
+                titulo=f"Evento {i}",
+                descricao="Descrição",
+                data_inicio=agora + timedelta(hours=i),
+                data_fim=agora + timedelta(hours=i + 2),
+                local="Recife",
+                capacidade=1000,
+                organizer=organizadores[i % cls.ORGANIZADORES],
+                is_deleted=i % 10 == 0,
+            )
+            for i in range(total_eventos)
+        )
+        inscricoes = Inscricao.objects.bulk_create(
+            (
+                Inscricao(
+                    participante=p,
+                    evento=eventos[(i * 7 + k * 13) % total_eventos],
+                    status=("confirmada", "pendente", "cancelada")[(i + k) % 3],
+                )
+                for i, p in enumerate(participantes)
+                for k in range(cls.INSCRICOES_POR_PARTICIPANTE)
+            ),
+            batch_size=2000,
+        )
+        Notificacao.objects.bulk_create(
+            (
+                Notificacao(
+                    participante_id=i.participante_id if n % 2 else None,
+                    organizador_id=None if n % 2 else i.evento.organizer_id,
+                    evento_id=i.evento_id,
+                    mensagem="Notificação",
+                    is_read=n % 4 < 2,
+                )
+                for n, i in enumerate(inscricoes)
+            ),
+            batch_size=2000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        cls.organizador = organizadores[3]
+        cls.participante = participantes[42]
+        cls.evento = eventos[3 + cls.ORGANIZADORES]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def _plano(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(f"EXPLAIN {sql}")
+                return [linha[0] for linha in cursor.fetchall()]
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return [linha[-1] for linha in cursor.fetchall()]
+
+    @staticmethod
+    def _varredura_sequencial(linha):
+        if connection.vendor == "postgresql":
+            return "Seq Scan on core_" in linha
+        return linha.startswith("SCAN core_") and " USING " not in linha
+
+    def _assert_sem_seq_scan(self, user, metodo, url, tabelas, **kwargs):
+        self.client.force_authenticate(User.objects.get(pk=user.pk))
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, metodo)(url, **kwargs)
+        self.assertLess(response.status_code, 400)
+        sqls = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].startswith(("SELECT", "UPDATE")) and any(f'"{t}"' in q["sql"] for t in tabelas)
+        ]
+        self.assertTrue(sqls, "nenhuma query nas tabelas verificadas")
+        for sql in sqls:
+            plano = self._plano(sql)
+            self.assertFalse(
+                any(self._varredura_sequencial(linha) for linha in plano),
+                "varredura sequencial em:\n%s\n%s" % (sql, "\n".join(plano)),
+            )
+
+    def test_eventos_do_organizador(self):
+        self._assert_sem_seq_scan(
+            self.organizador.user, "get", reverse("api:v1.0:core:evento-list"), ["core_evento"]
+        )
+
+    def test_inscricoes_do_evento_por_status(self):
+        self._assert_sem_seq_scan(
+            self.organizador.user,
+            "get",
+            reverse("api:v1.0:core:inscricao-list"),
+            ["core_inscricao"],
+            data={"evento": self.evento.pk, "status": "confirmada"},
+        )
+
+    def test_inscricoes_do_participante(self):
+        self._assert_sem_seq_scan(
+            self.participante.user, "get", reverse("api:v1.0:core:inscricao-list"), ["core_inscricao"]
+        )
+
+    def test_inscricao_em_lote_por_email(self):
+        evento = Evento.objects.filter(organizer=self.organizador).order_by("pk").first()
+        self._assert_sem_seq_scan(
+            self.organizador.user,
+            "post",
+            reverse("api:v1.0:core:evento-inscricoes-lote", args=[evento.pk]),
+            ["core_participante"],
+            data={"participantes": [self.participante.email.upper()]},
+            format="json",
+        )
+
+    def test_contagem_de_nao_lidas(self):
+        url = reverse("api:v1.0:core:notificacao-unread-count")
+        self._assert_sem_seq_scan(self.participante.user, "get", url, ["core_notificacao"])
+        self._assert_sem_seq_scan(self.organizador.user, "get", url, ["core_notificacao"])
+
+    def test_marcar_todas_como_lidas(self):
+        url = reverse("api:v1.0:core:notificacao-mark-all-read")
+        self._assert_sem_seq_scan(self.participante.user, "post", url, ["core_notificacao"])
+        self._assert_sem_seq_scan(self.organizador.user, "post", url, ["core_notificacao"])
+
+    def test_notificacoes_do_destinatario(self):
+        self._assert_sem_seq_scan(
+            self.participante.user, "get", reverse("api:v1.0:core:notificacao-list"), ["core_notificacao"]
+        )
+
+
+class PerfilNoTokenTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador(password="senha-forte-123")
+        self.participante = criar_participante(password="senha-forte-123")
+        self.evento = criar_evento(self.organizador)
+        Inscricao.objects.create(participante=self.participante, evento=self.evento, status="confirmada")
+        self.client = APIClient()
+
+    def _token(self, username):
+        response = self.client.post(
+            reverse("token_obtain_pair"), {"username": username, "password": "senha-forte-123"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def _get(self, url, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        return response, self._consultas_de_papel(ctx)
+
+    @staticmethod
+    def _consultas_de_papel(ctx):
+        """Buscas do perfil do usuário: user.participante/organizador ou o JOIN a partir de auth_user."""
+        return [
+            q["sql"] for q in ctx.captured_queries
+            if '"core_participante"."user_id" =' in q["sql"]
+            or '"core_organizador"."user_id" =' in q["sql"]
+            or ('FROM "auth_user"' in q["sql"] and '"core_organizador"' in q["sql"])
+        ]
+
+    def test_claims_de_papel_no_access_token(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        access = AccessToken(self._token("part")["access"])
+        self.assertEqual(access["role"], "participante")
+        self.assertEqual(access["participante_id"], self.participante.pk)
+        self.assertIsNone(access["organizador_id"])
+
+        refresh = self._token("org")["refresh"]
+        response = self.client.post(reverse("token_refresh"), {"refresh": refresh}, format="json")
+        access = AccessToken(response.data["access"])
+        self.assertEqual(access["role"], "organizador")
+        self.assertEqual(access["organizador_id"], self.organizador.pk)
+
+    def test_leituras_autorizam_sem_buscar_o_perfil(self):
+        access = self._token("part")["access"]
+        response, perfis = self._get(reverse("api:v1.0:core:evento-list"), access)
+        self.assertEqual(response.data["results"][0]["inscricaoStatus"], "confirmada")
+        self.assertEqual(perfis, [])
+
+        response, perfis = self._get(reverse("api:v1.0:core:auth-me"), access)
+        self.assertEqual(response.data["user"]["participante_id"], self.participante.pk)
+        self.assertEqual(perfis, [])
+
+        access = self._token("org")["access"]
+        response, perfis = self._get(reverse("api:v1.0:core:inscricao-organizador-inscricoes"), access)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(perfis, [])
+
+    def test_token_sem_claims_consulta_o_papel_uma_vez(self):
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        access = str(RefreshToken.for_user(self.participante.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("api:v1.0:core:inscricao-list"))
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(len(self._consultas_de_papel(ctx)), 1)
+
+    def test_escritas_do_organizador_usam_o_papel_do_token(self):
+        access = self._token("org")["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse("api:v1.0:core:evento-list"), {
+                "titulo": "Novo", "descricao": "Desc", "local": "Recife", "capacidade": 10, "preco": "0.00",
+                "data_inicio": "2030-01-10 19:00:00", "data_fim": "2030-01-10 22:00:00",
+            }, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["organizer"], self.organizador.pk)
+        self.assertEqual(self._consultas_de_papel(ctx), [])
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                reverse("api:v1.0:core:organizador-list"), {"nome": "Outro", "email": "outro@example.com"}, format="json"
+            )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._consultas_de_papel(ctx), [])
+
+    def test_token_sem_papel_consulta_o_banco_e_refresh_rele_o_papel(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        from .api.v1.authentication import PerfilRefreshToken
+
+        # token emitido antes de o usuário criar o perfil de organizador
+        user = User.objects.create_user("novo", password="senha-forte-123")
+        refresh = PerfilRefreshToken.for_user(user)
+        self.assertIsNone(refresh["role"])
+        organizador = Organizador.objects.create(user=user, nome="Novo", email="novo@example.com")
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        response = self.client.get(reverse("api:v1.0:core:inscricao-organizador-inscricoes"))
+        self.assertEqual(response.status_code, 200)
+
+        self.client.credentials()
+        response = self.client.post(reverse("token_refresh"), {"refresh": str(refresh)}, format="json")
+        access = AccessToken(response.data["access"])
+        self.assertEqual((access["role"], access["organizador_id"]), ("organizador", organizador.pk))
+
+
+class QueryMetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        criar_evento(criar_organizador())
+
+    @override_settings(QUERY_METRICS=True)
+    def test_server_timing_com_total_de_queries(self):
+        response = APIClient().get(reverse("api:v1.0:core:evento-list"))
+        self.assertRegex(response["Server-Timing"], r'^db;dur=[\d.]+;desc="2 queries"$')
+
+    @override_settings(QUERY_METRICS=False)
+    def test_desligado_fora_de_debug_e_staging(self):
+        response = APIClient().get(reverse("api:v1.0:core:evento-list"))
+        self.assertNotIn("Server-Timing", response)
+
+    def test_queries_de_mesmo_formato_sao_agrupadas(self):
+        from .middleware import ColetorQueries
+
+        eventos = list(Evento.objects.all()) + [criar_evento(titulo="Outro") for _ in range(2)]
+        with ColetorQueries() as coletor:
+            for evento in eventos:
+                Evento.objects.filter(pk=evento.pk, titulo__in=[evento.titulo, "x"][: evento.pk % 2 + 1]).exists()
+            Evento.objects.count()
+        self.assertEqual(coletor.total, 4)
+        self.assertEqual(list(coletor.repetidas(limite=3).values()), [3])
+
+
+class OrcamentoQueriesTests(TestCase):
+    """Orçamento de queries de cada rota GET de /api/v1/.
+
+    Cada rota é chamada com a base pequena e depois maior: o total não pode
+    passar do orçamento declarado nem repetir o mesmo formato de query (N+1).
+    Rotas novas precisam entrar em ORCAMENTO (ou em SEM_ORCAMENTO, com o motivo).
+    """
+
+    # rota: (quem chama, máximo de queries). O perfil do usuário custa 1 query.
+    ORCAMENTO = {
+        "api-root": (None, 0),
+        "evento-list": ("participante", 3),
+        "evento-detail": ("participante", 3),
+        "evento-inscricoes-exportar": ("organizador", 3),
+        "evento-dashboard": ("organizador", 2),
+        "evento-inscricoes-serie": ("organizador", 3),
+        "inscricao-list": ("participante", 3),
+        "inscricao-detail": ("participante", 2),
+        "inscricao-organizador-inscricoes": ("organizador", 3),
+        "notificacao-list": ("participante", 3),
+        "notificacao-detail": ("participante", 2),
+        "notificacao-unread-count": ("participante", 2),  # COUNT só com o contador fora do cache
+        "participante-list": ("organizador", 3),
+        "participante-detail": ("organizador", 4),
+        "organizador-list": (None, 3),
+        "organizador-detail": (None, 2),
+        "auth-me": ("participante", 1),
+    }
+    SEM_ORCAMENTO = {
+        "notificacao-stream": "SSE: conexão longa, consultas só na abertura",
+    }
+    TAMANHOS = (3, 15)
+
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador()
+        self.participante = criar_participante()
+        self.client = APIClient()
+        self.total = 0
+
+    def _popular(self, ate):
+        for i in range(self.total, ate):
+            evento = criar_evento(self.organizador, titulo=f"Evento {i}")
+            outro = criar_participante(f"p{i}")
+            for participante in (self.participante, outro):
+                Inscricao.objects.create(participante=participante, evento=evento, status="confirmada")
+            if i:
+                Inscricao.objects.create(participante=outro, evento=self.primeiro_evento(), status="pendente")
+            Notificacao.objects.create(participante=self.participante, evento=evento, mensagem=f"n{i}")
+        self.total = ate
+
+    def primeiro_evento(self):
+        return Evento.objects.order_by("pk").first()
+
+    def _kwargs(self, rota):
+        if rota in ("evento-inscricoes-exportar", "evento-inscricoes-serie"):
+            return {"pk": self.primeiro_evento().pk}
+        if not rota.endswith("-detail"):
+            return {}
+        modelo = {
+            "evento": Evento, "participante": Participante, "organizador": Organizador,
+        }.get(rota.split("-")[0])
+        if rota == "inscricao-detail":
+            return {"pk": Inscricao.objects.filter(participante=self.participante).order_by("pk").first().pk}
+        if rota == "notificacao-detail":
+            return {"pk": Notificacao.objects.filter(participante=self.participante).order_by("pk").first().pk}
+        if modelo is Participante:
+            return {"pk": self.participante.pk}
+        if modelo is Organizador:
+            return {"pk": self.organizador.pk}
+        return {"pk": self.primeiro_evento().pk}
+
+    def _medir(self, rota, papel):
+        from .middleware import ColetorQueries
+
+        usuario = {"participante": self.participante, "organizador": self.organizador}.get(papel)
+        # usuário "fresco" a cada chamada, como acontece com o JWT
+        self.client.force_authenticate(User.objects.get(pk=usuario.user_id) if usuario else None)
+        url = reverse(f"api:v1.0:core:{rota}", kwargs=self._kwargs(rota))
+        cache.clear()  # pior caso: contadores e respostas fora do cache
+        with ColetorQueries() as coletor:
+            response = self.client.get(url)
+            if response.streaming:
+                # as queries de uma resposta em streaming rodam durante a leitura
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, f"{rota}: {response.status_code}")
+        return coletor
+
+    def test_todas_as_rotas_get_tem_orcamento(self):
+        from .api.v1.router import urlpatterns
+
+        rotas = set()
+        for padrao in urlpatterns:
+            acoes = getattr(padrao.callback, "actions", None)
+            view_class = getattr(padrao.callback, "view_class", None)
+            if acoes is not None:
+                if "get" in acoes:
+                    rotas.add(padrao.name)
+            elif view_class is None or hasattr(view_class, "get"):
+                rotas.add(padrao.name)
+        self.assertEqual(rotas - set(self.ORCAMENTO) - set(self.SEM_ORCAMENTO), set())
+
+    def test_rotas_respeitam_o_orcamento_com_a_base_crescendo(self):
+        medidas = {}
+        for tamanho in self.TAMANHOS:
+            self._popular(tamanho)
+            for rota, (papel, orcamento) in self.ORCAMENTO.items():
+                coletor = self._medir(rota, papel)
+                medidas.setdefault(rota, []).append(coletor.total)
+                with self.subTest(rota=rota, tamanho=tamanho):
+                    self.assertLessEqual(coletor.total, orcamento, [sql for sql, _ in coletor.queries])
+                    self.assertEqual(coletor.repetidas(), {})
+        for rota, totais in medidas.items():
+            with self.subTest(rota=rota):
+                self.assertEqual(len(set(totais)), 1, f"{rota} cresce com a base: {totais}")
+
+
+class PopularBaseTests(TestCase):
+    def test_carga_sintetica_com_eventos_quentes(self):
+        saida = StringIO()
+        call_command(
+            "popular_base",
+            organizadores=3, eventos=20, participantes=60,
+            inscricoes_por_participante=3, notificacoes_por_participante=2,
+            eventos_quentes=2, fracao_quente=0.5, chunk_size=25, prefixo="t",
+            stdout=saida,
+        )
+        self.assertIn("180 inscrições", saida.getvalue())
+        self.assertEqual(Organizador.objects.count(), 3)
+        self.assertEqual(Evento.objects.count(), 20)
+        self.assertEqual(Participante.objects.count(), 60)
+        self.assertEqual(Notificacao.objects.count(), 120)
+        self.assertTrue(User.objects.get(username="t_part_0").check_password("bench-senha-123"))
+
+        # contador de vagas coerente e capacidade respeitada
+        for evento in Evento.objects.all():
+            ativas = evento.inscricoes.exclude(status="cancelada").count()
+            self.assertEqual(evento.vagas_ocupadas, ativas)
+            self.assertLessEqual(evento.vagas_ocupadas, evento.capacidade)
+
+        # os dois primeiros eventos concentram as inscrições
+        por_evento = list(
+            Inscricao.objects.values("evento").annotate(n=Count("id")).order_by("-n").values_list("n", flat=True)
+        )
+        self.assertGreater(sum(por_evento[:2]), 180 * 0.3)
+
+        with self.assertRaises(CommandError):
+            call_command("popular_base", organizadores=1, eventos=1, participantes=1, prefixo="t", stdout=StringIO())
+
+
+class BenchmarkApiTests(LiveServerTestCase):
+    def test_resumo_com_percentis(self):
+        from .management.commands.benchmark_api import percentil, resumir
+
+        self.assertEqual(percentil(list(range(1, 101)), 95), 95)
+        self.assertIsNone(percentil([], 50))
+        resumo = resumir([(0.010, "ok"), (0.020, "ok"), (0.030, "rejeitada"), (0.100, "erro")], duracao=2)
+        self.assertEqual((resumo["requisicoes"], resumo["ok"], resumo["rejeitadas"], resumo["erros"]), (4, 2, 1, 1))
+        self.assertEqual(resumo["rps"], 2.0)
+        self.assertEqual(resumo["p50_ms"], 20.0)
+        self.assertEqual(resumo["p99_ms"], 100.0)
+        self.assertIsNone(resumo["queries_media"])
+        self.assertEqual(resumir([(0.01, "ok", 3), (0.02, "ok", 5), (0.03, "erro", None)], duracao=1)["queries_media"], 4)
+
+    def test_rodada_contra_servidor_local(self):
+        call_command(
+            "popular_base", organizadores=1, eventos=5, participantes=2,
+            inscricoes_por_participante=1, notificacoes_por_participante=1, prefixo="bench", stdout=StringIO(),
+        )
+        saida = StringIO()
+        call_command(
+            "benchmark_api", url=self.live_server_url, clientes=1, requisicoes=20, paginas=1, stdout=saida,
+        )
+        relatorio = json.loads(saida.getvalue())
+        self.assertEqual(relatorio["total"]["requisicoes"], 20)
+        self.assertEqual(relatorio["total"]["erros"], 0)
+        self.assertEqual(set(relatorio["endpoints"]), {
+            "eventos_lista", "evento_detalhe", "inscrever", "cancelar", "notificacoes", "nao_lidas",
+        })
+        for chave in ("p50_ms", "p95_ms", "p99_ms", "rps"):
+            self.assertIsNotNone(relatorio["total"][chave])
+
+
+class InscricaoEmLoteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador()
+        self.evento = criar_evento(self.organizador, capacidade=4)
+        self.participantes = [criar_participante(f"p{i}") for i in range(6)]
+        self.url = reverse("api:v1.0:core:evento-inscricoes-lote", args=[self.evento.pk])
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizador.user)
+
+    def test_resultados_por_linha(self):
+        p = self.participantes
+        Inscricao.objects.create(participante=p[0], evento=self.evento, status="confirmada")
+        Inscricao.objects.create(participante=p[1], evento=self.evento, status="cancelada")
+        Evento.objects.filter(pk=self.evento.pk).update(vagas_ocupadas=1)
+        excluido = criar_participante("excluido")
+        Inscricao.objects.create(participante=excluido, evento=self.evento, status="confirmada", is_deleted=True)
+
+        linhas = [
+            p[0].pk, p[1].pk, p[2].pk, "P3@EXAMPLE.COM", str(p[2].pk), "ninguem@example.com", "xyz",
+            excluido.pk, p[4].pk, p[5].pk,
+        ]
+        response = self.client.post(self.url, {"participantes": linhas}, format="json")
+        self.assertEqual(response.status_code, 200)
+        resultados = [r["resultado"] for r in response.data["resultados"]]
+        self.assertEqual(resultados, [
+            "ja_inscrito", "cancelada", "inscrito", "inscrito", "duplicada",
+            "nao_encontrado", "invalido", "excluida", "inscrito", "sem_vaga",
+        ])
+        self.assertEqual(response.data["resumo"]["inscrito"], 3)
+
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 4)
+        self.assertEqual(
+            set(self.evento.inscricoes.filter(status="confirmada").values_list("participante_id", flat=True)),
+            {p[0].pk, p[2].pk, p[3].pk, p[4].pk},
+        )
+        # uma notificação por participante inscrito e um resumo para o organizador
+        self.assertEqual(Notificacao.objects.filter(participante__isnull=False).count(), 3)
+        self.assertEqual(Notificacao.objects.filter(organizador=self.organizador).count(), 1)
+
+    def test_apenas_o_organizador_do_evento(self):
+        outro = criar_organizador("outro_org")
+        self.client.force_authenticate(outro.user)
+        response = self.client.post(self.url, {"participantes": [self.participantes[0].pk]}, format="json")
+        self.assertEqual(response.status_code, 404)
+
+        self.client.force_authenticate(self.participantes[0].user)
+        response = self.client.post(self.url, {"participantes": [self.participantes[0].pk]}, format="json")
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Inscricao.objects.exists())
+
+    def test_corpo_invalido(self):
+        self.assertEqual(self.client.post(self.url, {"participantes": []}, format="json").status_code, 400)
+        self.assertEqual(self.client.post(self.url, {"participantes": "1"}, format="json").status_code, 400)
+
+    def test_lote_grande_com_queries_constantes(self):
+        evento = criar_evento(self.organizador, capacidade=5000, preco=Decimal("10.00"))
+        users = User.objects.bulk_create([User(username=f"lote_{i}") for i in range(5000)])
+        participantes = Participante.objects.bulk_create([
+            Participante(user=user, nome=user.username, email=f"{user.username}@example.com") for user in users
+        ])
+        linhas = [p.pk if i % 2 else p.email for i, p in enumerate(participantes)]
+        url = reverse("api:v1.0:core:evento-inscricoes-lote", args=[evento.pk])
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(url, {"participantes": linhas}, format="json")
+        self.assertEqual(response.data["resumo"], {"inscrito": 5000})
+        # validação por conjuntos: nenhuma query por linha fora os INSERTs em lote,
+        # cujo número só depende do tamanho de bloco do backend
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertLess(len(ctx.captured_queries) - len(inserts), 20)
+        blocos = 0
+        for modelo, linhas_modelo in ((Inscricao, 5000), (Notificacao, 5001)):
+            tamanho = min(connection.ops.bulk_batch_size(modelo._meta.concrete_fields, [None]), 1000)
+            blocos += -(-linhas_modelo // tamanho)
+        self.assertLessEqual(len(inserts), blocos)
+        self.assertEqual(evento.inscricoes.filter(status="pendente").count(), 5000)
+        evento.refresh_from_db()
+        self.assertEqual(evento.vagas_ocupadas, 5000)
+
+
+class ExportacaoInscricoesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador()
+        self.evento = criar_evento(self.organizador)
+        self.ana = criar_participante("ana", nome="Ana, da Silva", email="ana@example.com")
+        self.bia = criar_participante("bia", nome="Bia", email="bia@example.com")
+        Inscricao.objects.create(participante=self.ana, evento=self.evento, status="confirmada")
+        Inscricao.objects.create(participante=self.bia, evento=self.evento, status="cancelada")
+        Inscricao.objects.create(participante=self.bia, evento=criar_evento(self.organizador), status="pendente")
+        self.url = reverse("api:v1.0:core:evento-inscricoes-exportar", args=[self.evento.pk])
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizador.user)
+
+    def _baixar(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode("utf-8")
+
+    def test_csv(self):
+        response, conteudo = self._baixar()
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn(f"evento-{self.evento.pk}-inscricoes.csv", response["Content-Disposition"])
+        linhas = conteudo.splitlines()
+        self.assertEqual(linhas[0], "nome,email,status,data_inscricao")
+        self.assertEqual(len(linhas), 3)
+        self.assertTrue(linhas[1].startswith('"Ana, da Silva",ana@example.com,confirmada,'))
+        self.assertTrue(linhas[2].startswith("Bia,bia@example.com,cancelada,"))
+
+    def test_jsonl(self):
+        response, conteudo = self._baixar(formato="jsonl")
+        self.assertTrue(response["Content-Type"].startswith("application/x-ndjson"))
+        linhas = [json.loads(linha) for linha in conteudo.splitlines()]
+        self.assertEqual([(l["email"], l["status"]) for l in linhas], [
+            ("ana@example.com", "confirmada"), ("bia@example.com", "cancelada"),
+        ])
+        self.assertEqual(set(linhas[0]), {"nome", "email", "status", "data_inscricao"})
+
+    def test_envia_em_blocos_sem_carregar_tudo(self):
+        from .exportacao import LINHAS_POR_BLOCO
+
+        outro = criar_evento(self.organizador, capacidade=2000)
+        users = User.objects.bulk_create([User(username=f"exp_{i}") for i in range(LINHAS_POR_BLOCO * 2)])
+        participantes = Participante.objects.bulk_create([
+            Participante(user=u, nome=u.username, email=f"{u.username}@example.com") for u in users
+        ])
+        Inscricao.objects.bulk_create([Inscricao(participante=p, evento=outro) for p in participantes])
+
+        response = self.client.get(reverse("api:v1.0:core:evento-inscricoes-exportar", args=[outro.pk]))
+        blocos = list(response.streaming_content)
+        # cabeçalho sozinho, depois blocos de LINHAS_POR_BLOCO linhas
+        self.assertEqual(blocos[0], b"nome,email,status,data_inscricao\r\n")
+        self.assertEqual([bloco.count(b"\n") for bloco in blocos[1:]], [LINHAS_POR_BLOCO, LINHAS_POR_BLOCO])
+
+    def test_apenas_o_organizador_do_evento(self):
+        self.client.force_authenticate(criar_organizador("outro").user)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.client.force_authenticate(self.ana.user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_formato_invalido(self):
+        self.assertEqual(self.client.get(self.url, {"formato": "xlsx"}).status_code, 400)
+
+
+class DashboardOrganizadorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador()
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizador.user)
+        self.url = reverse("api:v1.0:core:evento-dashboard")
+        self.total = 0
+
+    def _popular(self, quantidade):
+        for i in range(self.total, self.total + quantidade):
+            evento = criar_evento(self.organizador, titulo=f"E{i}", capacidade=4, preco=Decimal("25.50"))
+            for j, status_ in enumerate(("pendente", "confirmada", "confirmada", "cancelada")):
+                Inscricao.objects.create(participante=criar_participante(f"p{i}_{j}"), evento=evento, status=status_)
+        self.total += quantidade
+
+    def test_indicadores_por_evento(self):
+        self._popular(1)
+        gratuito = criar_evento(self.organizador, titulo="Gratuito", capacidade=10, data_inicio=timezone.now() + timedelta(days=30))
+        Inscricao.objects.create(participante=criar_participante("g"), evento=gratuito, status="confirmada")
+        removida = Inscricao.objects.create(participante=criar_participante("r"), evento=gratuito, status="confirmada")
+        removida.delete()
+        criar_evento(criar_organizador("outro"))
+
+        linhas = self.client.get(self.url).data
+        self.assertEqual([l["titulo"] for l in linhas], ["E0", "Gratuito"])
+        pago, gratis = linhas
+        self.assertEqual((pago["pendentes"], pago["confirmadas"], pago["canceladas"]), (1, 2, 1))
+        self.assertAlmostEqual(pago["taxa_ocupacao"], 0.75)
+        self.assertEqual(Decimal(pago["receita_prevista"]), Decimal("76.50"))
+        self.assertEqual(Decimal(pago["receita_confirmada"]), Decimal("51.00"))
+        self.assertEqual(gratis["confirmadas"], 1)
+        self.assertAlmostEqual(gratis["taxa_ocupacao"], 0.1)
+        self.assertEqual(Decimal(gratis["receita_prevista"]), Decimal("0"))
+
+    def test_uma_query_independente_do_numero_de_eventos(self):
+        totais = []
+        for quantidade in (1, 8):
+            self._popular(quantidade)
+            self.client.force_authenticate(User.objects.get(pk=self.organizador.user_id))
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(self.url)
+            self.assertEqual(len(response.data), self.total)
+            totais.append(len(ctx.captured_queries))
+        # perfil do usuário + a query agrupada
+        self.assertEqual(totais, [2, 2])
+
+    def test_apenas_organizadores(self):
+        self.client.force_authenticate(criar_participante().user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class SerieInscricoesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador()
+        self.evento = criar_evento(self.organizador, capacidade=50)
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizador.user)
+        self.url = reverse("api:v1.0:core:evento-inscricoes-serie", args=[self.evento.pk])
+
+    @staticmethod
+    def _series():
+        return {
+            (s.evento_id, s.granularidade, s.inicio, s.status): s.total
+            for s in SerieInscricoes.objects.exclude(total=0)
+        }
+
+    def _inscrever(self, username, status_="pendente", quando=None):
+        inscricao = Inscricao.objects.create(participante=criar_participante(username), evento=self.evento, status=status_)
+        if quando is not None:
+            # data_inscricao é auto_now_add: move a inscrição e refaz as séries
+            Inscricao.objects.filter(pk=inscricao.pk).update(data_inscricao=quando)
+        return inscricao
+
+    def test_series_acompanham_criacao_cancelamento_e_exclusao(self):
+        from .series import reconstruir
+
+        primeira = self._inscrever("a")
+        self._inscrever("b", "confirmada")
+        terceira = self._inscrever("c")
+        totais = {(s.granularidade, s.status): s.total for s in SerieInscricoes.objects.all()}
+        self.assertEqual(totais, {("dia", "pendente"): 2, ("dia", "confirmada"): 1,
+                                  ("hora", "pendente"): 2, ("hora", "confirmada"): 1})
+
+        primeira.cancelar()
+        terceira.delete()
+        incremental = self._series()
+        self.assertEqual(
+            sorted((g, st, total) for (_, g, _, st), total in incremental.items()),
+            [("dia", "cancelada", 1), ("dia", "confirmada", 1), ("hora", "cancelada", 1), ("hora", "confirmada", 1)],
+        )
+        terceira.restore()
+        self.assertEqual(len(self._series()), 6)
+
+        # o rebuild chega ao mesmo resultado que a manutenção incremental
+        incremental = self._series()
+        reconstruir()
+        self.assertEqual(self._series(), incremental)
+
+    def test_inscricao_em_lote_atualiza_as_series(self):
+        from .inscricoes import inscrever_em_lote
+
+        participantes = [criar_participante(f"l{i}") for i in range(5)]
+        inscrever_em_lote(self.evento, [p.pk for p in participantes])
+        self.assertEqual(
+            SerieInscricoes.objects.get(evento=self.evento, granularidade="dia", status="confirmada").total, 5
+        )
+
+    def test_endpoint_le_apenas_as_series(self):
+        from .series import reconstruir
+
+        base = timezone.make_aware(datetime(2025, 3, 10, 9, 30))
+        self._inscrever("a", quando=base)
+        self._inscrever("b", "confirmada", quando=base + timedelta(minutes=10))
+        self._inscrever("c", quando=base + timedelta(hours=2))
+        self._inscrever("d", quando=base + timedelta(days=1))
+        reconstruir([self.evento.pk])
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {"inicio": "2025-03-10", "fim": "2025-03-12"})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in ctx.captured_queries if "core_inscricao" in q["sql"]])
+        self.assertEqual(response.data["periodos"], [
+            {"inicio": "2025-03-10 00:00:00", "pendente": 2, "confirmada": 1, "cancelada": 0},
+            {"inicio": "2025-03-11 00:00:00", "pendente": 1, "confirmada": 0, "cancelada": 0},
+        ])
+
+        response = self.client.get(
+            self.url, {"granularidade": "hora", "inicio": "2025-03-10T09:45:00", "fim": "2025-03-10T11:00:00"}
+        )
+        self.assertEqual([p["inicio"] for p in response.data["periodos"]], ["2025-03-10 09:00:00"])
+
+    def test_parametros_invalidos_e_permissoes(self):
+        self.assertEqual(self.client.get(self.url, {"granularidade": "mes"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"inicio": "ontem"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"inicio": "2025-03-10", "fim": "2025-03-01"}).status_code, 400)
+        self.client.force_authenticate(criar_organizador("outro").user)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_comando_reconstruir_series(self):
+        self._inscrever("a")
+        SerieInscricoes.objects.all().delete()
+        saida = StringIO()
+        call_command("reconstruir_series", evento=[self.evento.pk], stdout=saida)
+        self.assertIn("2 períodos gravados", saida.getvalue())
+        self.assertEqual(SerieInscricoes.objects.filter(status="pendente").count(), 2)
+
+
+@override_settings(PAGAMENTOS_WEBHOOK_TOKEN="segredo")
+class ConfirmacaoPagamentoTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador()
+        self.evento = criar_evento(self.organizador, preco=Decimal("50.00"))
+        self.inscricoes = [
+            Inscricao.objects.create(participante=criar_participante(f"p{i}"), evento=self.evento, status="pendente")
+            for i in range(4)
+        ]
+        self.url = reverse("api:v1.0:core:pagamento-confirmacoes")
+        self.client = APIClient()
+
+    def _enviar(self, confirmacoes, chave="segredo"):
+        return self.client.post(
+            self.url, {"confirmacoes": confirmacoes}, format="json", HTTP_X_PAGAMENTOS_TOKEN=chave
+        )
+
+    def test_lote_com_resultados_por_item_e_reenvio_ignorado(self):
+        a, b, c, d = self.inscricoes
+        c.cancelar()
+        d.status = "confirmada"
+        d.save(update_fields=["status", "updated_at"])
+        lote = [
+            {"token": "pay_1", "inscricao": a.pk},
+            {"token": "pay_2", "inscricao": b.pk},
+            {"token": "pay_2", "inscricao": b.pk},
+            {"token": "pay_3", "inscricao": c.pk},
+            {"token": "pay_4", "inscricao": d.pk},
+            {"token": "pay_5", "inscricao": 999999},
+            {"token": "", "inscricao": a.pk},
+        ]
+        response = self._enviar(lote)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r["resultado"] for r in response.data["resultados"]], [
+            "confirmada", "confirmada", "repetida", "cancelada", "ja_confirmada", "nao_encontrada", "invalida",
+        ])
+        self.assertEqual(
+            set(Inscricao.objects.filter(status="confirmada").values_list("pk", flat=True)), {a.pk, b.pk, d.pk}
+        )
+        # dois participantes e um resumo para o organizador
+        notificacoes = Notificacao.objects.filter(mensagem__contains="confirmad")
+        self.assertEqual(notificacoes.filter(participante__isnull=False).count(), 2)
+        self.assertEqual(notificacoes.filter(organizador=self.organizador).count(), 1)
+        self.assertEqual(
+            SerieInscricoes.objects.get(evento=self.evento, granularidade="dia", status="confirmada").total, 3
+        )
+
+        total = Notificacao.objects.count()
+        replay = self._enviar(lote)
+        self.assertEqual(replay.data["resumo"], {"repetida": 5, "nao_encontrada": 1, "invalida": 1})
+        self.assertEqual(Notificacao.objects.count(), total)
+
+    def test_exige_a_chave_do_provedor(self):
+        confirmacao = [{"token": "pay_1", "inscricao": self.inscricoes[0].pk}]
+        self.assertEqual(self._enviar(confirmacao, chave="errada").status_code, 403)
+        with override_settings(PAGAMENTOS_WEBHOOK_TOKEN=None):
+            self.assertEqual(self._enviar(confirmacao, chave="").status_code, 403)
+        self.assertEqual(self._enviar("x").status_code, 400)
+        self.assertFalse(Inscricao.objects.filter(status="confirmada").exists())
+
+    def test_milhares_de_confirmacoes_com_queries_em_lote(self):
+        from .pagamentos import confirmar_pagamentos
+
+        users = User.objects.bulk_create([User(username=f"pg_{i}") for i in range(3000)])
+        participantes = Participante.objects.bulk_create([
+            Participante(user=u, nome=u.username, email=f"{u.username}@example.com") for u in users
+        ])
+        inscricoes = Inscricao.objects.bulk_create([Inscricao(participante=p, evento=self.evento) for p in participantes])
+        lote = [{"token": f"lote_{i.pk}", "inscricao": i.pk} for i in inscricoes]
+
+        with CaptureQueriesContext(connection) as ctx:
+            resultados = confirmar_pagamentos(lote)
+        self.assertTrue(all(r["resultado"] == "confirmada" for r in resultados))
+        sem_inserts = [q for q in ctx.captured_queries if not q["sql"].startswith("INSERT")]
+        self.assertLess(len(sem_inserts), 15)
+        self.assertEqual(self.evento.inscricoes.filter(status="confirmada").count(), 3000)
+
+    def test_comando_importar_pagamentos(self):
+        import tempfile
+
+        a, b = self.inscricoes[:2]
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as arquivo:
+            arquivo.write(json.dumps({"token": "arq_1", "inscricao": a.pk}) + "\n\n")
+            arquivo.write(json.dumps({"token": "arq_2", "inscricao": b.pk}) + "\n")
+        saida = StringIO()
+        call_command("importar_pagamentos", arquivo.name, batch_size=1, stdout=saida)
+        self.assertIn("2 confirmações processadas (confirmada: 2)", saida.getvalue())
+
+        saida = StringIO()
+        call_command("importar_pagamentos", arquivo.name, stdout=saida)
+        self.assertIn("(repetida: 2)", saida.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command("importar_pagamentos", arquivo.name + ".inexistente", stdout=StringIO())
+
+
+class ExpiracaoInscricoesPendentesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador()
+        self.pago = criar_evento(self.organizador, titulo="Pago", preco=Decimal("30.00"), capacidade=10)
+        self.outro = criar_evento(self.organizador, titulo="Outro", preco=Decimal("30.00"), capacidade=10)
+
+    def _pendente(self, username, evento, horas_atras):
+        from .series import reconstruir
+
+        inscricao = Inscricao.objects.create(participante=criar_participante(username), evento=evento)
+        Evento.reservar_vaga(evento.pk)
+        Inscricao.objects.filter(pk=inscricao.pk).update(data_inscricao=timezone.now() - timedelta(hours=horas_atras))
+        reconstruir([evento.pk])
+        return inscricao
+
+    def test_expira_em_blocos_liberando_vagas(self):
+        from .pagamentos import expirar_pendentes
+
+        velhas = [self._pendente(f"v{i}", self.pago, 30) for i in range(3)] + [self._pendente("o", self.outro, 25)]
+        recente = self._pendente("r", self.pago, 1)
+        confirmada = self._pendente("c", self.pago, 40)
+        confirmada.status = "confirmada"
+        confirmada.save(update_fields=["status", "updated_at"])
+
+        self.assertEqual(expirar_pendentes(timedelta(hours=24), chunk_size=3), 3)
+        self.assertEqual(expirar_pendentes(timedelta(hours=24), chunk_size=3), 1)
+        self.assertEqual(expirar_pendentes(timedelta(hours=24), chunk_size=3), 0)
+
+        self.assertEqual(
+            set(Inscricao.objects.filter(status="cancelada").values_list("pk", flat=True)), {i.pk for i in velhas}
+        )
+        recente.refresh_from_db()
+        self.assertEqual(recente.status, "pendente")
+        self.pago.refresh_from_db()
+        self.outro.refresh_from_db()
+        self.assertEqual((self.pago.vagas_ocupadas, self.outro.vagas_ocupadas), (2, 0))
+
+        self.assertEqual(Notificacao.objects.filter(mensagem__startswith="⌛ Sua inscrição").count(), 4)
+        # um resumo por evento em cada bloco: (Pago) e depois (Outro)
+        self.assertEqual(Notificacao.objects.filter(organizador=self.organizador, mensagem__contains="expirada").count(), 2)
+        series = SerieInscricoes.objects.filter(granularidade="dia")
+        self.assertEqual(series.filter(status="cancelada").aggregate(n=Sum("total"))["n"], 4)
+        self.assertEqual(series.filter(status="pendente").aggregate(n=Sum("total"))["n"], 1)
+
+    def test_bloco_usa_poucas_queries(self):
+        from .pagamentos import expirar_pendentes
+
+        for i in range(6):
+            self._pendente(f"p{i}", self.pago if i % 2 else self.outro, 48)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(expirar_pendentes(timedelta(hours=24)), 6)
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        # inscrições + vagas dos dois eventos
+        self.assertEqual(len(updates), 2)
+
+    @skipUnless(connection.vendor == "postgresql", "SKIP LOCKED e planos dependem do PostgreSQL")
+    def test_consulta_usa_o_indice_de_pendentes(self):
+        limite = timezone.now()
+        plano = (
+            Inscricao.objects.filter(status="pendente", data_inscricao__lt=limite)
+            .order_by("data_inscricao", "id")[:500]
+            .explain()
+        )
+        self.assertIn("inscricao_pendente_data_idx", plano)
+
+    @override_settings(INSCRICAO_PENDENTE_TTL_MINUTOS=60)
+    def test_comando_usa_o_prazo_configurado(self):
+        self._pendente("a", self.pago, 2)
+        saida = StringIO()
+        call_command("expirar_inscricoes", stdout=saida)
+        self.assertIn("1 inscrições pendentes expiradas", saida.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("expirar_inscricoes", ttl_minutos=-1, stdout=StringIO())
+
+
+class RetencaoTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador()
+        self.participante = criar_participante()
+        self.evento = criar_evento(self.organizador)
+        self.antigo = timezone.now() - timedelta(days=200)
+
+    def _notificacao(self, lida, antiga):
+        notificacao = Notificacao.objects.create(
+            participante=self.participante, evento=self.evento, mensagem="oi", is_read=lida
+        )
+        if antiga:
+            Notificacao.objects.filter(pk=notificacao.pk).update(created_at=self.antigo)
+        return notificacao
+
+    def _excluir(self, objeto, antigo=True):
+        objeto.delete()
+        if antigo:
+            type(objeto).all_objects.filter(pk=objeto.pk).update(deleted_at=self.antigo)
+
+    def test_arquiva_apenas_lidas_antigas(self):
+        from .retencao import arquivar_notificacoes
+
+        arquivar = self._notificacao(lida=True, antiga=True)
+        outra = self._notificacao(lida=True, antiga=True)
+        recente = self._notificacao(lida=True, antiga=False)
+        nao_lida = self._notificacao(lida=False, antiga=True)
+
+        self.assertEqual(arquivar_notificacoes(timedelta(days=90), batch_size=1), 2)
+        self.assertEqual(
+            set(Notificacao.all_objects.values_list("pk", flat=True)), {recente.pk, nao_lida.pk}
+        )
+        arquivada = NotificacaoArquivada.objects.get(pk=arquivar.pk)
+        self.assertEqual((arquivada.participante_id, arquivada.evento_id), (self.participante.pk, self.evento.pk))
+        self.assertTrue(NotificacaoArquivada.objects.filter(pk=outra.pk).exists())
+
+    def test_arquivo_jsonl_compactado(self):
+        import gzip
+        import tempfile
+
+        self._notificacao(lida=True, antiga=True)
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = f"{pasta}/notificacoes.jsonl.gz"
+            saida = StringIO()
+            call_command("aplicar_retencao", arquivo=caminho, stdout=saida)
+            with gzip.open(caminho, "rt", encoding="utf-8") as arquivo:
+                linhas = [json.loads(linha) for linha in arquivo]
+        self.assertEqual([linha["mensagem"] for linha in linhas], ["oi"])
+        self.assertFalse(NotificacaoArquivada.objects.exists())
+        self.assertIn("core_notificacao: 1 linhas", saida.getvalue())
+
+    def test_remove_excluidos_apos_a_carencia_com_dependentes(self):
+        from .retencao import purgar_excluidos
+
+        outro = criar_participante("outro")
+        removida = Inscricao.objects.create(participante=outro, evento=self.evento)
+        self._excluir(removida)
+        recente = Inscricao.objects.create(participante=criar_participante("r"), evento=self.evento)
+        self._excluir(recente, antigo=False)
+
+        evento_removido = criar_evento(self.organizador, titulo="Removido")
+        Inscricao.objects.create(participante=self.participante, evento=evento_removido)
+        Notificacao.objects.create(participante=self.participante, evento=evento_removido, mensagem="x")
+        self._excluir(evento_removido)
+
+        removidas = purgar_excluidos(timedelta(days=30), batch_size=1)
+        self.assertEqual(removidas["core_inscricao"], 2)
+        self.assertEqual(removidas["core_evento"], 1)
+        self.assertFalse(Inscricao.all_objects.filter(pk=removida.pk).exists())
+        self.assertTrue(Inscricao.all_objects.filter(pk=recente.pk).exists())
+        self.assertFalse(Evento.all_objects.filter(pk=evento_removido.pk).exists())
+        self.assertFalse(Notificacao.all_objects.filter(evento_id=evento_removido.pk).exists())
+        self.assertFalse(SerieInscricoes.objects.filter(evento_id=evento_removido.pk).exists())
+        # quem não estava excluído continua
+        self.assertTrue(Evento.objects.filter(pk=self.evento.pk).exists())
+        self.assertTrue(Participante.objects.filter(pk=outro.pk).exists())
+
+    def test_purga_de_participante_excluido_libera_vaga_e_series(self):
+        from .retencao import purgar_excluidos
+
+        evento = criar_evento(self.organizador, capacidade=1)
+        saiu = criar_participante("saiu")
+        Inscricao.objects.create(participante=saiu, evento=evento, status="confirmada")
+        # soft delete do participante não cascateia: a inscrição continua ativa
+        self._excluir(saiu)
+
+        purgar_excluidos(timedelta(days=30))
+        self.assertFalse(Inscricao.all_objects.filter(evento=evento).exists())
+        evento.refresh_from_db()
+        self.assertEqual(evento.vagas_ocupadas, 0)
+        self.assertEqual(
+            list(SerieInscricoes.objects.filter(evento=evento).values_list("total", flat=True).distinct()), [0]
+        )
+        self.assertTrue(Evento.reservar_vaga(evento.pk))
+
+    def test_comando_relata_linhas(self):
+        self._notificacao(lida=True, antiga=True)
+        participante = criar_participante("sai")
+        self._excluir(participante)
+        saida = StringIO()
+        call_command("aplicar_retencao", batch_size=10, stdout=saida)
+        self.assertIn("core_participante: 1 linhas", saida.getvalue())
+        self.assertIn("2 linhas arquivadas ou removidas", saida.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("aplicar_retencao", dias_excluidos=-1, stdout=StringIO())
+
+
+class SoftDeleteEmConjuntoTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizador = criar_organizador()
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizador.user)
+
+    def _evento_com_inscritos(self, quantidade, prefixo):
+        from .inscricoes import inscrever_em_lote
+
+        evento = criar_evento(self.organizador, titulo=f"Evento {prefixo}", capacidade=quantidade)
+        participantes = [criar_participante(f"{prefixo}{i}") for i in range(quantidade)]
+        inscrever_em_lote(evento, [p.pk for p in participantes])
+        return evento, participantes
+
+    def _excluir_pela_api(self, evento):
+        url = reverse("api:v1.0:core:evento-detail", args=[evento.pk])
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.delete(url).status_code, 204)
+        return [q["sql"] for q in ctx.captured_queries if not q["sql"].startswith("INSERT")]
+
+    def test_excluir_evento_cascateia_com_queries_constantes(self):
+        pequeno, _ = self._evento_com_inscritos(5, "a")
+        grande, participantes = self._evento_com_inscritos(150, "b")
+        Inscricao.objects.filter(evento=grande, participante=participantes[0]).get().cancelar()
+        while processar_outbox():
+            pass
+        notificacoes_antes = Notificacao.objects.filter(evento=grande).count()
+
+        # o número de idas ao banco não depende da quantidade de inscrições
+        self.assertEqual(len(self._excluir_pela_api(pequeno)), len(self._excluir_pela_api(grande)))
+
+        self.assertFalse(Inscricao.objects.filter(evento=grande).exists())
+        self.assertEqual(Inscricao.all_objects.filter(evento=grande, is_deleted=True).count(), 150)
+        grande = Evento.all_objects.get(pk=grande.pk)
+        self.assertTrue(grande.is_deleted)
+        self.assertEqual(grande.vagas_ocupadas, 0)
+        self.assertEqual(Notificacao.all_objects.filter(evento=grande, is_deleted=True).count(), notificacoes_antes)
+        # o aviso de cancelamento fica com o worker e alcança as inscrições excluídas junto
+        self.assertFalse(Notificacao.objects.filter(evento=grande).exists())
+        while processar_outbox():
+            pass
+        # só o aviso de cancelamento fica visível, para quem não tinha cancelado
+        avisos = Notificacao.objects.filter(evento=grande, tipo=Notificacao.TIPO_EVENTO_CANCELADO)
+        self.assertEqual(Notificacao.objects.filter(evento=grande).count(), 149)
+        self.assertEqual(avisos.count(), 149)
+        self.assertTrue(all("foi cancelado pelo organizador" in n.mensagem for n in avisos))
+        self.assertFalse(SerieInscricoes.objects.filter(evento=grande).exclude(total=0).exists())
+
+    def test_restaurar_evento_traz_de_volta_so_o_que_saiu_junto(self):
+        evento, participantes = self._evento_com_inscritos(3, "p")
+        removida_antes = Inscricao.objects.get(evento=evento, participante=participantes[0])
+        removida_antes.delete()
+        notificacoes_antes = set(Notificacao.objects.filter(evento=evento).values_list("pk", flat=True))
+
+        evento.delete()
+        while processar_outbox():
+            pass
+        # um dos avisos de cancelamento já foi lido
+        Notificacao.objects.filter(evento=evento, participante=participantes[2]).exclude(
+            pk__in=notificacoes_antes
+        ).update(is_read=True)
+        # os avisos são achados pela marca, não pelo texto gerado do título atual
+        Evento.all_objects.filter(pk=evento.pk).update(titulo="Evento renomeado")
+        evento.refresh_from_db()
+        evento.restore()
+
+        self.assertEqual(
+            set(Inscricao.objects.filter(evento=evento).values_list("participante_id", flat=True)),
+            {participantes[1].pk, participantes[2].pk},
+        )
+        evento.refresh_from_db()
+        self.assertEqual(evento.vagas_ocupadas, 2)
+        # as notificações anteriores voltam; os avisos de cancelamento são revogados
+        # e quem já tinha lido o seu recebe o de reativação
+        visiveis = Notificacao.objects.filter(evento=evento)
+        self.assertTrue(notificacoes_antes <= set(visiveis.values_list("pk", flat=True)))
+        self.assertFalse(visiveis.filter(mensagem__contains="foi cancelado pelo organizador").exists())
+        self.assertEqual(
+            list(visiveis.filter(mensagem__contains="foi reativado").values_list("participante_id", flat=True)),
+            [participantes[2].pk],
+        )
+        totais = SerieInscricoes.objects.filter(evento=evento, granularidade="dia").aggregate(total=Sum("total"))
+        self.assertEqual(totais["total"], 2)
+
+    def test_restaurar_antes_do_worker_descarta_o_aviso_pendente(self):
+        evento, _ = self._evento_com_inscritos(3, "w")
+        evento.delete()
+        evento.restore()
+
+        entrada = NotificacaoOutbox.objects.get(evento=evento, tipo=NotificacaoOutbox.TIPO_BROADCAST)
+        self.assertIsNotNone(entrada.processado_em)
+        processar_outbox()
+        self.assertFalse(Notificacao.objects.filter(evento=evento, tipo=Notificacao.TIPO_EVENTO_CANCELADO).exists())
+
+    def test_admin_exclui_em_um_update(self):
+        from django.contrib.admin.sites import site
+
+        evento, _ = self._evento_com_inscritos(40, "x")
+        admin = site._registry[Inscricao]
+        with CaptureQueriesContext(connection) as ctx:
+            admin.delete_queryset(None, Inscricao.objects.filter(evento=evento))
+        atualizacoes = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(atualizacoes), 2)  # inscrições + vagas do evento
+        evento.refresh_from_db()
+        self.assertEqual(evento.vagas_ocupadas, 0)
+        self.assertFalse(Inscricao.objects.filter(evento=evento).exists())
+
+    def test_restaurar_sem_vagas_nao_restaura_nada(self):
+        evento, participantes = self._evento_com_inscritos(2, "v")
+        Inscricao.objects.filter(evento=evento).soft_delete()
+        Inscricao.objects.create(participante=criar_participante("novo"), evento=evento)
+        Evento.reservar_vaga(evento.pk)
+
+        with self.assertRaises(ValidationError):
+            Inscricao.all_objects.filter(evento=evento, is_deleted=True).restore()
+        self.assertEqual(Inscricao.objects.filter(evento=evento).count(), 1)
+        evento.refresh_from_db()
+        self.assertEqual(evento.vagas_ocupadas, 1)
+
+    def test_notificacoes_em_conjunto_ajustam_contador(self):
+        from .contadores import obter_nao_lidas
+
+        participante = criar_participante()
+        evento = criar_evento(self.organizador)
+        for lida in (False, False, True):
+            Notificacao.objects.create(participante=participante, evento=evento, mensagem="oi", is_read=lida)
+        self.assertEqual(obter_nao_lidas(participante.pk), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(Notificacao.objects.filter(participante=participante).soft_delete(), 3)
+        self.assertEqual(obter_nao_lidas(participante.pk), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(Notificacao.all_objects.filter(participante=participante).restore(), 3)
+        self.assertEqual(obter_nao_lidas(participante.pk), 2)
+
+
+class CadastroUsuarioTests(TestCase):
+    def setUp(self):
+        self.url = reverse("api:v1.0:core:auth-register-list")
+        self.client = APIClient()
+
+    def _cadastrar(self, username="novo", email="novo@example.com", role="participante", **extra):
+        dados = {"username": username, "password": "senha-123", "email": email, "role": role, "nome": "Novo", **extra}
+        return self.client.post(self.url, dados, format="json")
+
+    def test_cadastro_em_poucas_queries_com_perfil_na_resposta(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._cadastrar()
+        self.assertEqual(response.status_code, 201)
+        participante = Participante.objects.get(email="novo@example.com")
+        self.assertEqual(response.data["user"]["participante_id"], participante.pk)
+        self.assertEqual(response.data["user"]["role"], "participante")
+        # e-mail no outro tipo de perfil + usuário + perfil (fora SAVEPOINT/RELEASE)
+        comandos = [q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+        self.assertEqual(len(comandos), 3)
+
+        response = self._cadastrar("org", "org@example.com", role="organizador", empresa="ACME")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["user"]["role"], "organizador")
+        self.assertIsNone(response.data["user"]["participante_id"])
+
+    def test_duplicidades_mapeadas_pela_restricao(self):
+        self.assertEqual(self._cadastrar().status_code, 201)
+        usuarios = User.objects.count()
+
+        response = self._cadastrar(email="outro@example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("username", response.data)
+
+        response = self._cadastrar(username="outro")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.data)
+
+        # perfil excluído continua ocupando o e-mail no banco
+        criar_organizador("antigo", email="antigo@example.com").delete()
+        response = self._cadastrar("outro", "antigo@example.com", role="organizador", empresa="ACME")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.data)
+
+        response = self._cadastrar("outro", "novo@example.com", role="organizador", empresa="ACME")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("participante", str(response.data["email"]))
+
+        # nenhum usuário órfão ficou para trás
+        self.assertEqual(User.objects.count(), usuarios + 1)
+
+    def test_organizador_sem_empresa_nao_cria_usuario(self):
+        response = self._cadastrar(role="organizador")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("empresa", response.data)
+        self.assertFalse(User.objects.filter(username="novo").exists())
+
+    def test_restricao_identificada_em_cada_banco(self):
+        from django.db import IntegrityError
+
+        from .api.v1.serializers import RESTRICOES_CADASTRO
+        from .integridade import restricao_violada
+
+        class Diagnostico:
+            constraint_name = "participante_email_uniq"
+
+        class ErroDriver(Exception):
+            diag = Diagnostico()
+
+        postgres = IntegrityError("duplicate key value violates unique constraint")
+        postgres.__cause__ = ErroDriver()
+        casos = {
+            postgres: "participante_email_uniq",
+            IntegrityError("UNIQUE constraint failed: auth_user.username"): "auth_user_username_key",
+            IntegrityError("(1062, \"Duplicate entry 'x' for key 'core_organizador.organizador_email_uniq'\")"):
+                "organizador_email_uniq",
+            IntegrityError("(1062, \"Duplicate entry 'x' for key 'auth_user.username'\")"): "auth_user_username_key",
+        }
+        for erro, nome in casos.items():
+            self.assertEqual(restricao_violada(erro, RESTRICOES_CADASTRO).nome, nome)
+        self.assertIsNone(restricao_violada(IntegrityError("NOT NULL constraint failed: x.y"), RESTRICOES_CADASTRO))
+
+
+class CadastroConcorrenciaTests(TransactionTestCase):
+    """Cadastros simultâneos com o mesmo username: só um passa, os demais recebem 400."""
+
+    def test_cadastros_simultaneos_nao_duplicam_nem_geram_500(self):
+        url = reverse("api:v1.0:core:auth-register-list")
+
+        def cadastrar(indice):
+            return APIClient().post(url, {
+                "username": "disputado", "password": "senha-123", "email": f"c{indice}@example.com",
+                "role": "participante", "nome": f"C{indice}",
+            }, format="json").status_code
+
+        resultados = executar_em_paralelo(self, cadastrar, range(16), max_workers=8)
+
+        self.assertEqual(resultados.count(201), 1)
+        self.assertEqual(resultados.count(400), 15)
+        self.assertEqual(User.objects.filter(username="disputado").count(), 1)
+        self.assertEqual(Participante.objects.count(), 1)
+
+
+@override_settings(REPLICAS_LEITURA=["replica_teste"], REPLICA_STICKY_SEGUNDOS=5)
+class ReplicaLeituraTests(TransactionTestCase):
+    """Decisão de banco do middleware/router, sem depender de uma réplica configurada.
+
+    TransactionTestCase: dentro de uma transação as leituras ficam no primário.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def _banco_da_leitura(self, metodo, acao, token=None, modelo=Evento):
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+
+        from .replicas import ReplicaLeituraMiddleware, ReplicaRouter
+
+        visto = {}
+
+        class View:
+            acoes_em_replica = ("list", "retrieve")
+
+        def view(request):
+            visto["banco"] = ReplicaRouter().db_for_read(modelo)
+            return HttpResponse()
+
+        view.cls = View
+        view.actions = {metodo.lower(): acao}
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = ReplicaLeituraMiddleware(get_response)
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"} if token else {}
+        middleware(RequestFactory().generic(metodo, "/", **headers))
+        return visto["banco"]
+
+    def test_catalogo_le_da_replica_e_o_resto_do_primario(self):
+        from .replicas import ReplicaRouter
+
+        self.assertEqual(self._banco_da_leitura("GET", "list"), "replica_teste")
+        self.assertEqual(self._banco_da_leitura("HEAD", "retrieve"), "replica_teste")
+        self.assertIsNone(self._banco_da_leitura("GET", "dashboard"))
+        self.assertIsNone(self._banco_da_leitura("POST", "create"))
+        # usuários (autenticação) nunca saem do primário
+        self.assertIsNone(self._banco_da_leitura("GET", "list", modelo=User))
+        # fora de uma requisição (workers, comandos) tudo fica no primário
+        self.assertIsNone(ReplicaRouter().db_for_read(Evento))
+
+    def test_quem_escreveu_le_do_primario_durante_a_janela(self):
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        from .replicas import ReplicaLeituraMiddleware, chave_primario
+
+        participante = criar_participante()
+        token = str(AccessToken.for_user(participante.user))
+        outro = str(AccessToken.for_user(criar_participante("outro").user))
+
+        def escrever(request):
+            request.user = participante.user
+            return HttpResponse(status=201)
+
+        ReplicaLeituraMiddleware(escrever)(RequestFactory().post("/"))
+        self.assertIsNone(self._banco_da_leitura("GET", "list", token=token))
+        self.assertEqual(self._banco_da_leitura("GET", "list", token=outro), "replica_teste")
+        self.assertEqual(self._banco_da_leitura("GET", "list", token="invalido"), "replica_teste")
+
+        cache.delete(chave_primario(participante.user.pk))  # janela expirada
+        self.assertEqual(self._banco_da_leitura("GET", "list", token=token), "replica_teste")
+
+    def test_escrita_no_meio_da_requisicao_volta_ao_primario(self):
+        from .replicas import ReplicaRouter, _replica
+
+        marca = _replica.set("replica_teste")
+        try:
+            router = ReplicaRouter()
+            self.assertEqual(router.db_for_read(Evento), "replica_teste")
+            self.assertEqual(router.db_for_write(Evento), "default")
+            self.assertIsNone(router.db_for_read(Evento))
+            with transaction.atomic():
+                _replica.set("replica_teste")
+                self.assertIsNone(router.db_for_read(Evento))
+        finally:
+            _replica.reset(marca)
+
+
+@skipUnless("replica_1" in connections.databases, "Configure DB_REPLICA_URLS para testar com uma réplica")
+class ReplicaLeituraIntegracaoTests(TransactionTestCase):
+    # a réplica usa outra conexão: os dados precisam estar commitados para ela ver
+    databases = "__all__"
+
+    def setUp(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        cache.clear()
+        self.evento = criar_evento(criar_organizador(), capacidade=10)
+        self.participante = criar_participante()
+        self.client = APIClient()
+        # token de verdade: o middleware identifica o usuário pelo header antes da view
+        token = AccessToken.for_user(self.participante.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def _bancos(self, metodo, url, **dados):
+        with CaptureQueriesContext(connections["default"]) as primario, \
+                CaptureQueriesContext(connections["replica_1"]) as replica:
+            response = getattr(self.client, metodo)(url, dados, format="json")
+        return response, len(primario.captured_queries), len(replica.captured_queries)
+
+    def test_leitura_na_replica_e_primario_depois_de_inscrever(self):
+        detalhe = reverse("api:v1.0:core:evento-detail", args=[self.evento.pk])
+        response, _, na_replica = self._bancos("get", detalhe)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(na_replica, 0)
+
+        response, _, _ = self._bancos("post", reverse("api:v1.0:core:inscricao-list"), evento=self.evento.pk)
+        self.assertEqual(response.status_code, 201)
+
+        response, no_primario, na_replica = self._bancos("get", detalhe)
+        self.assertEqual(na_replica, 0)
+        self.assertGreater(no_primario, 0)